@@ -0,0 +1,176 @@
+import argparse
+import logging
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+JOBS_COLLECTION = "deletion_jobs"
+
+# 🗑 Everything that belongs to a user, deleted before the job is marked done
+DEPENDENT_COLLECTIONS = ["transactions", "budgets", "goals", "insight_summaries"]
+
+DELETE_BATCH_SIZE = int(os.environ.get("DELETE_BATCH_SIZE", 1000))
+STALE_AFTER = timedelta(seconds=int(os.environ.get("DELETE_JOB_STALE_SECONDS", 120)))
+POLL_SECONDS = 30
+
+
+def enqueue_deletion(db, user_id_obj):
+    """
+    Queue a job for the user's data, then delete the user document. Returns the job ID.
+    Queuing the same user twice returns the existing unfinished job.
+
+    The job is written first so a crash in between can't leave the data orphaned;
+    run_job deletes the user document again in case it was never reached.
+    """
+    now = datetime.utcnow()
+    job = db[JOBS_COLLECTION].find_one_and_update(
+        {"user": user_id_obj, "status": {"$ne": "done"}},
+        {"$setOnInsert": {
+            "user": user_id_obj,
+            "status": "pending",
+            "progress": {name: 0 for name in DEPENDENT_COLLECTIONS},
+            "created_at": now,
+            "heartbeat": now,
+        }},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    db["users"].delete_one({"_id": user_id_obj})
+    return job["_id"]
+
+
+def claim_next_job(db, worker_id):
+    """Atomically take a pending job, or a running one whose worker stopped heartbeating."""
+    now = datetime.utcnow()
+    return db[JOBS_COLLECTION].find_one_and_update(
+        {"$or": [
+            {"status": "pending"},
+            {"status": "running", "heartbeat": {"$lt": now - STALE_AFTER}},
+        ]},
+        {"$set": {"status": "running", "worker": worker_id, "heartbeat": now}},
+        sort=[("created_at", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def run_job(db, job, batch_size=DELETE_BATCH_SIZE):
+    """
+    Delete the job's documents in chunks of `batch_size`, recording progress after each.
+    Deleting is idempotent, so a reclaimed job just carries on with what is left.
+    """
+    jobs = db[JOBS_COLLECTION]
+    user_id_obj = job["user"]
+    db["users"].delete_one({"_id": user_id_obj})
+
+    if "totals" not in job:
+        totals = {name: db[name].count_documents({"user": user_id_obj}) for name in DEPENDENT_COLLECTIONS}
+        jobs.update_one({"_id": job["_id"]}, {"$set": {"totals": totals}})
+
+    for name in DEPENDENT_COLLECTIONS:
+        while True:
+            ids = [doc["_id"] for doc in db[name].find({"user": user_id_obj}, {"_id": 1}).limit(batch_size)]
+            if not ids:
+                break
+            deleted = db[name].delete_many({"_id": {"$in": ids}}).deleted_count
+            jobs.update_one(
+                {"_id": job["_id"]},
+                {"$inc": {f"progress.{name}": deleted}, "$set": {"heartbeat": datetime.utcnow()}},
+            )
+
+    jobs.update_one({"_id": job["_id"]}, {"$set": {"status": "done", "finished_at": datetime.utcnow()}})
+
+
+def run_pending_jobs(db, worker_id):
+    """Run jobs until none are left; returns how many were finished."""
+    finished = 0
+    while True:
+        job = claim_next_job(db, worker_id)
+        if job is None:
+            return finished
+        try:
+            run_job(db, job)
+            finished += 1
+        except Exception as e:
+            # Left as "running": another pass reclaims it once the heartbeat goes stale
+            logger.error("❌ Deletion job %s failed: %s", job["_id"], e)
+            return finished
+
+
+def job_status(db, job_id=None, user_id_obj=None):
+    """The latest job for a job ID or user, as JSON-safe progress info (None if unknown)."""
+    query = {"_id": job_id} if job_id else {"user": user_id_obj}
+    job = db[JOBS_COLLECTION].find_one(query, sort=[("created_at", -1)])
+    return format_job(job) if job else None
+
+
+def format_job(job):
+    return {
+        "job_id": str(job["_id"]),
+        "status": job["status"],
+        "deleted": job.get("progress", {}),
+        "total": job.get("totals"),
+    }
+
+
+class DeletionWorker:
+    """
+    Background thread that drains the job queue, polling every POLL_SECONDS. It is
+    started lazily from a request, so nothing runs in a process that never serves
+    one (e.g. a gunicorn master).
+    """
+
+    def __init__(self, get_db):
+        self._get_db = get_db
+        self._wake = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._pid = None
+        self.worker_id = None
+
+    def ensure_started(self):
+        """Start the thread in this process if it isn't running; its first pass resumes unfinished jobs."""
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self.worker_id = f"{socket.gethostname()}:{self._pid}"
+                self._thread = threading.Thread(target=self._run, name="account-deletion", daemon=True)
+                self._thread.start()
+
+    def wake(self):
+        """Run queued jobs now instead of at the next poll."""
+        self.ensure_started()
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                run_pending_jobs(self._get_db(), self.worker_id)
+            except Exception as e:
+                logger.error("❌ Account deletion worker error: %s", e)
+            self._wake.wait(POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    from db import get_db
+
+    parser = argparse.ArgumentParser(description="Run or inspect cascading account deletion jobs.")
+    parser.add_argument("command", choices=["run", "status"])
+    parser.add_argument("--user", help="User ID (status)")
+    parser.add_argument("--job", help="Job ID (status)")
+    args = parser.parse_args()
+
+    db = get_db()
+    if args.command == "run":
+        print(f"✅ Finished {run_pending_jobs(db, f'cli:{os.getpid()}')} deletion jobs")
+    else:
+        status = job_status(db, ObjectId(args.job) if args.job else None, ObjectId(args.user) if args.user else None)
+        print(status or "❌ No deletion job found")
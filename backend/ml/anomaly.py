@@ -0,0 +1,112 @@
+import math
+import os
+
+# 🔎 Streaming anomaly scoring for transactions. Each user keeps running per-category
+# statistics (count, sum, sum of squares) in their insight summary. A new transaction
+# is scored in O(1) against the statistics of the transactions before it, with no rescan
+# of history. The statistics are kept as power sums rather than Welford's running
+# mean/M2: the Node write path (models/InsightSummary.js) updates sums with a plain $inc,
+# so concurrent writes can't lose an update, and edits and deletes subtract out exactly.
+# Amounts are money, so the cancellation in sumsq/n - mean² stays far below what would
+# change a score.
+#
+# Nothing in here touches MongoDB: insight_summary.py builds the stats on rebuilds.
+
+ANOMALY_Z = float(os.environ.get("ANOMALY_Z", 3.0))  # Standard deviations above the mean
+ANOMALY_MIN_HISTORY = int(os.environ.get("ANOMALY_MIN_HISTORY", 8))  # Earlier transactions needed in a category
+ANOMALY_LIMIT = 5  # Flagged transactions kept on the summary, oldest dropped first
+MIN_STD_FRACTION = 0.05  # Std floor as a fraction of the mean, so near-constant spending isn't flagged on cents
+
+
+def score(stats, amount):
+    """
+    How many standard deviations `amount` is above the mean of `stats`
+    ({"n", "sum", "sumsq"}), or None with too little history to judge.
+    """
+    n = (stats or {}).get("n", 0)
+    if n < ANOMALY_MIN_HISTORY:
+        return None
+    mean = stats["sum"] / n
+    std = math.sqrt(max(stats["sumsq"] / n - mean * mean, 0.0))
+    std = max(std, MIN_STD_FRACTION * abs(mean), 0.01)
+    return (amount - mean) / std
+
+
+def flag(txn, stats):
+    """The anomaly entry for a transaction scored against the stats before it, or None if it is usual."""
+    amount = txn.get("amount", 0)
+    z = score(stats, amount)
+    if z is None or z < ANOMALY_Z:
+        return None
+    return {
+        "txn": txn.get("_id"),
+        "category": txn.get("category", "Other"),
+        "amount": amount,
+        "date": txn.get("date", "Unknown"),
+        "usual": round(stats["sum"] / stats["n"], 2),
+        "score": round(z, 2),
+    }
+
+
+def anomaly_messages(anomalies):
+    """Recommendation lines for flagged transactions, newest first."""
+    return [
+        f"🔎 Unusual {item['category']} spend: £{item['amount']:.2f} is "
+        f"{item['score']:.1f} standard deviations above your usual £{item['usual']:.2f}"
+        for item in reversed(anomalies or [])
+    ]
+
+
+class StreamingScorer:
+    """
+    In-memory scorer over a stream of transactions, for rebuilds, the loop insights
+    mode and backfills: each transaction is scored against its user's earlier ones in
+    the same category, then added to the running stats.
+    """
+
+    def __init__(self):
+        self.stats = {}  # (user, category) -> {"n", "sum", "sumsq"}
+
+    def _running(self, user, category):
+        running = self.stats.get((user, category))
+        if running is None:
+            running = self.stats[(user, category)] = {"n": 0, "sum": 0.0, "sumsq": 0.0}
+        return running
+
+    @staticmethod
+    def _record(running, amount):
+        running["n"] += 1
+        running["sum"] += amount
+        running["sumsq"] += amount * amount
+
+    def score_and_update(self, user, category, amount):
+        """Return the z-score of `amount` (None while history is short) and record it."""
+        running = self._running(user, category)
+        z = score(running, amount)
+        self._record(running, amount)
+        return z
+
+    def observe(self, user, txn):
+        """Score and record a transaction document; returns its anomaly entry or None."""
+        running = self._running(user, txn.get("category", "Other"))
+        entry = flag(txn, running)
+        self._record(running, txn.get("amount", 0))
+        return entry
+
+    def category_stats(self, user):
+        """One user's stats in the summary document layout."""
+        return {category: dict(running) for (owner, category), running in self.stats.items() if owner == user}
+
+
+def scan(transactions, limit=ANOMALY_LIMIT):
+    """
+    Score one user's transactions in write order.
+    Returns (stats, anomalies) with the last `limit` flagged transactions.
+    """
+    scorer = StreamingScorer()
+    anomalies = []
+    for txn in transactions:
+        entry = scorer.observe(None, txn)
+        if entry:
+            anomalies = (anomalies + [entry])[-limit:]
+    return scorer.category_stats(None), anomalies
@@ -0,0 +1,474 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from quart import Quart, jsonify, request
+from quart_cors import cors
+
+from account_deletion import JOBS_COLLECTION, DeletionWorker, enqueue_deletion, format_job
+from db import close_async_client, get_async_db, get_db
+from goal_contributions import MAX_BATCH_SIZE, batch_result, build_batch, contribution_update, parse_contribution
+from indexes import ensure_indexes_on_startup
+from insight_engine import build_insights_response, spending_insights, summarize_loop
+from insight_summary import SUMMARY_COLLECTION, budget_alerts, rebuild_summary, summary_to_insights
+from insights_pipeline import PERIOD_FORMATS, build_insights_pipeline, parse_insights_result, parse_limit
+from passwords import submit_change
+from predictor import active_model, build_features, generate_feedback, predict_features
+from instrumentation import configure_logging
+from transaction_export import parse_date_range
+
+# ⚡ ASGI version of the JSON routes in blueprints/. MongoDB is accessed with
+# motor, so a waiting request doesn't hold a worker thread. CPU work (model inference,
+# loop-mode summaries) runs on a bounded executor and bcrypt on the pool in passwords.py,
+# so neither blocks the event loop. The few synchronous pymongo calls (index creation,
+# summary rebuilds, queuing deletions) run on asyncio's default thread pool instead:
+# a pymongo Database can't be sent to a process pool.
+#
+#   uvicorn async_app:app --port 5003          (or: hypercorn async_app:app -b 127.0.0.1:5003)
+#
+# Streaming imports/exports and NDJSON batch predictions stay on the Flask services.
+
+INSIGHTS_MODE = os.environ.get("INSIGHTS_MODE", "summary")
+INFERENCE_WORKERS = int(os.environ.get("INFERENCE_WORKERS", os.cpu_count() or 4))
+INFERENCE_EXECUTOR = os.environ.get("INFERENCE_EXECUTOR", "thread")  # "thread" or "process"
+
+DEFAULT_TRENDS = [
+    {"day": 1, "amount": 50},
+    {"day": 2, "amount": 75},
+    {"day": 3, "amount": 30},
+    {"day": 4, "amount": 90},
+    {"day": 5, "amount": 60},
+]
+
+logger = logging.getLogger(__name__)
+
+app = Quart(__name__)
+app = cors(app, allow_origin="*")
+
+db = None
+executor = None
+deletion_worker = DeletionWorker(get_db)
+
+
+async def run_blocking(fn, *args):
+    """
+    Run CPU-bound work on the executor and await its result. With
+    INFERENCE_EXECUTOR=process, `fn` and its arguments must be picklable.
+    """
+    return await asyncio.get_running_loop().run_in_executor(executor, partial(fn, *args))
+
+
+def _warm_up():
+    return active_model().version
+
+
+@app.before_serving
+async def start_up():
+    global db, executor
+
+    configure_logging()
+    pool = ProcessPoolExecutor if INFERENCE_EXECUTOR == "process" else ThreadPoolExecutor
+    executor = pool(max_workers=INFERENCE_WORKERS)
+    db = get_async_db()
+
+    await asyncio.to_thread(ensure_indexes_on_startup, get_db())
+    deletion_worker.ensure_started()  # Resumes any deletion jobs left unfinished
+    logger.info("✅ Model version loaded: %s", await run_blocking(_warm_up))
+
+
+@app.after_serving
+async def shut_down():
+    executor.shutdown(wait=True)
+    close_async_client()
+
+
+async def get_summary(user_id_obj):
+    """Async counterpart of insight_summary.get_summary."""
+    summary = await db[SUMMARY_COLLECTION].find_one({"user": user_id_obj})
+    if summary is None:
+        summary = await asyncio.to_thread(rebuild_summary, get_db(), user_id_obj)
+    return summary
+
+
+# ✅ Budget API Routes
+@app.route("/api/budget", methods=["GET"])
+async def get_budget():
+    user_id = request.args.get("user_id")
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+
+    try:
+        budget_data = await db["budgets"].find_one({"user": ObjectId(user_id)})
+        if not budget_data:
+            return jsonify({"error": "No budget data found"}), 404
+
+        return jsonify({
+            "budget": budget_data.get("budget", 0),
+            "spent": budget_data.get("spent", 0),
+            "categories": budget_data.get("categories", []),
+            "spendingTrends": budget_data.get("spendingTrends") or DEFAULT_TRENDS,
+        })
+    except Exception as e:
+        logger.error("❌ Error fetching budget data: %s", e)
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/budget", methods=["POST"])
+async def save_budget():
+    data = await request.get_json()
+    user_id = data.get("user_id")
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+
+    try:
+        user_id_obj = ObjectId(user_id)
+        budget_data = {
+            "user": user_id_obj,
+            "budget": data.get("budget", 0),
+            "spent": data.get("spent", 0),
+            "categories": data.get("categories", []),
+            "spendingTrends": data.get("spendingTrends") or DEFAULT_TRENDS,
+        }
+        budget_data["alerts"] = budget_alerts(await get_summary(user_id_obj), budget_data["budget"])
+
+        await db["budgets"].update_one({"user": user_id_obj}, {"$set": budget_data}, upsert=True)
+        return jsonify({"message": "Budget saved successfully"}), 200
+    except Exception as e:
+        logger.error("❌ Error saving budget data: %s", e)
+        return jsonify({"error": str(e)}), 500
+
+
+async def load_summary(user_id_obj, mode, date_filter=None, granularity=None, cursor=None, limit=None):
+    """Async counterpart of load_summary in blueprints/insights.py: one read, returns (summary, next_cursor)."""
+    if mode == "summary":
+        return summary_to_insights(await get_summary(user_id_obj)), None
+    if mode == "aggregate":
+        pipeline = build_insights_pipeline(user_id_obj, date_filter, granularity, cursor, limit)
+        rows = await db["transactions"].aggregate(pipeline).to_list(1)
+        summary = parse_insights_result(rows[0] if rows else {}, limit)
+        return summary, summary["next_cursor"]
+
+    transactions = await db["transactions"].find({"user": user_id_obj}).to_list(None)
+    return await run_blocking(summarize_loop, transactions), None
+
+
+@app.route("/api/ml/insights", methods=["GET"])
+async def get_ml_insights():
+    user_id = request.args.get("user_id")
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+
+    try:
+        date_filter = parse_date_range(request.args.get("from"), request.args.get("to"))
+    except ValueError:
+        return jsonify({"error": "Invalid date format"}), 400
+
+    try:
+        user_id_obj = ObjectId(user_id)
+        summary, _ = await load_summary(user_id_obj, "aggregate" if date_filter else "summary", date_filter)
+        budget_data = await db["budgets"].find_one({"user": user_id_obj}, {"budget": 1}) or {}
+        return jsonify(spending_insights(summary, budget_data.get("budget", 0)))
+    except Exception as e:
+        logger.error("❌ Error fetching ML insights: %s", e)
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/insights", methods=["GET"])
+async def get_financial_insights():
+    user_id = request.args.get("user_id")
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+
+    try:
+        user_id_obj = ObjectId(user_id)
+    except Exception:
+        return jsonify({"error": "Invalid User ID format"}), 400
+
+    mode = request.args.get("mode", INSIGHTS_MODE)
+
+    granularity = request.args.get("granularity")
+    cursor = request.args.get("cursor")
+    try:
+        date_filter = parse_date_range(request.args.get("from"), request.args.get("to"))
+        limit = parse_limit(request.args.get("limit"))
+    except ValueError:
+        return jsonify({"error": "Invalid date range or limit"}), 400
+    if granularity and granularity not in PERIOD_FORMATS:
+        return jsonify({"error": f"Granularity must be one of {', '.join(PERIOD_FORMATS)}"}), 400
+
+    windowed = bool(date_filter or granularity or cursor or limit)
+    if windowed:
+        mode, granularity = "aggregate", granularity or "day"
+
+    summary, next_cursor = await load_summary(user_id_obj, mode, date_filter, granularity, cursor, limit)
+    if not summary["count"]:
+        return jsonify({"error": "No transactions found"}), 404
+
+    budget_data = await db["budgets"].find_one({"user": user_id_obj}, {"budget": 1, "alerts": 1}) or {}
+    budget = budget_data.get("budget", 0)
+
+    insights = spending_insights(summary, budget)
+    alerts = budget_data.get("alerts") if mode == "summary" else None
+
+    response = build_insights_response(summary, budget, insights.get("insights", []), alerts)
+    if windowed:
+        response["nextCursor"] = next_cursor
+
+    return jsonify(response)
+
+
+# 📌 Prediction API (same contract as blueprints/ml.py)
+@app.route("/api/ml/predict", methods=["POST"])
+async def predict_spending():
+    data = await request.get_json()
+    user_id = data.get("user_id")
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+
+    user = await db["users"].find_one({"_id": ObjectId(user_id)})
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+
+    budget_data = await db["budgets"].find_one({"user": ObjectId(user_id)})
+    budget = budget_data.get("budget", 0) if budget_data else 0
+
+    # 🚀 Inference runs on the executor, never on the event loop
+    predicted_spending = round(await run_blocking(predict_features, build_features(user)), 2)
+
+    return jsonify({
+        "predicted_spending": predicted_spending,
+        "budget": budget,
+        "feedback": generate_feedback(predicted_spending, budget),
+    })
+
+
+# 🎯 Goals
+@app.route("/api/goals", methods=["GET"])
+async def get_goals():
+    user_id = request.args.get("user_id")
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+
+    try:
+        goals = await db["goals"].find({"user": ObjectId(user_id)}).to_list(None)
+        for goal in goals:
+            goal["_id"] = str(goal["_id"])
+            goal["user"] = str(goal["user"])
+        return jsonify(goals), 200
+    except Exception as e:
+        logger.error("❌ Error fetching goals: %s", e)
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/goals/contribute", methods=["POST"])
+async def contribute_to_goal():
+    data = await request.get_json() or {}
+
+    try:
+        goal_obj, user_obj, amount = parse_contribution(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        query, update = contribution_update(goal_obj, user_obj, amount)
+        goal = await db["goals"].find_one_and_update(
+            query, update, projection={"saved": 1}, return_document=ReturnDocument.AFTER
+        )
+        if not goal:
+            return jsonify({"error": "Goal not found"}), 404
+
+        return jsonify({"message": "Contribution added successfully", "new_savings": goal["saved"]}), 200
+    except Exception as e:
+        logger.error("❌ Error contributing to goal: %s", e)
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/goals/contribute/batch", methods=["POST"])
+async def contribute_to_goals_batch():
+    data = await request.get_json() or {}
+    contributions = data.get("contributions")
+
+    if not contributions or not isinstance(contributions, list):
+        return jsonify({"error": "A list of contributions is required"}), 400
+    if len(contributions) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"At most {MAX_BATCH_SIZE} contributions per request"}), 400
+
+    try:
+        ops, targets, errors = build_batch(contributions)
+        applied = (await db["goals"].bulk_write(ops, ordered=False)).matched_count if ops else 0
+        goals = await db["goals"].find({"_id": {"$in": list(targets)}}, {"user": 1, "saved": 1}).to_list(None)
+        result = batch_result(goals, targets, errors, applied)
+        return jsonify(result), 200 if result["applied"] else 400
+    except Exception as e:
+        logger.error("❌ Error applying goal contributions: %s", e)
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/goals", methods=["POST"])
+async def add_goal():
+    data = await request.get_json()
+    user_id = data.get("user_id")
+    name = data.get("name")
+    target = data.get("target")
+    deadline = data.get("deadline")
+
+    if not user_id or not name or not target or not deadline:
+        return jsonify({"error": "All fields are required"}), 400
+
+    try:
+        goal_data = {
+            "user": ObjectId(user_id),
+            "name": name,
+            "target": float(target),
+            "saved": 0,
+            "deadline": deadline
+        }
+        inserted_goal = await db["goals"].insert_one(goal_data)
+
+        goal_data["_id"] = str(inserted_goal.inserted_id)
+        goal_data["user"] = str(user_id)
+        return jsonify(goal_data), 201
+    except Exception as e:
+        logger.error("❌ Error adding goal: %s", e)
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/goals/<goal_id>", methods=["DELETE"])
+async def delete_goal(goal_id):
+    try:
+        result = await db["goals"].delete_one({"_id": ObjectId(goal_id)})
+        if result.deleted_count == 0:
+            return jsonify({"error": "Goal not found"}), 404
+        return jsonify({"message": "Goal deleted successfully"}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# ⚙️ Settings
+@app.route("/api/settings/username", methods=["POST"])
+async def update_username():
+    data = await request.get_json()
+    user_id = data.get("user_id")
+    new_username = data.get("new_username")
+
+    if not user_id or not new_username:
+        return jsonify({"error": "Missing user ID or new username"}), 400
+
+    try:
+        await db["users"].update_one({"_id": ObjectId(user_id)}, {"$set": {"username": new_username}})
+        return jsonify({"message": "Username updated successfully"}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/settings/password", methods=["POST"])
+async def change_password():
+    data = await request.get_json()
+    user_id = data.get("user_id")
+    current_password = (data.get("current_password") or "").encode('utf-8')
+    new_password = (data.get("new_password") or "").encode('utf-8')
+
+    if not user_id or not current_password or not new_password:
+        return jsonify({"error": "Missing required fields"}), 400
+
+    try:
+        user_obj = ObjectId(user_id)
+        user = await db["users"].find_one({"_id": user_obj}, {"password": 1})
+        if not user:
+            return jsonify({"error": "User not found"}), 404
+
+        stored_password = user.get('password', '').encode('utf-8')
+        if not stored_password:
+            return jsonify({"error": "Password not found in user data"}), 500
+
+        # ✅ bcrypt has its own bounded pool, separate from inference
+        hashed_password = await asyncio.wrap_future(submit_change(current_password, stored_password, new_password))
+        if hashed_password is None:
+            return jsonify({"error": "Incorrect current password"}), 401
+
+        await db["users"].update_one({"_id": user_obj}, {"$set": {"password": hashed_password}})
+        return jsonify({"message": "Password changed successfully"}), 200
+    except Exception as e:
+        logger.error("🔥 Error changing password: %s", e)
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/settings/preferences", methods=["POST"])
+async def update_preferences():
+    data = await request.get_json()
+    user_id = data.get("user_id")
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+
+    try:
+        await db["users"].update_one(
+            {"_id": ObjectId(user_id)},
+            {
+                "$set": {
+                    "dark_mode": bool(data.get("dark_mode", False)),
+                    "currency": data.get("currency") or "GBP",
+                    "notifications": bool(data.get("notifications", True))
+                }
+            },
+            upsert=True
+        )
+        return jsonify({"message": "Preferences updated successfully"}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/settings/delete", methods=["DELETE"])
+async def delete_account():
+    user_id = request.args.get("user_id")
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+
+    try:
+        job_id = await asyncio.to_thread(enqueue_deletion, get_db(), ObjectId(user_id))
+        deletion_worker.wake()
+        return jsonify({"message": "Account deleted successfully", "job_id": str(job_id)}), 202
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/settings/delete/status", methods=["GET"])
+async def delete_account_status():
+    job_id = request.args.get("job_id")
+    user_id = request.args.get("user_id")
+    if not job_id and not user_id:
+        return jsonify({"error": "Job ID or user ID is required"}), 400
+
+    try:
+        query = {"_id": ObjectId(job_id)} if job_id else {"user": ObjectId(user_id)}
+    except Exception:
+        return jsonify({"error": "Invalid job or user ID"}), 400
+
+    jobs = await db[JOBS_COLLECTION].find(query).sort("created_at", -1).limit(1).to_list(1)
+    if not jobs:
+        return jsonify({"error": "Deletion job not found"}), 404
+    return jsonify(format_job(jobs[0])), 200
+
+
+@app.route("/api/settings/preferences", methods=["GET"])
+async def get_preferences():
+    user_id = request.args.get("user_id")
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+
+    try:
+        user = await db["users"].find_one(
+            {"_id": ObjectId(user_id)}, {"_id": 0, "dark_mode": 1, "currency": 1, "notifications": 1}
+        )
+        if not user:
+            return jsonify({"dark_mode": False, "currency": "GBP", "notifications": True}), 200
+        return jsonify(user), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+if __name__ == "__main__":
+    app.run(port=int(os.environ.get("ASYNC_PORT", 5003)))
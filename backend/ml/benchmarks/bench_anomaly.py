@@ -0,0 +1,98 @@
+"""
+Throughput of the streaming anomaly scorer (anomaly.py) over a stream of synthetic
+transactions, against rescanning each user's category history per transaction.
+
+    cd backend/ml
+    python benchmarks/bench_anomaly.py --transactions 2000000 --users 2000
+
+Amounts are lognormal per (user, category) with a small share of injected outliers,
+so the flagged count can be checked against the number injected. The rescan baseline
+is quadratic in history length and runs on the transactions of the first
+--rescan-users users only.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from anomaly import ANOMALY_MIN_HISTORY, ANOMALY_Z, MIN_STD_FRACTION, StreamingScorer
+
+CATEGORIES = ["Rent", "Food", "Travel", "Entertainment", "Miscellaneous"]
+
+
+def generate(n_transactions, n_users, outlier_rate, seed):
+    """(users, categories, amounts, injected) arrays in write order."""
+    rng = np.random.default_rng(seed)
+    users = rng.integers(0, n_users, n_transactions)
+    categories = rng.integers(0, len(CATEGORIES), n_transactions)
+    typical = rng.lognormal(3.0, 0.8, (n_users, len(CATEGORIES)))
+    amounts = typical[users, categories] * rng.lognormal(0.0, 0.25, n_transactions)
+    injected = rng.random(n_transactions) < outlier_rate
+    amounts[injected] *= rng.uniform(4, 10, injected.sum())
+    return users.tolist(), [CATEGORIES[i] for i in categories], np.round(amounts, 2).tolist(), injected
+
+
+def streaming(users, categories, amounts):
+    scorer = StreamingScorer()
+    score = scorer.score_and_update
+    flagged = []
+    for i, (user, category, amount) in enumerate(zip(users, categories, amounts)):
+        z = score(user, category, amount)
+        if z is not None and z >= ANOMALY_Z:
+            flagged.append(i)
+    return flagged
+
+
+def rescan(users, categories, amounts):
+    """The same rule recomputed from every earlier transaction in the category."""
+    history = {}
+    flagged = []
+    for i, (user, category, amount) in enumerate(zip(users, categories, amounts)):
+        earlier = history.setdefault((user, category), [])
+        if len(earlier) >= ANOMALY_MIN_HISTORY:
+            values = np.array(earlier)
+            mean = values.mean()
+            std = max(values.std(), MIN_STD_FRACTION * abs(mean), 0.01)
+            if (amount - mean) / std >= ANOMALY_Z:
+                flagged.append(i)
+        earlier.append(amount)
+    return flagged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming anomaly scorer throughput.")
+    parser.add_argument("--transactions", type=int, default=2_000_000)
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--outlier-rate", type=float, default=0.002)
+    parser.add_argument("--rescan-users", type=int, default=50, help="Users in the rescan baseline (0 to skip)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    users, categories, amounts, injected = generate(args.transactions, args.users, args.outlier_rate, args.seed)
+
+    start = time.perf_counter()
+    flagged = streaming(users, categories, amounts)
+    elapsed = time.perf_counter() - start
+    caught = int(injected[flagged].sum()) if flagged else 0
+    print(f"streaming  {args.transactions} txns in {elapsed:6.2f}s  {args.transactions / elapsed:12,.0f} txns/s   "
+          f"flagged {len(flagged)}, {caught} of {int(injected.sum())} injected outliers")
+
+    if args.rescan_users:
+        subset = [i for i, user in enumerate(users) if user < args.rescan_users]
+        stream = ([users[i] for i in subset], [categories[i] for i in subset], [amounts[i] for i in subset])
+        start = time.perf_counter()
+        baseline = rescan(*stream)
+        rescan_elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        same = streaming(*stream)
+        streaming_elapsed = time.perf_counter() - start
+        print(f"subset     {len(subset)} txns of {args.rescan_users} users: rescan {len(subset) / rescan_elapsed:10,.0f} txns/s   "
+              f"streaming {len(subset) / streaming_elapsed:10,.0f} txns/s   same flags: {baseline == same}")
+
+
+if __name__ == "__main__":
+    main()
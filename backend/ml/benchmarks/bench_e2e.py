@@ -0,0 +1,303 @@
+"""
+End-to-end benchmark of the dashboard routes on synthetic data (see synthetic.py).
+Reports throughput, latency percentiles and MongoDB commands per request for each
+route, and writes them to a JSON file that --compare diffs against an earlier run.
+
+    cd backend/ml
+    # In-process Flask app on mongomock: no servers needed
+    python benchmarks/bench_e2e.py --backend mongomock --users 1000 --output /tmp/bench-HEAD.json
+
+    # Against a running server and a local mongod (seed once, then reuse the data)
+    export MONGO_DB_NAME=benchData
+    python benchmarks/synthetic.py --users 100000
+    python app.py &
+    python benchmarks/bench_e2e.py --url http://127.0.0.1:5001 --no-seed --output /tmp/bench-HEAD.json
+    python benchmarks/bench_e2e.py --url http://127.0.0.1:5001 --no-seed --compare /tmp/bench-BASE.json
+
+Latency on mongomock measures the Python side only; use a real mongod for numbers
+worth comparing across machines. --compare exits 1 if any route's p95 regresses by
+more than --max-regression percent.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db as db_module
+from synthetic import add_arguments, seed_from_args
+
+RESULTS_VERSION = 1
+FIXTURE_USERS = 2000  # Users sampled as request targets
+
+
+def _user(rng, fixtures):
+    return rng.choice(fixtures["users"])
+
+
+def _goal(rng, fixtures):
+    return rng.choice(fixtures["goals"])
+
+
+# 🛣 name -> (method, path, build(rng, fixtures) -> (params, json body)); reads run before writes
+SCENARIOS = {
+    "insights": ("GET", "/api/insights", lambda rng, f: ({"user_id": _user(rng, f)}, None)),
+    "ml_insights": ("GET", "/api/ml/insights", lambda rng, f: ({"user_id": _user(rng, f)}, None)),
+    "ml_predict": ("POST", "/api/ml/predict", lambda rng, f: (None, {"user_id": _user(rng, f)})),
+    "budget_get": ("GET", "/api/budget", lambda rng, f: ({"user_id": _user(rng, f)}, None)),
+    "goals_list": ("GET", "/api/goals", lambda rng, f: ({"user_id": _user(rng, f)}, None)),
+    "budget_save": ("POST", "/api/budget", lambda rng, f: (None, {
+        "user_id": _user(rng, f), "budget": rng.randrange(300, 2000),
+    })),
+    "goal_add": ("POST", "/api/goals", lambda rng, f: (None, {
+        "user_id": _user(rng, f), "name": "Benchmark", "target": rng.randrange(100, 2000), "deadline": "2026-12-31",
+    })),
+    "goal_contribute": ("POST", "/api/goals/contribute", lambda rng, f: (None, {
+        **_goal(rng, f), "amount": rng.randrange(1, 50),
+    })),
+    "goal_contribute_batch": ("POST", "/api/goals/contribute/batch", lambda rng, f: (None, {
+        "contributions": [{**_goal(rng, f), "amount": rng.randrange(1, 50)} for _ in range(20)],
+    })),
+}
+
+
+class FlaskTarget:
+    """Calls the app in this process through Flask's test client."""
+
+    label = "in-process"
+
+    def __init__(self):
+        from server import create_app
+        self.app = create_app()
+
+    def client(self):
+        client = self.app.test_client()
+
+        def call(method, path, params, body):
+            response = client.open(path, method=method, query_string=params, json=body)
+            return response.status_code, response.headers.get("X-DB-Queries")
+        return call
+
+
+class HttpTarget:
+    """Calls a running server over HTTP, one keep-alive connection per thread."""
+
+    def __init__(self, url):
+        self.label = url
+
+    def client(self):
+        import httpx
+        client = httpx.Client(base_url=self.label, timeout=60)
+
+        def call(method, path, params, body):
+            response = client.request(method, path, params=params, json=body)
+            return response.status_code, response.headers.get("X-DB-Queries")
+        return call
+
+
+def load_fixtures(db, user_ids=None, sample=FIXTURE_USERS, seed=0):
+    """Pick request targets: user IDs, and (user, goal) pairs for the contribution routes."""
+    if user_ids is None:
+        user_ids = [user["_id"] for user in db["users"].find({}, {"_id": 1}).limit(sample)]
+    user_ids = random.Random(seed).sample(user_ids, min(sample, len(user_ids)))
+    goals = db["goals"].find({"user": {"$in": user_ids}}, {"user": 1})
+    return {
+        "users": [str(user_id) for user_id in user_ids],
+        "goals": [{"user_id": str(goal["user"]), "goal_id": str(goal["_id"])} for goal in goals],
+    }
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def run_scenario(target, fixtures, name, requests, concurrency, warmup, seed):
+    method, path, build = SCENARIOS[name]
+    counter = itertools.count()
+
+    def worker(index):
+        # Each thread keeps its own samples; they are merged once every thread is done
+        rng = random.Random(seed * 1000 + index)
+        call = target.client()
+        latencies, statuses, queries = [], [], []
+        for _ in range(warmup // concurrency):
+            call(method, path, *build(rng, fixtures))
+        while next(counter) < requests:
+            params, body = build(rng, fixtures)
+            start = time.perf_counter()
+            status, db_queries = call(method, path, params, body)
+            latencies.append(time.perf_counter() - start)
+            statuses.append(status)
+            if db_queries is not None:
+                queries.append(int(db_queries))
+        return latencies, statuses, queries
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(worker, range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(value for sample in samples for value in sample[0])
+    statuses = Counter(status for sample in samples for status in sample[1])
+    queries = [count for sample in samples for count in sample[2]]
+    return {
+        "method": method,
+        "path": path,
+        "requests": len(latencies),
+        "errors": sum(count for status, count in statuses.items() if status >= 500),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "seconds": round(elapsed, 4),
+        "throughput": round(len(latencies) / elapsed, 2),
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies) * 1000, 3),
+            **{f"p{int(q * 100)}": round(percentile(latencies, q) * 1000, 3) for q in (0.50, 0.90, 0.95, 0.99)},
+            "max": round(latencies[-1] * 1000, 3),
+        },
+        "db_queries": round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+def git_revision():
+    root = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=root, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain"], cwd=root, capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+def compare(current, baseline, max_regression):
+    """Print per-route changes against a baseline results file; returns the routes whose p95 regressed."""
+    regressed = []
+    print(f"\n{'route':<22} {'req/s':>18} {'p50 ms':>20} {'p95 ms':>20}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        cells = []
+        for value, old in [
+            (result["throughput"], base["throughput"]),
+            (result["latency_ms"]["p50"], base["latency_ms"]["p50"]),
+            (result["latency_ms"]["p95"], base["latency_ms"]["p95"]),
+        ]:
+            change = (value - old) / old * 100 if old else 0.0
+            cells.append(f"{value:>10.1f} {change:+7.1f}%")
+        print(f"{name:<22} {cells[0]:>18} {cells[1]:>20} {cells[2]:>20}")
+
+        old_p95 = base["latency_ms"]["p95"]
+        if max_regression and old_p95 and (result["latency_ms"]["p95"] - old_p95) / old_p95 * 100 > max_regression:
+            regressed.append(name)
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end route benchmark on synthetic data.")
+    parser.add_argument("--backend", choices=["mongod", "mongomock"], default="mongod",
+                        help="mongomock runs everything in this process (implies no --url)")
+    parser.add_argument("--url", help="Benchmark a running server instead of the app in this process")
+    parser.add_argument("--no-seed", action="store_true", help="Reuse the users already in MONGO_DB_NAME")
+    parser.add_argument("--drop", action="store_true", help="Drop the database when finished")
+    parser.add_argument("--routes", default=",".join(SCENARIOS), help="Comma-separated scenarios to run")
+    parser.add_argument("--requests", type=int, default=2000, help="Measured requests per route")
+    parser.add_argument("--warmup", type=int, default=50, help="Unmeasured requests per route")
+    parser.add_argument("--concurrency", type=int, default=8, help="Client threads")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", help="Results JSON from an earlier run to diff against")
+    parser.add_argument("--max-regression", type=float, default=0, help="Fail if a p95 grows by more than this %% (0 = off)")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    routes = [name.strip() for name in args.routes.split(",") if name.strip()]
+    unknown = [name for name in routes if name not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown routes {unknown}; choose from {', '.join(SCENARIOS)}")
+
+    if args.backend == "mongomock":
+        if args.url:
+            raise SystemExit("--url needs --backend mongod: the server can't see this process's mongomock")
+        import mongomock
+        db_module.set_client(mongomock.MongoClient())
+        if "goal_contribute_batch" in routes:
+            # mongomock's bulk_write doesn't accept current pymongo UpdateOne objects
+            print("Skipping goal_contribute_batch: not supported on mongomock")
+            routes.remove("goal_contribute_batch")
+    elif (not args.no_seed or args.drop) and db_module.MONGO_DB_NAME == "studentFinancesApp":
+        raise SystemExit("Set MONGO_DB_NAME to a scratch database before seeding or dropping")
+    db = db_module.get_db()
+
+    seeded = None
+    if args.no_seed:
+        fixtures = load_fixtures(db, seed=args.random_seed)
+    else:
+        started = time.perf_counter()
+        seeded = seed_from_args(db, args)
+        seeded["seconds"] = round(time.perf_counter() - started, 2)
+        fixtures = load_fixtures(db, seeded.pop("user_ids"), seed=args.random_seed)
+        print(f"Seeded {seeded['users']} users, {seeded['transactions']} transactions in {seeded['seconds']}s")
+    if not fixtures["users"]:
+        raise SystemExit(f"No users in {db_module.MONGO_DB_NAME}; run without --no-seed")
+    if not fixtures["goals"]:
+        routes = [name for name in routes if not name.startswith("goal_contribute")]
+
+    target = HttpTarget(args.url) if args.url else FlaskTarget()
+    commit, dirty = git_revision()
+    results = {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "commit": commit,
+            "dirty": dirty,
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": args.backend,
+            "target": target.label,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "data": seeded or {"users": db["users"].estimated_document_count(), "transactions": db["transactions"].estimated_document_count()},
+        },
+        "results": {},
+    }
+
+    print(f"{target.label} on {args.backend}, {args.concurrency} threads, {args.requests} requests per route")
+    print(f"{'route':<22} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8} {'errors':>7}")
+    try:
+        for index, name in enumerate(routes):
+            result = run_scenario(target, fixtures, name, args.requests, args.concurrency, args.warmup, args.random_seed + index)
+            if args.backend == "mongomock":
+                result["db_queries"] = None  # mongomock emits no command events to count
+            results["results"][name] = result
+            latency = result["latency_ms"]
+            queries = "-" if result["db_queries"] is None else f"{result['db_queries']:.1f}"
+            print(f"{name:<22} {result['throughput']:>9.1f} {latency['p50']:>9.2f} {latency['p95']:>9.2f} "
+                  f"{latency['p99']:>9.2f} {queries:>8} {result['errors']:>7}")
+    finally:
+        if args.drop:
+            db_module.get_client().drop_database(db_module.MONGO_DB_NAME)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as out:
+            json.dump(results, out, indent=2)
+        print(f"✅ Wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as handle:
+            regressed = compare(results, json.load(handle), args.max_regression)
+        if regressed:
+            raise SystemExit(f"p95 regressed by more than {args.max_regression}% on: {', '.join(regressed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Check the compiled inference path against pipeline.predict and time both
+for single-row predictions.
+
+    cd backend/ml
+    python benchmarks/bench_fast_inference.py --rows 200
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from fast_model import CompiledSpendingModel
+from model_registry import registry
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--tolerance", type=float, default=1e-6)
+    args = parser.parse_args()
+
+    pipeline = registry.get().pipeline
+    compiled = CompiledSpendingModel(pipeline)
+
+    columns = compiled.numerical_cols + compiled.categorical_cols
+    rows = pd.read_csv(os.path.join(BASE_DIR, "student_spending.csv"))[columns].head(args.rows).to_dict("records")
+
+    # ✅ Parity
+    expected = pipeline.predict(pd.DataFrame(rows))
+    actual = np.array([compiled.predict_one(row) for row in rows])
+    max_error = float(np.abs(expected - actual).max())
+    print(f"max abs difference over {len(rows)} rows: {max_error:.2e}")
+    if max_error > args.tolerance:
+        sys.exit(f"❌ Compiled model differs from pipeline.predict by more than {args.tolerance}")
+
+    # ⏱ Latency
+    for name, predict in [
+        ("pipeline.predict", lambda row: pipeline.predict(pd.DataFrame([row]))[0]),
+        ("compiled predict_one", compiled.predict_one),
+    ]:
+        start = time.perf_counter()
+        for row in rows:
+            predict(row)
+        per_row = (time.perf_counter() - start) / len(rows) * 1e6
+        print(f"{name:22s} {per_row:9.1f} µs/prediction")
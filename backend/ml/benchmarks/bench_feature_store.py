@@ -0,0 +1,74 @@
+"""
+Compare reading from the columnar feature store with the raw sources:
+
+  profiles  pandas CSV parse vs the memory-mapped Arrow copy used by train_model.py
+  forecast  forecast_all_users() from insight_summaries vs from feature store snapshots
+  snapshot  full rebuild vs an incremental snapshot of new transactions
+
+    cd backend/ml
+    python benchmarks/bench_feature_store.py --users 2000
+
+Runs on mongomock with synthetic data (see synthetic.py) and a temporary store.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mongomock
+import pandas as pd
+
+import db as db_module
+from feature_store import PROFILES_CSV, FeatureStore
+from ml_model import forecast_all_users
+from synthetic import seed_database
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Feature store read and snapshot benchmark.")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    db_module.set_client(mongomock.MongoClient())
+    db = db_module.get_db()
+    root = tempfile.mkdtemp(prefix="feature-store-")
+    store = FeatureStore(root)
+    try:
+        store.profiles()  # First call imports the CSV
+        csv_ms, _ = timed(lambda: pd.read_csv(PROFILES_CSV, index_col=0), args.repeat)
+        arrow_ms, _ = timed(lambda: store.profiles().to_pandas(), args.repeat)
+        print(f"profiles  csv {csv_ms:8.2f} ms   arrow {arrow_ms:8.2f} ms")
+
+        seeded = seed_database(db, args.users)
+        rebuild_ms, _ = timed(lambda: store.rebuild(db, lag=timedelta(0)), 1)
+        seed_database(db, max(1, args.users // 100), seed=7)
+        time.sleep(1)  # Watermarks have one-second resolution
+        snapshot_ms, snapshot = timed(lambda: store.snapshot(db, lag=timedelta(0)), 1)
+        print(f"snapshot  rebuild of {seeded['transactions']} txns {rebuild_ms:8.1f} ms   "
+              f"incremental {snapshot['transactions']} txns {snapshot_ms:8.1f} ms")
+
+        mongo_ms, from_mongo = timed(forecast_all_users, args.repeat)
+        store_ms, from_store = timed(lambda: forecast_all_users(store), args.repeat)
+        print(f"forecast  summaries {mongo_ms:8.1f} ms   feature store {store_ms:8.1f} ms   "
+              f"same result: {from_mongo == from_store}")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Compare the per-user LinearRegression forecast with the vectorized batch
+forecaster on synthetic monthly histories, checking the results match.
+
+    cd backend/ml
+    python benchmarks/bench_forecast.py --users 5000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from ml_model import predict_next_month_spending, predict_next_month_spending_batch
+
+
+def synthetic_transactions(users, seed=42):
+    rng = np.random.default_rng(seed)
+    history = rng.integers(1, 80, users)  # Skewed: some users have one transaction, some dozens
+    user = np.repeat(np.arange(users), history)
+    days = rng.integers(0, 540, len(user))
+    return pd.DataFrame({
+        "user": user,
+        "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(days, unit="D"),
+        "amount": rng.gamma(2.0, 25.0, len(user)).round(2),
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=5000)
+    args = parser.parse_args()
+
+    transactions = synthetic_transactions(args.users)
+    print(f"{len(transactions)} transactions across {args.users} users")
+
+    start = time.perf_counter()
+    per_user = {
+        user: predict_next_month_spending(group[["date", "amount"]].copy())
+        for user, group in transactions.groupby("user")
+    }
+    per_user_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = predict_next_month_spending_batch(transactions.assign(
+        year=transactions["date"].dt.year, month=transactions["date"].dt.month,
+    ))
+    batch_seconds = time.perf_counter() - start
+
+    mismatches = sum(per_user[user] != batch[user] for user in per_user)
+    print(f"per-user LinearRegression {per_user_seconds:8.3f} s")
+    print(f"vectorized batch          {batch_seconds:8.3f} s  ({per_user_seconds / batch_seconds:.0f}x)")
+    print(f"mismatched forecasts: {mismatches}")
+    if mismatches:
+        sys.exit(1)
@@ -0,0 +1,78 @@
+"""
+Measure bulk import throughput on a generated CSV (1M rows by default).
+
+    cd backend/ml
+    python benchmarks/bench_import.py --rows 1000000                        # writes to MONGO_URI
+    python benchmarks/bench_import.py --rows 1000000 --backend mongomock    # writes in-process
+    python benchmarks/bench_import.py --rows 1000000 --dry-run              # parse + validate only
+
+Peak RSS is reported to show memory stays bounded by the batch size (on mongod;
+mongomock keeps every inserted document in this process).
+"""
+import argparse
+import csv
+import os
+import random
+import resource
+import sys
+import tempfile
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId
+
+import db as db_module
+from transaction_import import CATEGORIES, PAYMENT_METHODS, STATUSES, import_transactions, open_text
+
+
+def write_csv(path, rows, error_rate=0.001, seed=42):
+    rng = random.Random(seed)
+    categories, methods, statuses = sorted(CATEGORIES), sorted(PAYMENT_METHODS), sorted(STATUSES)
+    start = date(2023, 1, 1)
+    with open(path, "w", newline="") as out:
+        writer = csv.writer(out)
+        writer.writerow(["date", "amount", "category", "paymentMethod", "description", "status"])
+        for i in range(rows):
+            category = rng.choice(categories) if rng.random() > error_rate else "Unknown"
+            writer.writerow([
+                (start + timedelta(days=rng.randrange(730))).isoformat(),
+                round(rng.uniform(1, 200), 2),
+                category,
+                rng.choice(methods),
+                f"Bank export row {i}",
+                rng.choice(statuses),
+            ])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--backend", choices=["mongod", "mongomock"], default="mongod")
+    args = parser.parse_args()
+
+    if args.backend == "mongomock":
+        import mongomock
+
+        db_module.set_client(mongomock.MongoClient())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "transactions.csv")
+        write_csv(path, args.rows)
+        print(f"Generated {args.rows} rows ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+        db = db_module.get_db()
+        user_id = ObjectId()
+        try:
+            with open(path, "rb") as upload:
+                report = import_transactions(db, open_text(upload), user_id, "csv", args.batch_size, args.dry_run)
+        finally:
+            if not args.dry_run:
+                db["transactions"].delete_many({"user": user_id})
+                db["insight_summaries"].delete_many({"user": user_id})
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{'dry run' if args.dry_run else args.backend}: inserted {report['inserted']}  failed {report['failed']}  "
+          f"{report['seconds']} s  {report['rows_per_second']} rows/s  peak RSS {peak_mb:.0f} MB")
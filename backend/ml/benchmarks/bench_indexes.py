@@ -0,0 +1,86 @@
+"""
+Seed a scratch database, create the indexes and check with explain() that no
+query path falls back to a full scan (a COLLSCAN, or a walk of the _id_ index for
+a per-user query). Also times each path.
+
+    cd backend/ml
+    python benchmarks/bench_indexes.py --users 200 --transactions 200000
+
+Needs a running mongod at MONGO_URI. Uses (and drops) a separate database.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId
+
+from db import get_client
+from indexes import ensure_indexes, explain_query_paths, query_paths
+
+
+def seed(db, users, transactions, seed=42):
+    rng = random.Random(seed)
+    user_ids = [ObjectId() for _ in range(users)]
+    batch = []
+    for _ in range(transactions):
+        batch.append({
+            "user": rng.choice(user_ids),
+            "date": datetime(2024, 1, 1) + timedelta(minutes=rng.randrange(60 * 24 * 540)),
+            "amount": round(rng.uniform(1, 200), 2),
+            "category": rng.choice(["Food", "Rent", "Entertainment", "Travel", "Miscellaneous"]),
+        })
+        if len(batch) == 10000:
+            db["transactions"].insert_many(batch)
+            batch = []
+    if batch:
+        db["transactions"].insert_many(batch)
+    db["budgets"].insert_many([{"user": user, "budget": 500} for user in user_ids])
+    db["goals"].insert_many([{"user": user, "name": "Trip", "target": 300, "saved": 0} for user in user_ids])
+    return user_ids
+
+
+def time_paths(db, user_id, repeat=20):
+    timings = {}
+    for label, collection, kind, spec in query_paths(user_id):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            if kind == "find":
+                query, sort = spec
+                cursor = db[collection].find(query)
+                list(cursor.sort(sort) if sort else cursor)
+            else:
+                list(db[collection].aggregate(spec))
+        timings[label] = (time.perf_counter() - start) / repeat * 1000
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--transactions", type=int, default=200000)
+    parser.add_argument("--db", default="studentFinancesApp_bench_indexes")
+    args = parser.parse_args()
+
+    client = get_client()
+    client.drop_database(args.db)
+    db = client[args.db]
+    try:
+        user_id = seed(db, args.users, args.transactions)[0]
+        before = time_paths(db, user_id)
+        ensure_indexes(db)
+        after = time_paths(db, user_id)
+
+        failed = False
+        for label, stages, full_scan in explain_query_paths(db, user_id):
+            failed |= full_scan
+            print(f"{'❌' if full_scan else '✅'} {label:38s} {before[label]:8.2f} ms -> {after[label]:8.2f} ms  "
+                  f"({' <- '.join(dict.fromkeys(stages))})")
+        if failed:
+            sys.exit("❌ A query path still scans the whole collection")
+    finally:
+        client.drop_database(args.db)
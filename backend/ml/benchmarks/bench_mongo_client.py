@@ -0,0 +1,63 @@
+"""
+Compare request latency with a new MongoClient per call (the old fetch_transactions
+behaviour) against the shared pooled client from db.py.
+
+    cd backend/ml
+    python benchmarks/bench_mongo_client.py --requests 200 --user <user_id>
+
+Needs a running mongod at MONGO_URI.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId
+from pymongo import MongoClient
+
+import db
+
+
+def per_call_client(user_id):
+    client = MongoClient(db.MONGO_URI)
+    try:
+        return list(client[db.MONGO_DB_NAME]["transactions"].find({"user": user_id}, {"_id": 0, "amount": 1}))
+    finally:
+        client.close()
+
+
+def shared_client(user_id):
+    return list(db.get_db()["transactions"].find({"user": user_id}, {"_id": 0, "amount": 1}))
+
+
+def measure(fn, user_id, requests):
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        fn(user_id)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "mean_ms": statistics.mean(timings),
+        "p50_ms": timings[len(timings) // 2],
+        "p95_ms": timings[int(len(timings) * 0.95) - 1],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--user", default=str(ObjectId()), help="User ID to query (defaults to an empty user)")
+    args = parser.parse_args()
+
+    user_id = ObjectId(args.user)
+    shared_client(user_id)  # Warm up the pool so we measure steady state
+
+    for name, fn in [("per-call client", per_call_client), ("shared client", shared_client)]:
+        stats = measure(fn, user_id, args.requests)
+        print(f"{name:16s} mean {stats['mean_ms']:7.2f} ms  p50 {stats['p50_ms']:7.2f} ms  p95 {stats['p95_ms']:7.2f} ms")
+
+    db.close_client()
@@ -0,0 +1,84 @@
+"""
+Concurrent password changes: bcrypt inline on every request thread (the old
+change_password) against the bounded pool in passwords.py. Reports password
+changes per second and the latency of cheap requests served alongside them.
+
+    cd backend/ml
+    python benchmarks/bench_passwords.py --threads 32 --changes 64 --rounds 12
+    PASSWORD_WORKERS=2 python benchmarks/bench_passwords.py
+
+No database needed.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bcrypt
+
+import passwords
+
+
+def inline_change(current, stored, new, rounds):
+    if not bcrypt.checkpw(current, stored):
+        return None
+    return bcrypt.hashpw(new, bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def pooled_change(current, stored, new, rounds):
+    return passwords.change_password_hash(current, stored, new, rounds)
+
+
+def cheap_request():
+    # Stands in for a cached /api/budget: a little Python work, no bcrypt
+    return json.dumps({"budget": 500, "categories": [{"name": str(i), "amount": i} for i in range(50)]})
+
+
+def probe(stop, latencies):
+    while not stop.is_set():
+        start = time.perf_counter()
+        cheap_request()
+        latencies.append(time.perf_counter() - start)
+        time.sleep(0.005)
+
+
+def run(change, threads, changes, rounds):
+    stored = bcrypt.hashpw(b"current", bcrypt.gensalt(rounds))
+    latencies, stop = [], threading.Event()
+    prober = threading.Thread(target=probe, args=(stop, latencies))
+    prober.start()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as request_threads:
+        results = list(request_threads.map(lambda _: change(b"current", stored, b"new", rounds), range(changes)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    prober.join()
+    assert all(results)
+    latencies.sort()
+    return changes / elapsed, statistics.median(latencies) * 1000, latencies[int(0.99 * (len(latencies) - 1))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--threads", type=int, default=32, help="Concurrent request threads")
+    parser.add_argument("--changes", type=int, default=64, help="Password changes per run")
+    parser.add_argument("--rounds", type=int, default=passwords.BCRYPT_ROUNDS)
+    args = parser.parse_args()
+
+    print(f"{args.changes} changes, {args.threads} request threads, cost {args.rounds}, "
+          f"{passwords.PASSWORD_WORKERS} pool workers, {os.cpu_count()} CPUs")
+    for label, change in [("inline", inline_change), ("pool", pooled_change)]:
+        rate, p50, p99 = run(change, args.threads, args.changes, args.rounds)
+        print(f"{label:<7} {rate:7.1f} changes/s  cheap request p50 {p50:6.2f} ms  p99 {p99:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Incremental retraining (retrain.py: new trees added to the active forest) against a
+full refit of a forest the same size, after a batch of new users and transactions.
+Reports fit time and held-out error for both.
+
+    cd backend/ml
+    python benchmarks/bench_retrain.py --users 5000 --new-users 500 --trees 50
+
+Runs on mongomock with synthetic data (see synthetic.py), a temporary feature store
+and a temporary model registry.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mongomock
+
+import db as db_module
+from feature_store import FeatureStore
+from model_registry import ModelRegistry
+from retrain import retrain
+from synthetic import seed_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental retrain vs full refit.")
+    parser.add_argument("--users", type=int, default=5000, help="Users behind the active model")
+    parser.add_argument("--new-users", type=int, default=500, help="Users added before retraining")
+    parser.add_argument("--trees", type=int, default=50, help="Trees added by the incremental retrain")
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    args = parser.parse_args()
+
+    db_module.set_client(mongomock.MongoClient())
+    db = db_module.get_db()
+    root = tempfile.mkdtemp(prefix="retrain-bench-")
+    store = FeatureStore(os.path.join(root, "store"))
+    registry = ModelRegistry(os.path.join(root, "registry"))
+    try:
+        seed_database(db, args.users)
+        store.snapshot(db, lag=timedelta(0))
+        base = retrain(db, store, registry, force=True, full=True, n_jobs=args.n_jobs)
+        base_trees = registry.metadata(base["version"])["n_trees"]
+        print(f"active model: full fit on {args.users} users, {base_trees} trees, {base['timings']['fit_seconds']:.2f}s")
+
+        seed_database(db, args.new_users, seed=7)
+        store.snapshot(db, lag=timedelta(0))  # Include everything just inserted
+        common = {"force": True, "n_jobs": args.n_jobs, "publish": False}
+        incremental = retrain(db, store, registry, n_trees=args.trees, **common)
+        full = retrain(db, store, registry, full=True, n_trees=base_trees + args.trees, **common)
+
+        for label, result in [("incremental", incremental), ("full refit", full)]:
+            print(f"{label:<12} fit {result['timings']['fit_seconds']:7.2f}s   held-out {result['metrics']}")
+        print(f"incremental retrain is {full['timings']['fit_seconds'] / incremental['timings']['fit_seconds']:.1f}x faster")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
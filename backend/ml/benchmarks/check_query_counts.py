@@ -0,0 +1,77 @@
+"""
+Count the MongoDB commands each insights request issues, per collection, and fail
+if any request reads a collection more than once.
+
+    cd backend/ml
+    MONGO_DB_NAME=queryCountCheck python benchmarks/check_query_counts.py
+
+Needs a running mongod at MONGO_URI: the counts come from the driver's command
+monitoring (query_stats.py), which mongomock does not emit. Seeds a few synthetic
+users (see synthetic.py) into MONGO_DB_NAME and drops it afterwards unless --keep.
+Exits 1 on any request over budget.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import g
+
+from db import MONGO_DB_NAME, get_client, get_db
+from server import create_app
+from synthetic import seed_database
+
+# 🔎 label -> request path; every collection may be read at most once per request
+CASES = {
+    "insights summary": "/api/insights?user_id={user}&mode=summary",
+    "insights aggregate": "/api/insights?user_id={user}&mode=aggregate",
+    "insights loop": "/api/insights?user_id={user}&mode=loop",
+    "insights window": "/api/insights?user_id={user}&from=2024-03-01&to=2024-06-30&granularity=month",
+    "ml insights": "/api/ml/insights?user_id={user}",
+    "ml insights window": "/api/ml/insights?user_id={user}&from=2024-03-01&to=2024-06-30",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check per-request MongoDB reads for the insights routes.")
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded database")
+    args = parser.parse_args()
+
+    if MONGO_DB_NAME == "studentFinancesApp":
+        raise SystemExit("Set MONGO_DB_NAME to a scratch database first")
+
+    user_ids = seed_database(get_db(), args.users)["user_ids"]
+    app = create_app()
+    captured = []
+
+    @app.after_request
+    def capture(response):
+        captured.append(g.get("db_query_stats"))
+        return response
+
+    client = app.test_client()
+    failed = False
+    try:
+        for label, path in CASES.items():
+            for user in user_ids:
+                response = client.get(path.format(user=user))
+                stats = captured[-1]
+                over = {name: count for name, count in stats.collections.items() if count > 1}
+                if response.status_code != 200 or over:
+                    failed = True
+                    print(f"❌ {label}: HTTP {response.status_code}, reads {stats.collections}")
+                    break
+            else:
+                print(f"✅ {label:<20} {stats.total} commands  {stats.collections}")
+    finally:
+        if not args.keep:
+            get_client().drop_database(MONGO_DB_NAME)
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Load-test the dashboard routes on the Flask server (app.py) and the ASGI server
+(async_app.py) with many concurrent clients, and report throughput and latency.
+
+    cd backend/ml
+    export MONGO_DB_NAME=loadTest              # scratch database, shared with both servers
+    python app.py &                            # :5001
+    uvicorn async_app:app --port 5003 &        # :5003
+    python benchmarks/load_test.py --seed --users 500 --concurrency 1000 --duration 30
+
+Needs a running mongod at MONGO_URI (a local `mongod --dbpath /tmp/loadtest` is enough)
+and httpx. --seed fills the database with synthetic users (see synthetic.py); --drop
+removes it afterwards.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from db import MONGO_DB_NAME, get_client, get_db
+from synthetic import seed_database
+
+
+def requests_for(user_id):
+    """The calls one dashboard load makes."""
+    return [
+        ("GET", "/api/insights", {"user_id": user_id}, None),
+        ("GET", "/api/budget", {"user_id": user_id}, None),
+        ("GET", "/api/goals", {"user_id": user_id}, None),
+        ("GET", "/api/ml/insights", {"user_id": user_id}, None),
+        ("POST", "/api/ml/predict", None, {"user_id": user_id}),
+    ]
+
+
+async def worker(client, user_ids, deadline, latencies, errors, rng):
+    while time.perf_counter() < deadline:
+        method, path, params, body = rng.choice(requests_for(rng.choice(user_ids)))
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, params=params, json=body)
+            if response.status_code >= 500:
+                errors.append(response.status_code)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(base_url, user_ids, concurrency, duration, seed=0):
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            worker(client, user_ids, deadline, latencies, errors, random.Random(seed + i))
+            for i in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+    return latencies, errors, elapsed
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def report(label, latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    p50, p95, p99 = (percentile(latencies, q) * 1000 for q in (0.50, 0.95, 0.99))
+    print(f"{label:<6} {len(latencies) / elapsed:9.1f} req/s  "
+          f"p50 {p50:8.1f} ms  p95 {p95:8.1f} ms  p99 {p99:8.1f} ms  "
+          f"errors {len(errors)}/{len(latencies)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the sync and async servers under load.")
+    parser.add_argument("--sync-url", default="http://127.0.0.1:5001")
+    parser.add_argument("--async-url", default="http://127.0.0.1:5003")
+    parser.add_argument("--only", choices=["sync", "async"], help="Test one server only")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=20, help="Seconds per server")
+    parser.add_argument("--seed", action="store_true", help="Insert synthetic users first")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--transactions", type=int, default=200, help="Median transactions per seeded user")
+    parser.add_argument("--drop", action="store_true", help="Drop the database when finished")
+    args = parser.parse_args()
+
+    if (args.seed or args.drop) and MONGO_DB_NAME == "studentFinancesApp":
+        raise SystemExit("Set MONGO_DB_NAME to a scratch database before using --seed or --drop")
+
+    db = get_db()
+    if args.seed:
+        start = time.perf_counter()
+        seed_database(db, args.users, median_history=args.transactions)
+        print(f"Seeded {args.users} users into {MONGO_DB_NAME} in {time.perf_counter() - start:.1f}s")
+    user_ids = [str(user["_id"]) for user in db["users"].find({}, {"_id": 1}).limit(args.users)]
+    if not user_ids:
+        raise SystemExit(f"No users in {MONGO_DB_NAME}; run with --seed")
+
+    print(f"{args.concurrency} concurrent clients, {args.duration:.0f}s per server, {len(user_ids)} users")
+    targets = [("sync", args.sync_url), ("async", args.async_url)]
+    for label, url in targets:
+        if args.only and label != args.only:
+            continue
+        report(label, *asyncio.run(run(url, user_ids, args.concurrency, args.duration)))
+
+    if args.drop:
+        get_client().drop_database(MONGO_DB_NAME)
+
+
+if __name__ == "__main__":
+    main()
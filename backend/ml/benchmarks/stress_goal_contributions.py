@@ -0,0 +1,90 @@
+"""
+Hammer a few goals with concurrent contributions and count lost updates.
+
+  rmw    the old find_one + $set read-modify-write (two round trips, racy)
+  inc    one atomic find_one_and_update($inc) per contribution
+  batch  bulk_write of $inc updates, --batch-size contributions per call
+
+    cd backend/ml
+    python benchmarks/stress_goal_contributions.py --threads 32 --contributions 20000 --goals 4
+
+Needs a running mongod at MONGO_URI. Uses (and drops) a separate database.
+Exits 1 if an atomic mode loses an update.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId
+
+from db import get_client
+from goal_contributions import contribute, contribute_many
+
+AMOUNT = 1
+
+
+def read_modify_write(collection, goal_obj, user_obj):
+    goal = collection.find_one({"_id": goal_obj, "user": user_obj})
+    collection.update_one({"_id": goal_obj}, {"$set": {"saved": goal.get("saved", 0) + AMOUNT}})
+
+
+def run(collection, mode, goal_count, user, threads, contributions, batch_size):
+    collection.delete_many({})
+    goal_ids = collection.insert_many([{"user": user, "name": f"g{i}", "saved": 0} for i in range(goal_count)]).inserted_ids
+    targets = [goal_ids[i % len(goal_ids)] for i in range(contributions)]
+
+    if mode == "rmw":
+        jobs = [lambda goal=goal: read_modify_write(collection, goal, user) for goal in targets]
+    elif mode == "inc":
+        jobs = [lambda goal=goal: contribute(collection, goal, user, AMOUNT) for goal in targets]
+    else:
+        items = [{"user_id": str(user), "goal_id": str(goal), "amount": AMOUNT} for goal in targets]
+        jobs = [
+            lambda chunk=items[start:start + batch_size]: contribute_many(collection, chunk)
+            for start in range(0, len(items), batch_size)
+        ]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda job: job(), jobs))
+    elapsed = time.perf_counter() - start
+
+    saved = sum(goal["saved"] for goal in collection.find({"user": user}, {"saved": 1}))
+    return contributions / elapsed, contributions * AMOUNT - saved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent goal contribution stress test.")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--contributions", type=int, default=20000)
+    parser.add_argument("--goals", type=int, default=4, help="Fewer goals means more contention")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--db", default="goalStress")
+    args = parser.parse_args()
+
+    client = get_client()
+    collection = client[args.db]["goals"]
+    user = ObjectId()
+
+    print(f"{args.contributions} contributions over {args.goals} goals from {args.threads} threads")
+    rates, failed = {}, False
+    try:
+        for mode in ["rmw", "inc", "batch"]:
+            rate, lost = run(collection, mode, args.goals, user, args.threads, args.contributions, args.batch_size)
+            rates[mode] = rate
+            print(f"{mode:<6} {rate:10.0f} contributions/s  lost updates {lost}")
+            failed |= mode != "rmw" and lost != 0
+    finally:
+        client.drop_database(args.db)
+
+    print(f"inc is {rates['inc'] / rates['rmw']:.1f}x, batch is {rates['batch'] / rates['rmw']:.1f}x the old path")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
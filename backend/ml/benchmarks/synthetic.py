@@ -0,0 +1,203 @@
+"""
+Generate synthetic users, transactions, budgets and goals, seeded from the
+student profiles in student_spending.csv, and load them into MongoDB.
+
+Each user copies a random CSV profile (age, income, aid, major, ...) with some
+jitter and spends in proportion to that profile's monthly category spending.
+History lengths are log-normal: most users have a few dozen transactions, a
+long tail has thousands. Summaries and budget alerts are built in memory, so
+seeding needs no per-user rebuild queries.
+
+    cd backend/ml
+    MONGO_DB_NAME=benchData python benchmarks/synthetic.py --users 100000
+    MONGO_DB_NAME=benchData python benchmarks/synthetic.py --users 1000000 --median-history 20 --batch-users 5000
+
+bench_e2e.py and load_test.py use seed_database() directly.
+"""
+import argparse
+import csv
+import math
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId
+
+from db import MONGO_DB_NAME, get_db
+from indexes import ensure_indexes
+from insight_summary import SUMMARY_COLLECTION, budget_alerts, summarize_transactions
+
+PROFILES_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "student_spending.csv")
+
+# 🗂 CSV spending columns -> transaction categories (models/Transaction.js)
+CATEGORY_COLUMNS = {
+    "Rent": ["housing"],
+    "Food": ["food"],
+    "Travel": ["transportation"],
+    "Entertainment": ["entertainment"],
+    "Miscellaneous": ["books_supplies", "personal_care", "technology", "health_wellness", "miscellaneous"],
+}
+PROFILE_FIELDS = ["age", "gender", "year_in_school", "major", "monthly_income", "financial_aid", "tuition", "preferred_payment_method"]
+NUMERIC_FIELDS = {"age", "monthly_income", "financial_aid", "tuition"}
+GOAL_NAMES = ["Emergency Fund", "Laptop", "Trip", "Textbooks", "Concert Tickets", "Deposit"]
+
+# Placeholder bcrypt hash: synthetic users never log in, and hashing 1M passwords would dominate seeding
+PASSWORD_HASH = "$2b$04$" + "0" * 53
+
+HISTORY_START = datetime(2024, 1, 1)
+HISTORY_DAYS = 365
+
+
+def load_profiles(path=PROFILES_CSV):
+    """Read the CSV into profiles: the user fields plus monthly spending per category."""
+    profiles = []
+    with open(path, newline="") as handle:
+        for row in csv.DictReader(handle):
+            fields = {name: int(row[name]) if name in NUMERIC_FIELDS else row[name] for name in PROFILE_FIELDS}
+            monthly = {category: sum(int(row[column]) for column in columns) for category, columns in CATEGORY_COLUMNS.items()}
+            profiles.append({"fields": fields, "monthly": monthly})
+    return profiles
+
+
+def history_length(rng, median, skew, maximum):
+    """Log-normal transaction count: `median` for the typical user, a long tail set by `skew`."""
+    return max(1, min(maximum, int(rng.lognormvariate(math.log(median), skew))))
+
+
+def generate_user(rng, profile, transaction_count):
+    """Build one user's documents: (user, budget, goals, transactions)."""
+    user_id = ObjectId()
+    jitter = rng.uniform(0.8, 1.2)
+    fields = dict(profile["fields"])
+    for name in ("monthly_income", "financial_aid", "tuition"):
+        fields[name] = int(fields[name] * jitter)
+
+    user = {
+        "_id": user_id,
+        "username": f"synthetic-{user_id}",
+        "email": f"{user_id}@example.com",
+        "password": PASSWORD_HASH,
+        "createdAt": HISTORY_START,
+        **fields,
+    }
+
+    # 💸 Spread the profile's monthly spending over the user's transactions
+    monthly = {category: amount * jitter for category, amount in profile["monthly"].items() if amount > 0}
+    categories, weights = list(monthly), list(monthly.values())
+    months = HISTORY_DAYS / 30
+    per_category = {category: max(1, transaction_count * amount / sum(weights)) for category, amount in monthly.items()}
+    payment = "Cash" if fields["preferred_payment_method"] == "Cash" else "Card"
+
+    offsets = sorted(rng.randrange(HISTORY_DAYS * 24 * 60) for _ in range(transaction_count))
+    transactions = []
+    for offset in offsets:
+        category = rng.choices(categories, weights)[0]
+        mean = monthly[category] * months / per_category[category]
+        transactions.append({
+            "_id": ObjectId(),
+            "user": user_id,
+            "date": HISTORY_START + timedelta(minutes=offset),
+            "amount": round(max(0.5, rng.gauss(mean, mean / 3)), 2),
+            "category": category,
+            "paymentMethod": payment,
+            "description": f"{category} purchase",
+            "status": "Completed",
+        })
+
+    budget = {
+        "user": user_id,
+        "budget": round(sum(weights) * rng.uniform(0.85, 1.15)),
+        "spent": 0,
+        "categories": [{"name": category, "amount": round(amount)} for category, amount in monthly.items()],
+        "spendingTrends": [],
+    }
+
+    goals = [{
+        "user": user_id,
+        "name": rng.choice(GOAL_NAMES),
+        "target": float(round(fields["monthly_income"] * rng.uniform(0.5, 3))),
+        "saved": float(round(rng.uniform(0, 200), 2)),
+        "deadline": (HISTORY_START + timedelta(days=HISTORY_DAYS + rng.randrange(365))).strftime("%Y-%m-%d"),
+    } for _ in range(rng.randint(0, 3))]
+
+    return user, budget, goals, transactions
+
+
+def seed_database(db, users, median_history=40, skew=1.0, max_history=5000, batch_users=1000,
+                  seed=42, profiles=None, progress=None):
+    """
+    Insert `users` synthetic users with their transactions, budgets, goals and
+    insight summaries, `batch_users` at a time. Returns the user IDs and counts.
+    """
+    rng = random.Random(seed)
+    profiles = profiles or load_profiles()
+    ensure_indexes(db)
+
+    user_ids, transaction_total = [], 0
+    for start in range(0, users, batch_users):
+        batch = {"users": [], "budgets": [], "goals": [], "transactions": [], SUMMARY_COLLECTION: []}
+        for _ in range(min(batch_users, users - start)):
+            count = history_length(rng, median_history, skew, max_history)
+            user, budget, goals, transactions = generate_user(rng, rng.choice(profiles), count)
+
+            summary = summarize_transactions(user["_id"], transactions)
+            budget["alerts"] = budget_alerts(summary, budget["budget"])
+
+            batch["users"].append(user)
+            batch["budgets"].append(budget)
+            batch["goals"].extend(goals)
+            batch["transactions"].extend(transactions)
+            batch[SUMMARY_COLLECTION].append(summary)
+            user_ids.append(user["_id"])
+
+        for name, documents in batch.items():
+            if documents:
+                db[name].insert_many(documents, ordered=False)
+        transaction_total += len(batch["transactions"])
+        if progress:
+            progress(len(user_ids), transaction_total)
+
+    return {"user_ids": user_ids, "users": len(user_ids), "transactions": transaction_total}
+
+
+def add_arguments(parser):
+    """Data-shape options shared by the benchmark scripts."""
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--median-history", type=int, default=40, help="Typical transactions per user")
+    parser.add_argument("--skew", type=float, default=1.0, help="Log-normal sigma of history lengths (0 = all equal)")
+    parser.add_argument("--max-history", type=int, default=5000, help="Cap on transactions per user")
+    parser.add_argument("--batch-users", type=int, default=1000, help="Users generated per insert batch")
+    parser.add_argument("--random-seed", type=int, default=42)
+
+
+def seed_from_args(db, args, progress=None):
+    return seed_database(
+        db, args.users, args.median_history, args.skew, args.max_history, args.batch_users,
+        args.random_seed, progress=progress,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load synthetic users into MongoDB.")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    if MONGO_DB_NAME == "studentFinancesApp":
+        raise SystemExit("Set MONGO_DB_NAME to a scratch database first")
+
+    started = time.perf_counter()
+
+    def progress(users, transactions):
+        print(f"  {users:>9} users  {transactions:>11} transactions  {time.perf_counter() - started:7.1f}s", end="\r")
+
+    result = seed_from_args(get_db(), args, progress)
+    print(f"\n✅ Seeded {result['users']} users and {result['transactions']} transactions into "
+          f"{MONGO_DB_NAME} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+from blueprints.budget import budget_bp
+from blueprints.goals import goals_bp
+from blueprints.insights import insights_bp
+from blueprints.ml import ml_bp
+from blueprints.settings import settings_bp
+from blueprints.transactions import transactions_bp
+
+BLUEPRINTS = [budget_bp, insights_bp, goals_bp, settings_bp, transactions_bp, ml_bp]
@@ -0,0 +1,123 @@
+import logging
+from flask import Blueprint, jsonify, request
+from bson import ObjectId
+from db import get_db
+from goal_contributions import MAX_BATCH_SIZE, contribute, contribute_many, parse_contribution
+
+goals_bp = Blueprint("goals", __name__)
+logger = logging.getLogger(__name__)
+
+@goals_bp.route("/api/goals", methods=["GET"])
+def get_goals():
+    user_id = request.args.get("user_id")
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+
+    try:
+        user_id_obj = ObjectId(user_id)
+        goals = list(get_db()["goals"].find({"user": user_id_obj}))
+
+        # ✅ Convert ObjectId fields to string before returning
+        for goal in goals:
+            goal["_id"] = str(goal["_id"])
+            goal["user"] = str(goal["user"])  # Convert user ObjectId to string
+
+        return jsonify(goals), 200
+    except Exception as e:
+        logger.error("❌ Error fetching goals: %s", e)
+        return jsonify({"error": str(e)}), 500
+
+
+# ✅ Contribute to Goal
+@goals_bp.route("/api/goals/contribute", methods=["POST"])
+def contribute_to_goal():
+    data = request.json or {}
+
+    try:
+        goal_obj, user_obj, amount = parse_contribution(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        # ✅ One atomic $inc: no read-modify-write, so concurrent contributions can't be lost
+        new_savings = contribute(get_db()["goals"], goal_obj, user_obj, amount)
+        if new_savings is None:
+            return jsonify({"error": "Goal not found"}), 404
+
+        # ✅ Return updated goal
+        response = jsonify({"message": "Contribution added successfully", "new_savings": new_savings})
+        response.headers.add("Access-Control-Allow-Origin", "*")  # ✅ Fix CORS
+        return response, 200
+    except Exception as e:
+        logger.error("❌ Error contributing to goal: %s", e)
+        return jsonify({"error": str(e)}), 500
+
+
+# ✅ Contribute to many goals at once (one bulk write)
+@goals_bp.route("/api/goals/contribute/batch", methods=["POST"])
+def contribute_to_goals_batch():
+    data = request.json or {}
+    contributions = data.get("contributions")
+
+    if not contributions or not isinstance(contributions, list):
+        return jsonify({"error": "A list of contributions is required"}), 400
+    if len(contributions) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"At most {MAX_BATCH_SIZE} contributions per request"}), 400
+
+    try:
+        result = contribute_many(get_db()["goals"], contributions)
+        return jsonify(result), 200 if result["applied"] else 400
+    except Exception as e:
+        logger.error("❌ Error applying goal contributions: %s", e)
+        return jsonify({"error": str(e)}), 500
+
+
+@goals_bp.route("/api/goals", methods=["POST"])
+def add_goal():
+    data = request.json
+    user_id = data.get("user_id")
+    name = data.get("name")
+    target = data.get("target")
+    deadline = data.get("deadline")
+
+    if not user_id or not name or not target or not deadline:
+        return jsonify({"error": "All fields are required"}), 400
+
+    try:
+        goal_data = {
+            "user": ObjectId(user_id),  # Store as ObjectId in DB
+            "name": name,
+            "target": float(target),  # Ensure numeric storage
+            "saved": 0,  # Default to £0 saved
+            "deadline": deadline
+        }
+
+        # ✅ Insert goal into MongoDB
+        inserted_goal = get_db()["goals"].insert_one(goal_data)
+
+        # ✅ Convert `_id` and `user` to strings before returning response
+        goal_data["_id"] = str(inserted_goal.inserted_id)
+        goal_data["user"] = str(user_id)  
+
+        return jsonify(goal_data), 201
+    except Exception as e:
+        logger.error("❌ Error adding goal: %s", e)
+        return jsonify({"error": str(e)}), 500
+
+# ✅ DELETE Goal API Route (Fix CORS Issue)
+@goals_bp.route("/api/goals/<goal_id>", methods=["DELETE"])
+def delete_goal(goal_id):
+    try:
+        goal_obj = ObjectId(goal_id)
+
+        # ✅ Find and Delete Goal
+        result = get_db()["goals"].delete_one({"_id": goal_obj})
+
+        if result.deleted_count == 0:
+            return jsonify({"error": "Goal not found"}), 404
+
+        response = jsonify({"message": "Goal deleted successfully"})
+        response.headers.add("Access-Control-Allow-Origin", "*")  # ✅ Allow CORS
+        return response, 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,111 @@
+import logging
+from flask import Blueprint, jsonify, request
+from bson import ObjectId
+from db import get_db
+from insights_pipeline import PERIOD_FORMATS, parse_limit, run_insights_aggregation
+from insight_summary import get_summary, summary_to_insights
+from insight_engine import build_insights_response, spending_insights, summarize_loop
+from instrumentation import phase
+from transaction_export import parse_date_range
+import os
+
+insights_bp = Blueprint("insights", __name__)
+logger = logging.getLogger(__name__)
+
+# 📊 "summary" reads the materialized per-user summary (see insight_summary.py),
+# "aggregate" pushes the work into MongoDB and "loop" scans transactions in Python
+INSIGHTS_MODE = os.environ.get("INSIGHTS_MODE", "summary")
+
+# ✅ ML API Route (Rename it to avoid conflicts)
+@insights_bp.route("/api/ml/insights", methods=["GET"])
+def get_ml_insights():
+    user_id = request.args.get("user_id")
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+
+    try:
+        date_filter = parse_date_range(request.args.get("from"), request.args.get("to"))
+    except ValueError:
+        return jsonify({"error": "Invalid date format"}), 400
+
+    try:
+        user_id_obj = ObjectId(user_id)
+
+        # ✅ One read for the spending (a window needs the raw rows, so it is aggregated) and one for the budget
+        summary, _ = load_summary(user_id_obj, "aggregate" if date_filter else "summary", date_filter)
+        budget_data = get_db()["budgets"].find_one({"user": user_id_obj}, {"budget": 1}) or {}
+
+        with phase("predict"):
+            return jsonify(spending_insights(summary, budget_data.get("budget", 0)))
+    except Exception as e:
+        logger.error("❌ Error fetching ML insights: %s", e)
+        return jsonify({"error": str(e)}), 500
+
+
+# ✅ Insights API Route (Fix Spending Distribution & Categories)
+@insights_bp.route("/api/insights", methods=["GET"])
+def get_financial_insights():
+    user_id = request.args.get("user_id")
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+
+    try:
+        user_id_obj = ObjectId(user_id)
+    except Exception as e:
+        return jsonify({"error": "Invalid User ID format"}), 400
+
+    mode = request.args.get("mode", INSIGHTS_MODE)
+
+    # 📅 Optional date window, trend granularity and trend pagination
+    granularity = request.args.get("granularity")
+    cursor = request.args.get("cursor")
+    try:
+        date_filter = parse_date_range(request.args.get("from"), request.args.get("to"))
+        limit = parse_limit(request.args.get("limit"))
+    except ValueError:
+        return jsonify({"error": "Invalid date range or limit"}), 400
+    if granularity and granularity not in PERIOD_FORMATS:
+        return jsonify({"error": f"Granularity must be one of {', '.join(PERIOD_FORMATS)}"}), 400
+
+    windowed = bool(date_filter or granularity or cursor or limit)
+    if windowed:
+        # ✅ Only the indexed date range is scanned, bucketed by real calendar periods
+        mode, granularity = "aggregate", granularity or "day"
+
+    summary, next_cursor = load_summary(user_id_obj, mode, date_filter, granularity, cursor, limit)
+    if not summary["count"]:
+        return jsonify({"error": "No transactions found"}), 404
+
+    # Fetch Budget Data
+    budget_data = get_db()["budgets"].find_one({"user": user_id_obj}, {"budget": 1, "alerts": 1}) or {}
+    budget = budget_data.get("budget", 0)
+
+    # ✅ AI-Based Recommendations from the summary and budget fetched above
+    with phase("predict"):
+        insights = spending_insights(summary, budget)
+
+    # ✅ Alerts stored on the budget cover all-time spending, so only the summary mode can use them
+    alerts = budget_data.get("alerts") if mode == "summary" else None
+
+    response = build_insights_response(summary, budget, insights.get("insights", []), alerts)
+    if windowed:
+        response["nextCursor"] = next_cursor  # ✅ Pass back as ?cursor= for the next page of trends
+
+    return jsonify(response)
+
+def load_summary(user_id_obj, mode, date_filter=None, granularity=None, cursor=None, limit=None):
+    """
+    Read the user's spending once, in the summary shape insight_engine works on.
+    Returns (summary, next_cursor); the cursor is only set for paginated aggregations.
+    """
+    if mode == "summary":
+        # ✅ One document lookup, kept current by the transaction write paths
+        return summary_to_insights(get_summary(get_db(), user_id_obj)), None
+    if mode == "aggregate":
+        # ✅ Let MongoDB group the transactions and ship back only the summary rows
+        summary = run_insights_aggregation(get_db()["transactions"], user_id_obj, date_filter, granularity, cursor, limit)
+        return summary, summary["next_cursor"]
+
+    transactions = list(get_db()["transactions"].find({"user": user_id_obj}))
+    with phase("summary"):
+        return summarize_loop(transactions), None
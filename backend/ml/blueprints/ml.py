@@ -0,0 +1,65 @@
+from flask import Blueprint, jsonify, request, Response
+import json
+from bson import ObjectId
+from db import get_db
+from model_registry import registry
+from predictor import (
+    active_model, build_features, generate_feedback, predict_batch, predict_features, prediction_cache
+)
+
+ml_bp = Blueprint("ml", __name__)
+
+# 📌 Prediction API
+@ml_bp.route("/api/ml/predict", methods=["POST"])
+def predict_spending():
+    data = request.json
+    user_id = data.get("user_id")
+
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+
+    # 🔍 Fetch User Data from MongoDB
+    user = get_db()["users"].find_one({"_id": ObjectId(user_id)})
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+
+    budget_data = get_db()["budgets"].find_one({"user": ObjectId(user_id)})
+    budget = budget_data.get("budget", 0) if budget_data else 0  # Default budget to 0 if not found
+
+    # 🚀 Predict Spending
+    predicted_spending = round(predict_features(build_features(user)), 2)
+
+    # 🔥 Generate Personalized Feedback
+    feedback = generate_feedback(predicted_spending, budget)
+
+    return jsonify({
+        "predicted_spending": predicted_spending,
+        "budget": budget,
+        "feedback": feedback
+    })
+
+# 📌 Batch Prediction API (streams one JSON object per line)
+@ml_bp.route("/api/ml/predict/batch", methods=["POST"])
+def predict_spending_batch():
+    data = request.json or {}
+    user_ids = data.get("user_ids")
+
+    if not user_ids or not isinstance(user_ids, list):
+        return jsonify({"error": "A list of user IDs is required"}), 400
+
+    def generate():
+        for result in predict_batch(get_db(), [str(user_id) for user_id in user_ids]):
+            yield json.dumps(result) + "\n"
+
+    return Response(generate(), mimetype="application/x-ndjson")
+
+# 📊 Prediction Cache Stats
+@ml_bp.route("/api/ml/cache", methods=["GET"])
+def prediction_cache_stats():
+    return jsonify({**prediction_cache.stats(), "model_version": active_model().version})
+
+# 🏷 Active Model Metadata
+@ml_bp.route("/api/ml/model", methods=["GET"])
+def model_metadata():
+    model = registry.get()
+    return jsonify({**model.metadata, "version": model.version})
@@ -0,0 +1,162 @@
+import logging
+from flask import Blueprint, jsonify, request
+from bson import ObjectId
+from db import get_db
+from passwords import change_password_hash
+from account_deletion import DeletionWorker, enqueue_deletion, job_status
+
+settings_bp = Blueprint("settings", __name__)
+logger = logging.getLogger(__name__)
+
+# 🗑 Removes a deleted user's transactions, budgets and goals off the request thread
+deletion_worker = DeletionWorker(get_db)
+
+
+@settings_bp.before_app_request
+def start_deletion_worker():
+    deletion_worker.ensure_started()
+
+# ✅ Update Username
+@settings_bp.route("/api/settings/username", methods=["POST"])
+def update_username():
+    data = request.json
+    user_id = data.get("user_id")
+    new_username = data.get("new_username")
+
+    if not user_id or not new_username:
+        return jsonify({"error": "Missing user ID or new username"}), 400
+
+    try:
+        user_obj = ObjectId(user_id)
+        get_db()["users"].update_one({"_id": user_obj}, {"$set": {"username": new_username}})
+        return jsonify({"message": "Username updated successfully"}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@settings_bp.route("/api/settings/password", methods=["POST"])
+def change_password():
+    data = request.json
+    user_id = data.get("user_id")
+    current_password = data.get("current_password").encode('utf-8')  # Convert to bytes
+    new_password = data.get("new_password").encode('utf-8')  # Convert to bytes
+
+    if not user_id or not current_password or not new_password:
+        return jsonify({"error": "Missing required fields"}), 400
+
+    try:
+        logger.debug("🔍 Changing password for user %s", user_id)
+        user_obj = ObjectId(user_id)
+        user = get_db()["users"].find_one({"_id": user_obj})
+        
+        if not user:
+            logger.debug("❌ User %s not found", user_id)
+            return jsonify({"error": "User not found"}), 404
+        
+        stored_password = user.get('password', '').encode('utf-8')  # Convert stored hash to bytes
+
+        if not stored_password:
+            return jsonify({"error": "Password not found in user data"}), 500
+
+        # ✅ Check the current password and hash the new one on the bcrypt pool (see passwords.py)
+        hashed_password = change_password_hash(current_password, stored_password, new_password)
+        if hashed_password is None:
+            return jsonify({"error": "Incorrect current password"}), 401
+
+        get_db()["users"].update_one({"_id": user_obj}, {"$set": {"password": hashed_password}})
+        logger.debug("✅ Password updated for user %s", user_id)
+        return jsonify({"message": "Password changed successfully"}), 200
+
+    except Exception as e:
+        logger.error("🔥 Error changing password: %s", e)
+        return jsonify({"error": str(e)}), 500
+
+
+# ✅ Update Preferences
+@settings_bp.route("/api/settings/preferences", methods=["POST"])
+def update_preferences():
+    data = request.json
+    user_id = data.get("user_id")
+    dark_mode = data.get("dark_mode", False)
+    currency = data.get("currency", "GBP")
+    notifications = data.get("notifications", True)
+
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+
+    try:
+        user_obj = ObjectId(user_id)
+        get_db()["users"].update_one(
+            {"_id": user_obj},
+            {
+                "$set": {
+                    "dark_mode": bool(dark_mode),  # Ensure it's stored as boolean
+                    "currency": currency if currency else "GBP",  # Default to GBP if missing
+                    "notifications": bool(notifications)  # Ensure it's stored as boolean
+                }
+            },
+            upsert=True  # 🔥 This ensures the fields exist if missing
+        )
+        return jsonify({"message": "Preferences updated successfully"}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# ✅ Delete Account
+@settings_bp.route("/api/settings/delete", methods=["DELETE"])
+def delete_account():
+    user_id = request.args.get("user_id")
+
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+
+    try:
+        user_obj = ObjectId(user_id)
+        job_id = enqueue_deletion(get_db(), user_obj)
+        deletion_worker.wake()
+        return jsonify({"message": "Account deleted successfully", "job_id": str(job_id)}), 202
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# ✅ Progress of a queued account deletion
+@settings_bp.route("/api/settings/delete/status", methods=["GET"])
+def delete_account_status():
+    job_id = request.args.get("job_id")
+    user_id = request.args.get("user_id")
+
+    if not job_id and not user_id:
+        return jsonify({"error": "Job ID or user ID is required"}), 400
+
+    try:
+        status = job_status(get_db(), ObjectId(job_id) if job_id else None, ObjectId(user_id) if user_id else None)
+    except Exception:
+        return jsonify({"error": "Invalid job or user ID"}), 400
+
+    if status is None:
+        return jsonify({"error": "Deletion job not found"}), 404
+    return jsonify(status), 200
+    
+
+# ✅ Fetch User Preferences
+@settings_bp.route("/api/settings/preferences", methods=["GET"])
+def get_preferences():
+    user_id = request.args.get("user_id")
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+
+    try:
+        user_obj = ObjectId(user_id)
+        user = get_db()["users"].find_one({"_id": user_obj}, {"_id": 0, "dark_mode": 1, "currency": 1, "notifications": 1})
+
+        if not user:
+            # ✅ Return default values instead of 404
+            return jsonify({
+                "dark_mode": False,
+                "currency": "GBP",
+                "notifications": True
+            }), 200
+
+        return jsonify(user), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
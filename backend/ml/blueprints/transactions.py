@@ -0,0 +1,62 @@
+import logging
+from flask import Blueprint, jsonify, request, Response, stream_with_context
+from bson import ObjectId
+from db import get_db
+from transaction_import import import_transactions, open_text
+from transaction_export import export_cursor, parse_date_range, stream_csv, stream_ndjson
+
+transactions_bp = Blueprint("transactions", __name__)
+logger = logging.getLogger(__name__)
+
+# 📥 Bulk Transaction Import (CSV or NDJSON, streamed in batches)
+@transactions_bp.route("/api/transactions/import", methods=["POST"])
+def import_transactions_file():
+    user_id = request.args.get("user_id")
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+
+    try:
+        user_obj = ObjectId(user_id)
+    except Exception:
+        return jsonify({"error": "Invalid User ID format"}), 400
+
+    # ✅ Accept a multipart upload ("file") or a raw request body
+    upload = request.files.get("file")
+    filename = upload.filename if upload else ""
+    fmt = request.args.get("format") or (
+        "ndjson" if filename.endswith((".ndjson", ".jsonl")) or "ndjson" in (request.content_type or "") else "csv"
+    )
+    if fmt not in ("csv", "ndjson"):
+        return jsonify({"error": "Format must be csv or ndjson"}), 400
+
+    try:
+        stream = open_text(upload.stream if upload else request.stream)
+        report = import_transactions(get_db(), stream, user_obj, fmt)
+        return jsonify(report), 200 if report["inserted"] else 400
+    except Exception as e:
+        logger.error("❌ Error importing transactions: %s", e)
+        return jsonify({"error": str(e)}), 500
+
+# 📤 Streaming Transaction Export (CSV or NDJSON, optional from/to dates)
+@transactions_bp.route("/api/transactions/export", methods=["GET"])
+def export_transactions():
+    user_id = request.args.get("user_id")
+    fmt = request.args.get("format", "csv")
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+    if fmt not in ("csv", "ndjson"):
+        return jsonify({"error": "Format must be csv or ndjson"}), 400
+
+    try:
+        user_obj = ObjectId(user_id)
+        date_filter = parse_date_range(request.args.get("from"), request.args.get("to"))
+    except Exception:
+        return jsonify({"error": "Invalid User ID or date format"}), 400
+
+    cursor = export_cursor(get_db()["transactions"], user_obj, date_filter)
+    stream = stream_csv(cursor) if fmt == "csv" else stream_ndjson(cursor)
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+
+    response = Response(stream_with_context(stream), mimetype=mimetype)
+    response.headers["Content-Disposition"] = f"attachment; filename=transactions.{fmt}"
+    return response
@@ -0,0 +1,101 @@
+import os
+import threading
+
+from pymongo import MongoClient
+
+from query_stats import command_counter
+
+# ⚙️ Connection settings (override with environment variables)
+MONGO_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017/")
+MONGO_DB_NAME = os.environ.get("MONGO_DB_NAME", "studentFinancesApp")
+MONGO_MAX_POOL_SIZE = int(os.environ.get("MONGO_MAX_POOL_SIZE", 50))
+MONGO_MIN_POOL_SIZE = int(os.environ.get("MONGO_MIN_POOL_SIZE", 0))
+MONGO_MAX_IDLE_MS = int(os.environ.get("MONGO_MAX_IDLE_MS", 60000))
+MONGO_TIMEOUT_MS = int(os.environ.get("MONGO_TIMEOUT_MS", 5000))
+
+_client = None
+_client_pid = None
+_async_client = None
+_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Return the process-wide MongoClient, creating it on first use.
+
+    MongoClient is thread-safe and keeps its own connection pool, so every request
+    in the process shares it. A forked worker gets a fresh client, since pools
+    must not be shared across processes.
+    """
+    global _client, _client_pid
+
+    if _client is not None and _client_pid == os.getpid():
+        return _client
+
+    with _lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = MongoClient(
+                MONGO_URI,
+                maxPoolSize=MONGO_MAX_POOL_SIZE,
+                minPoolSize=MONGO_MIN_POOL_SIZE,
+                maxIdleTimeMS=MONGO_MAX_IDLE_MS,
+                serverSelectionTimeoutMS=MONGO_TIMEOUT_MS,
+                connect=False,  # Connect lazily so importing never blocks on the server
+                event_listeners=[command_counter],
+            )
+            _client_pid = os.getpid()
+    return _client
+
+
+def set_client(client):
+    """Use an already built client in this process (benchmarks pass a mongomock client)."""
+    global _client, _client_pid
+
+    with _lock:
+        _client, _client_pid = client, os.getpid()
+
+
+def get_db():
+    """Return the application database on the shared client."""
+    return get_client()[MONGO_DB_NAME]
+
+
+def get_async_db():
+    """
+    Return the application database on a motor client for the ASGI service (async_app.py).
+
+    motor is only imported here, so the Flask services run without it installed.
+    The client binds to the running event loop on first use; call this from inside it.
+    """
+    global _async_client
+
+    if _async_client is None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        _async_client = AsyncIOMotorClient(
+            MONGO_URI,
+            maxPoolSize=MONGO_MAX_POOL_SIZE,
+            minPoolSize=MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=MONGO_MAX_IDLE_MS,
+            serverSelectionTimeoutMS=MONGO_TIMEOUT_MS,
+        )
+    return _async_client[MONGO_DB_NAME]
+
+
+def close_client():
+    """Close the shared client (used on shutdown and by benchmarks)."""
+    global _client, _client_pid
+
+    with _lock:
+        if _client is not None:
+            _client.close()
+        _client, _client_pid = None, None
+
+
+def close_async_client():
+    """Close the motor client (called when the ASGI service shuts down)."""
+    global _async_client
+
+    if _async_client is not None:
+        _async_client.close()
+    _async_client = None
@@ -0,0 +1,98 @@
+import numpy as np
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+
+class CompiledSpendingModel:
+    """
+    Pandas-free inference for the spending pipeline
+    (ColumnTransformer[StandardScaler + OneHotEncoder] -> RandomForestRegressor).
+
+    The scaler is reduced to its mean/scale constants, the encoder to a
+    {column: {category: output index}} lookup, and every tree of the forest is
+    flattened into shared NumPy arrays so a single row is scored by walking all
+    trees at once, one depth level per step.
+    """
+
+    def __init__(self, pipeline):
+        preprocessor = pipeline.named_steps["preprocessor"]
+        forest = pipeline.named_steps["model"]
+        if not isinstance(preprocessor, ColumnTransformer) or not isinstance(forest, RandomForestRegressor):
+            raise ValueError("Expected a ColumnTransformer + RandomForestRegressor pipeline")
+
+        self.numerical_cols, self.categorical_cols = [], []
+        self.category_index = {}
+        width = 0
+        for name, transformer, columns in preprocessor.transformers_:
+            if transformer == "drop" or name == "remainder":
+                continue
+            if isinstance(transformer, StandardScaler):
+                self.numerical_cols = list(columns)
+                self.mean = np.asarray(transformer.mean_, dtype=np.float64)
+                self.scale = np.asarray(transformer.scale_, dtype=np.float64)
+                self.numerical_offset = width
+                width += len(columns)
+            elif isinstance(transformer, OneHotEncoder):
+                self.categorical_cols = list(columns)
+                for column, categories in zip(columns, transformer.categories_):
+                    self.category_index[column] = {value: width + i for i, value in enumerate(categories)}
+                    width += len(categories)
+            else:
+                raise ValueError(f"Unsupported transformer: {transformer!r}")
+        self.n_features = width
+
+        self._flatten_forest(forest)
+
+    def _flatten_forest(self, forest):
+        left, right, feature, threshold, value, roots = [], [], [], [], [], []
+        offset, max_depth = 0, 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            nodes = np.arange(n)
+            is_leaf = tree.children_left == -1
+
+            # Leaves point at themselves so a fixed number of steps lands every tree on a leaf
+            left.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+            right.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            value.append(tree.value[:, 0, 0])
+            roots.append(offset)
+
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        self.left = np.concatenate(left)
+        self.right = np.concatenate(right)
+        self.feature = np.concatenate(feature)
+        self.threshold = np.concatenate(threshold)
+        self.value = np.concatenate(value)
+        self.roots = np.asarray(roots)
+        self.max_depth = max_depth
+
+    def transform(self, features):
+        """Turn a feature dict into the encoded row the forest expects."""
+        row = np.zeros(self.n_features, dtype=np.float64)
+
+        numeric = np.array([float(features[column]) for column in self.numerical_cols])
+        start = self.numerical_offset
+        row[start:start + len(numeric)] = (numeric - self.mean) / self.scale
+
+        for column in self.categorical_cols:
+            index = self.category_index[column].get(features[column])
+            if index is not None:  # Unknown categories are ignored, like handle_unknown="ignore"
+                row[index] = 1.0
+
+        # sklearn trees compare float32 inputs against their thresholds
+        return row.astype(np.float32)
+
+    def predict_one(self, features):
+        """Predict spending for a single feature dict."""
+        row = self.transform(features)
+        nodes = self.roots
+        for _ in range(self.max_depth):
+            go_left = row[self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return float(self.value[nodes].mean())
@@ -0,0 +1,213 @@
+import argparse
+import json
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from bson import ObjectId
+
+from insight_summary import month_key
+
+# 📂 Columnar feature store on local disk (Arrow IPC files, uncompressed so reads are
+# memory-mapped and columns are used in place rather than copied):
+#
+#   feature_store/
+#     state.json           <- snapshot watermark, monthly parts, profiles source
+#     monthly/<part>.arrow <- per-user monthly category aggregates, one file per snapshot
+#     profiles.arrow       <- student_spending.csv, re-imported when the CSV changes
+#
+# snapshot() only reads transactions inserted since the last one. Aggregates in different
+# parts add up, so readers sum them; compact() folds the parts into one. Edits and deletes
+# of already-snapshotted transactions are reconciled by rebuild(). Run one snapshotter at a time.
+base_dir = os.path.dirname(os.path.abspath(__file__))
+FEATURE_STORE_DIR = os.environ.get("FEATURE_STORE_DIR", os.path.join(base_dir, "feature_store"))
+PROFILES_CSV = os.path.join(base_dir, "student_spending.csv")
+
+# Transactions younger than this are left for the next snapshot, so inserts still in
+# flight (with slightly older ObjectIds) are not skipped past by the watermark
+SNAPSHOT_LAG = timedelta(seconds=int(os.environ.get("FEATURE_SNAPSHOT_LAG_SECONDS", 60)))
+SNAPSHOT_BATCH_SIZE = 5000
+
+MONTHLY_SCHEMA = pa.schema([
+    ("user", pa.string()),
+    ("year", pa.int16()),
+    ("month", pa.int8()),
+    ("category", pa.string()),
+    ("amount", pa.float64()),
+    ("count", pa.int32()),
+])
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w") as tmp_file:
+        tmp_file.write(data)
+    os.replace(tmp_path, path)
+
+
+def _write_table(path, table):
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def _read_table(path):
+    """Memory-map an Arrow file; the table's buffers point into the mapping."""
+    return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+
+def aggregate_transactions(transactions):
+    """Sum transactions into a monthly table: one row per user, month and category."""
+    totals = {}
+    for txn in transactions:
+        month = month_key(txn.get("date"))
+        if month is None:
+            continue
+        key = (str(txn["user"]), int(month[:4]), int(month[5:]), txn.get("category", "Other"))
+        row = totals.get(key)
+        if row is None:
+            row = totals[key] = [0.0, 0]
+        row[0] += txn.get("amount", 0)
+        row[1] += 1
+
+    keys = list(totals)
+    return pa.table({
+        "user": [key[0] for key in keys],
+        "year": [key[1] for key in keys],
+        "month": [key[2] for key in keys],
+        "category": [key[3] for key in keys],
+        "amount": [totals[key][0] for key in keys],
+        "count": [totals[key][1] for key in keys],
+    }, schema=MONTHLY_SCHEMA)
+
+
+class FeatureStore:
+    """Monthly spending aggregates and training profiles as memory-mapped Arrow tables."""
+
+    def __init__(self, root=FEATURE_STORE_DIR):
+        self.root = root
+
+    # 🗒 State
+
+    def state(self):
+        try:
+            with open(os.path.join(self.root, "state.json")) as state_file:
+                return json.load(state_file)
+        except FileNotFoundError:
+            return {"watermark": None, "parts": [], "profiles": None}
+
+    def _save_state(self, state):
+        os.makedirs(self.root, exist_ok=True)
+        _write_atomic(os.path.join(self.root, "state.json"), json.dumps(state, indent=2))
+
+    def _part_path(self, part):
+        return os.path.join(self.root, "monthly", part)
+
+    def _add_part(self, table):
+        os.makedirs(os.path.join(self.root, "monthly"), exist_ok=True)
+        part = datetime.utcnow().strftime("%Y%m%d%H%M%S") + f"-{uuid.uuid4().hex[:6]}.arrow"
+        _write_table(self._part_path(part), table)
+        return part
+
+    def _replace_parts(self, state, table):
+        """Swap every monthly part for one holding `table`, then delete the old files."""
+        old_parts = state["parts"]
+        state["parts"] = [self._add_part(table)] if table.num_rows else []
+        self._save_state(state)
+        for part in old_parts:
+            os.remove(self._part_path(part))  # Readers that still map it keep their pages
+
+    # 📸 Snapshotting
+
+    def _aggregate(self, db, watermark, lag):
+        """Aggregate transactions with watermark <= _id < now - lag; returns (table, new watermark)."""
+        upper = ObjectId.from_datetime(datetime.now(timezone.utc) - lag)
+        window = {"$lt": upper}
+        if watermark:
+            window["$gte"] = ObjectId(watermark)
+
+        cursor = db["transactions"].find(
+            {"_id": window}, {"user": 1, "date": 1, "amount": 1, "category": 1}
+        ).batch_size(SNAPSHOT_BATCH_SIZE)
+        return aggregate_transactions(cursor), str(upper)
+
+    def _result(self, state, table):
+        return {"rows": table.num_rows, "transactions": sum(table["count"].to_pylist()), "parts": len(state["parts"])}
+
+    def snapshot(self, db, lag=SNAPSHOT_LAG):
+        """Aggregate the transactions inserted since the last snapshot into a new part."""
+        state = self.state()
+        table, state["watermark"] = self._aggregate(db, state["watermark"], lag)
+        if table.num_rows:
+            state["parts"].append(self._add_part(table))
+        state["snapshot_at"] = datetime.utcnow().isoformat() + "Z"
+        self._save_state(state)
+        return self._result(state, table)
+
+    def rebuild(self, db, lag=SNAPSHOT_LAG):
+        """Re-aggregate every transaction into a single part (picks up edits and deletes)."""
+        state = self.state()
+        table, state["watermark"] = self._aggregate(db, None, lag)
+        state["snapshot_at"] = datetime.utcnow().isoformat() + "Z"
+        self._replace_parts(state, table)
+        return self._result(state, table)
+
+    def compact(self):
+        """Fold all monthly parts into one, summing rows with the same key."""
+        state = self.state()
+        if len(state["parts"]) > 1:
+            self._replace_parts(state, self.monthly_totals(by_category=True).cast(MONTHLY_SCHEMA))
+        return len(state["parts"])
+
+    # 📖 Reading
+
+    def monthly(self):
+        """All monthly parts as one table (the same key can appear in several parts)."""
+        tables = [_read_table(self._part_path(part)) for part in self.state()["parts"]]
+        return pa.concat_tables(tables) if tables else MONTHLY_SCHEMA.empty_table()
+
+    def monthly_totals(self, by_category=False):
+        """Spending per user and month (and category), summed across parts."""
+        keys = ["user", "year", "month"] + (["category"] if by_category else [])
+        totals = self.monthly().group_by(keys).aggregate([("amount", "sum"), ("count", "sum")])
+        return totals.select(keys + ["amount_sum", "count_sum"]).rename_columns(keys + ["amount", "count"])
+
+    def profiles(self, csv_path=PROFILES_CSV):
+        """The training CSV as an Arrow table, imported once and re-imported only when the file changes."""
+        stat = os.stat(csv_path)
+        source = {"path": os.path.abspath(csv_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        path = os.path.join(self.root, "profiles.arrow")
+
+        state = self.state()
+        if state.get("profiles") != source or not os.path.exists(path):
+            table = pa_csv.read_csv(csv_path)
+            table = table.drop_columns([name for name in table.column_names if not name])  # Unnamed index column
+            os.makedirs(self.root, exist_ok=True)
+            _write_table(path, table)
+            state["profiles"] = source
+            self._save_state(state)
+        return _read_table(path)
+
+
+# Shared per-process store
+store = FeatureStore()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the columnar feature store.")
+    parser.add_argument("command", choices=["snapshot", "rebuild", "compact", "info"])
+    args = parser.parse_args()
+
+    if args.command in ("snapshot", "rebuild"):
+        from db import get_db
+        result = getattr(store, args.command)(get_db())
+        print(f"✅ Added {result['rows']} rows from {result['transactions']} transactions ({result['parts']} parts)")
+    elif args.command == "compact":
+        print(f"✅ Compacted to {store.compact()} part(s)")
+    else:
+        state = store.state()
+        monthly = store.monthly()
+        print(json.dumps({**state, "rows": monthly.num_rows, "bytes": monthly.nbytes}, indent=2))
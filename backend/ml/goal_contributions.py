@@ -0,0 +1,88 @@
+import math
+
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+
+MAX_BATCH_SIZE = 1000
+
+
+def parse_contribution(item):
+    """Validate one {user_id, goal_id, amount} item; raises ValueError with a user-facing message."""
+    if not isinstance(item, dict):
+        raise ValueError("Contribution must be an object")
+    user_id, goal_id, amount = item.get("user_id"), item.get("goal_id"), item.get("amount")
+    if not user_id or not goal_id or not amount:
+        raise ValueError("Missing required fields")
+    try:
+        goal_obj, user_obj = ObjectId(goal_id), ObjectId(user_id)
+    except Exception:
+        raise ValueError("Invalid goal or user ID")
+    try:
+        amount = float(amount)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid contribution amount")
+    if not math.isfinite(amount) or amount <= 0:
+        raise ValueError("Invalid contribution amount")
+    return goal_obj, user_obj, amount
+
+
+def contribution_update(goal_obj, user_obj, amount):
+    """Filter and update for one atomic contribution (the user match keeps goals private)."""
+    return {"_id": goal_obj, "user": user_obj}, {"$inc": {"saved": amount}}
+
+
+def contribute(collection, goal_obj, user_obj, amount):
+    """Apply one contribution in a single round trip; returns the new `saved`, or None if no such goal."""
+    query, update = contribution_update(goal_obj, user_obj, amount)
+    goal = collection.find_one_and_update(
+        query, update, projection={"saved": 1}, return_document=ReturnDocument.AFTER
+    )
+    return goal["saved"] if goal else None
+
+
+def build_batch(items):
+    """
+    Turn a list of contribution items into bulk UpdateOne ops.
+    Returns (ops, targets, errors): targets are the (goal, user) pairs touched,
+    errors are {"index", "error"} for items that failed validation.
+    """
+    ops, targets, errors = [], {}, []
+    for index, item in enumerate(items):
+        try:
+            goal_obj, user_obj, amount = parse_contribution(item)
+        except ValueError as e:
+            errors.append({"index": index, "error": str(e)})
+            continue
+        ops.append(UpdateOne(*contribution_update(goal_obj, user_obj, amount)))
+        targets.setdefault(goal_obj, []).append((index, user_obj))
+    return ops, targets, errors
+
+
+def batch_result(goals, targets, errors, applied):
+    """Build the batch response from the goals read back after the bulk write."""
+    found = {goal["_id"]: goal for goal in goals}
+    totals, errors = {}, list(errors)
+    for goal_obj, uses in targets.items():
+        goal = found.get(goal_obj)
+        for index, user_obj in uses:
+            if goal is None or goal["user"] != user_obj:
+                errors.append({"index": index, "error": "Goal not found"})
+            else:
+                totals[str(goal_obj)] = goal.get("saved", 0)  # Only report goals the caller owns
+
+    return {
+        "applied": applied,
+        "goals": totals,
+        "errors": sorted(errors, key=lambda error: error["index"]),
+    }
+
+
+def contribute_many(collection, items):
+    """
+    Apply many contributions with one unordered bulk_write of $inc updates, then
+    read the touched goals back once for their new totals.
+    """
+    ops, targets, errors = build_batch(items)
+    applied = collection.bulk_write(ops, ordered=False).matched_count if ops else 0
+    goals = collection.find({"_id": {"$in": list(targets)}}, {"user": 1, "saved": 1}) if targets else []
+    return batch_result(goals, targets, errors, applied)
@@ -0,0 +1,40 @@
+import gc
+import multiprocessing
+import os
+
+# 🚀 Production server for the consolidated Flask app (server.py):
+#
+#   cd backend/ml
+#   gunicorn -c gunicorn.conf.py
+#
+# The app, and with it the model, is loaded once in the master and the workers are
+# forked from it, so the model's pages are shared copy-on-write instead of each
+# worker loading its own copy. The ASGI server runs the same way with
+#   APP_MODULE=async_app:app WORKER_CLASS=uvicorn.workers.UvicornWorker gunicorn -c gunicorn.conf.py
+
+wsgi_app = os.environ.get("APP_MODULE", "server:create_app()")
+bind = os.environ.get("BIND", "127.0.0.1:5001")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.environ.get("WORKER_CLASS", "gthread")
+threads = int(os.environ.get("THREADS", 4))
+timeout = int(os.environ.get("TIMEOUT", 60))
+preload_app = os.environ.get("PRELOAD_APP", "1") == "1"
+max_requests = int(os.environ.get("MAX_REQUESTS", 0))  # Recycle workers (0 = never)
+max_requests_jitter = max_requests // 10
+
+
+def when_ready(server):
+    """Runs in the master once, before any worker is forked."""
+    from db import close_client, get_db
+    from indexes import ensure_indexes_on_startup
+    from predictor import active_model
+
+    if preload_app:
+        server.log.info("Model version %s loaded in master", active_model().version)
+    ensure_indexes_on_startup(get_db())
+
+    # ✅ Pools must not cross a fork: each worker opens its own client on first use
+    close_client()
+
+    # ✅ Keep the cyclic GC from touching (and so copying) the preloaded objects
+    gc.freeze()
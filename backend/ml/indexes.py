@@ -0,0 +1,154 @@
+import argparse
+import logging
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+# 🗂 Every index the Python and Node query paths rely on
+INDEXES = {
+    "transactions": [
+        IndexModel([("user", ASCENDING), ("date", DESCENDING)], name="user_1_date_-1"),
+        IndexModel([("user", ASCENDING), ("category", ASCENDING)], name="user_1_category_1"),
+        IndexModel([("user", ASCENDING), ("amount", DESCENDING)], name="user_1_amount_-1"),
+        # Per-user write order: summary rebuilds, the Node "recent" refresh, the recent facet
+        IndexModel([("user", ASCENDING), ("_id", DESCENDING)], name="user_1__id_-1"),
+    ],
+    "budgets": [
+        IndexModel([("user", ASCENDING)], name="user_1"),
+    ],
+    "goals": [
+        IndexModel([("user", ASCENDING)], name="user_1"),
+        IndexModel([("_id", ASCENDING), ("user", ASCENDING)], name="_id_1_user_1"),
+    ],
+    "insight_summaries": [
+        IndexModel([("user", ASCENDING)], name="user_1", unique=True),
+    ],
+    "deletion_jobs": [
+        IndexModel([("status", ASCENDING), ("created_at", ASCENDING)], name="status_1_created_at_1"),
+        IndexModel([("user", ASCENDING), ("created_at", DESCENDING)], name="user_1_created_at_-1"),
+    ],
+}
+
+
+def ensure_indexes(db):
+    """Create any missing indexes. Safe to run repeatedly; returns the names per collection."""
+    created = {}
+    for collection, models in INDEXES.items():
+        created[collection] = db[collection].create_indexes(models)
+    return created
+
+
+def ensure_indexes_on_startup(db):
+    """Called when a service starts: never stop the app from booting if Mongo is unreachable."""
+    try:
+        ensure_indexes(db)
+    except PyMongoError as e:
+        logger.warning("⚠️ Could not ensure MongoDB indexes: %s", e)
+
+
+def verify_indexes(db):
+    """Return the (collection, index name) pairs that are missing."""
+    missing = []
+    for collection, models in INDEXES.items():
+        existing = set(db[collection].index_information())
+        for model in models:
+            name = model.document["name"]
+            if name not in existing:
+                missing.append((collection, name))
+    return missing
+
+
+def query_paths(user_id_obj=None):
+    """
+    The filters/sorts the services actually issue, as (label, collection, kind, spec).
+    kind is "find" (spec = (filter, sort)) or "aggregate" (spec = pipeline).
+    """
+    user = user_id_obj or ObjectId()
+    return [
+        ("transactions by user", "transactions", "find", ({"user": user}, None)),
+        ("transactions by user, newest first", "transactions", "find", ({"user": user}, [("date", -1)])),
+        ("transactions in date range", "transactions", "find",
+         ({"user": user, "date": {"$gte": datetime(2025, 1, 1), "$lt": datetime(2025, 2, 1)}}, [("date", 1)])),
+        ("transactions by category", "transactions", "find", ({"user": user, "category": "Food"}, None)),
+        ("largest transaction", "transactions", "find",
+         ({"user": user, "amount": {"$gt": 0}}, [("amount", -1), ("_id", 1)])),
+        ("transactions in write order", "transactions", "find", ({"user": user}, [("_id", 1)])),
+        ("latest transactions", "transactions", "find", ({"user": user}, [("_id", -1)])),
+        ("insights aggregation", "transactions", "aggregate", [{"$match": {"user": user}}]),
+        ("insights recent facet", "transactions", "aggregate",
+         [{"$match": {"user": user}}, {"$sort": {"_id": -1}}, {"$limit": 3}]),
+        ("budget by user", "budgets", "find", ({"user": user}, None)),
+        ("goals by user", "goals", "find", ({"user": user}, None)),
+        ("goal by id and user", "goals", "find", ({"_id": ObjectId(), "user": user}, None)),
+        ("insight summary by user", "insight_summaries", "find", ({"user": user}, None)),
+        ("pending deletion jobs", "deletion_jobs", "find", ({"status": "pending"}, [("created_at", 1)])),
+        ("deletion job by user", "deletion_jobs", "find", ({"user": user}, [("created_at", -1)])),
+    ]
+
+
+def _stages(plan, in_winning_plan=False, field="stage"):
+    """Yield every stage name (or another `field`, e.g. indexName) under the winning plan(s) of an explain() result."""
+    if isinstance(plan, dict):
+        if in_winning_plan and field in plan:
+            yield plan[field]
+        for key, value in plan.items():
+            if key != "rejectedPlans":
+                yield from _stages(value, in_winning_plan or key == "winningPlan", field)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _stages(item, in_winning_plan, field)
+
+
+def explain_query_paths(db, user_id_obj=None):
+    """
+    Run explain() on every query path; returns [(label, stages, full_scan)].
+
+    A full scan is a COLLSCAN, or a walk of the _id_ index by a query that doesn't
+    filter on _id: the planner can pick it for an _id sort, and it reads every
+    user's documents while showing up as an IXSCAN.
+    """
+    results = []
+    for label, collection, kind, spec in query_paths(user_id_obj):
+        if kind == "find":
+            query, sort = spec
+            cursor = db[collection].find(query)
+            if sort:
+                cursor = cursor.sort(sort)
+            plan = cursor.explain()
+        else:
+            query = spec[0]["$match"]
+            plan = db.command("aggregate", collection, pipeline=spec, explain=True)
+        stages = list(_stages(plan))
+        id_scan = "_id" not in query and "_id_" in _stages(plan, field="indexName")
+        results.append((label, stages, "COLLSCAN" in stages or id_scan))
+    return results
+
+
+if __name__ == "__main__":
+    from db import get_db
+
+    parser = argparse.ArgumentParser(description="Create, verify or explain the MongoDB indexes.")
+    parser.add_argument("command", choices=["create", "verify", "explain"])
+    args = parser.parse_args()
+
+    db = get_db()
+    if args.command == "create":
+        for collection, names in ensure_indexes(db).items():
+            print(f"✅ {collection}: {', '.join(names)}")
+    elif args.command == "verify":
+        missing = verify_indexes(db)
+        for collection, name in missing:
+            print(f"❌ Missing index {collection}.{name}")
+        if missing:
+            raise SystemExit(1)
+        print("✅ All indexes present")
+    else:
+        results = explain_query_paths(db)
+        for label, stages, full_scan in results:
+            print(f"{'❌' if full_scan else '✅'} {label}: {' <- '.join(dict.fromkeys(stages))}")
+        if any(full_scan for _, _, full_scan in results):
+            raise SystemExit(1)
@@ -0,0 +1,169 @@
+# 🧮 Pure insight calculations shared by the Flask (blueprints/) and ASGI (async_app.py)
+# services. Nothing in here touches MongoDB: callers fetch the data and pass it in.
+
+import logging
+
+from anomaly import anomaly_messages, scan
+
+logger = logging.getLogger(__name__)
+
+RECENT_WEIGHTS = [0.6, 0.3, 0.1]
+RECENT_SIZE = len(RECENT_WEIGHTS)
+
+
+def overspending_warnings(category_spending, budget):
+    """Flag categories that went over an even share of the budget."""
+    warnings = []
+    for category, amount in category_spending.items():
+        if budget and amount > (budget / len(category_spending)):
+            warnings.append(f"⚠️ You exceeded your budget in {category} by £{amount - (budget / len(category_spending)):.2f}")
+    return warnings
+
+
+def summarize_loop(transactions):
+    """Summarise raw transaction documents in Python (the original /api/insights loop)."""
+    # ✅ Compute Insights
+    category_spending = {}
+    total_spent = 0
+    largest_transaction = {"amount": 0, "date": "No Transactions Yet"}
+    spending_trends = []
+
+    for txn in transactions:
+        category = txn.get("category", "Other")
+        amount = txn.get("amount", 0)
+        total_spent += amount
+
+        # ✅ Fix Spending Trends (Ensure Day is Correct)
+        txn_date = txn.get("date", None)
+        if isinstance(txn_date, str):
+            try:
+                day = int(txn_date.split("-")[-1])  # Extract day from "YYYY-MM-DD"
+            except ValueError:
+                day = 1
+        elif isinstance(txn_date, dict) or isinstance(txn_date, list):
+            day = 1
+        else:
+            day = txn_date.day if txn_date else 1
+
+        spending_trends.append({"day": day, "amount": amount})
+
+        # ✅ Fix Spending Distribution (Correct Structure)
+        if category in category_spending:
+            category_spending[category] += amount
+        else:
+            category_spending[category] = amount
+
+        # ✅ Fix Largest Transaction
+        if amount > largest_transaction["amount"]:
+            largest_transaction = {"amount": amount, "date": txn.get("date", "Unknown")}
+
+    return {
+        "count": len(transactions),
+        "total_spent": total_spent,
+        "category_spending": category_spending,
+        "largest_transaction": largest_transaction,
+        "spending_trends": spending_trends,
+        "recent": [{"amount": txn.get("amount", 0)} for txn in transactions[-RECENT_SIZE:]],
+        "anomalies": scan(transactions)[1],
+    }
+
+
+def build_insights_response(summary, budget, recommendations, alerts=None):
+    """
+    Turn summary fields (count, total_spent, category_spending,
+    largest_transaction, spending_trends) into the /api/insights response.
+    `alerts` are precomputed overspending warnings; they are evaluated here if None.
+    Flagged transactions in the summary's optional `anomalies` (see anomaly.py) are
+    added to the recommendations after them.
+    """
+    category_spending = summary["category_spending"]
+
+    highest_spending_category = max(category_spending, key=category_spending.get, default="No Data")
+    lowest_spending_category = min(category_spending, key=category_spending.get, default="No Data")
+
+    daily_average_spending = round(summary["total_spent"] / max(1, summary["count"]), 2)
+
+    # ✅ Fix Spending Trends Sorting
+    spending_trends = sorted(summary["spending_trends"], key=lambda x: x["day"])
+
+    # ✅ Ensure at least dummy data exists
+    if not spending_trends:
+        spending_trends = [{"day": i, "amount": 50 + (i * 10)} for i in range(1, 6)]
+
+    # ✅ Fix Spending Distribution for Pie Chart
+    spending_distribution = [{"name": category, "value": amount} for category, amount in category_spending.items()]
+
+    # ✅ Overspending Warnings
+    if alerts is None:
+        alerts = overspending_warnings(category_spending, budget)
+    recommendations = list(recommendations) + list(alerts) + anomaly_messages(summary.get("anomalies"))
+
+    return {
+        "highestSpendingCategory": highest_spending_category,
+        "lowestSpendingCategory": lowest_spending_category,
+        "dailyAverageSpending": daily_average_spending,
+        "largestTransaction": summary["largest_transaction"],
+        "spendingTrends": spending_trends,  # ✅ Ensure Line Chart has data
+        "spendingDistribution": spending_distribution,  # ✅ Fix for Pie Chart
+        "recommendations": recommendations  # ✅ AI Insights
+    }
+
+
+def spending_insights(summary, budget):
+    """
+    Prediction, remaining budget and insights for /api/insights and /api/ml/insights.
+    `summary` is any of the summary shapes above (summarize_loop, the aggregation
+    pipeline or summary_to_insights); only its `count` and `recent` amounts are used.
+    """
+    past_spendings = [item["amount"] for item in summary.get("recent", [])]
+    return predict_from_recent(summary["count"], past_spendings, float(budget or 0))
+
+
+def predict_from_recent(transaction_count, past_spendings, budget):
+    """Weighted next-spend prediction from the most recent transaction amounts."""
+    # If no transactions, return a default response
+    if not transaction_count:
+        return {
+            "predicted_spending": 0.00,
+            "predicted_explanation": "No transaction history available to make a prediction.",
+            "budget": budget,  # ✅ Ensure budget is returned
+            "remaining_budget": budget,  # ✅ No spending yet
+            "insights": ["No transaction history available."],
+            "spendingDistribution": [],
+            "spendingTrends": []
+        }
+
+    # Ensure enough data for ML prediction
+    if len(past_spendings) >= 3:
+        predicted_spending = sum(
+            past_spendings[-3:][i] * RECENT_WEIGHTS[i] for i in range(3)
+        )
+    else:
+        predicted_spending = sum(past_spendings) / max(1, len(past_spendings))
+
+    # ✅ Ensure predicted spending is always a number
+    predicted_spending = round(float(predicted_spending), 2)
+
+    logger.debug("🚀 Calculated Predicted Spending: £%s", predicted_spending)
+
+    # ✅ Correctly Calculate Remaining Budget
+    remaining_budget = round(budget - predicted_spending, 2)
+
+    # ✅ Prevent Negative or NaN Values
+    if remaining_budget < 0 or remaining_budget != remaining_budget:  # Check if NaN
+        remaining_budget = 0.00
+
+    logger.debug("💰 Remaining Budget: £%s", remaining_budget)
+
+    return {
+        "predicted_spending": predicted_spending,
+        "predicted_explanation": (
+            f"Based on your last 3 transactions, we estimate your next expenses will be around £{predicted_spending}. "
+            "If your spending pattern continues, you may need to adjust your budget accordingly."
+        ),
+        "budget": budget,  # ✅ Always return budget
+        "remaining_budget": remaining_budget,  # ✅ Fixed remaining budget
+        "insights": ["Your spending insights will help optimize your budget."],  # ✅ Ensure insights exist
+        "spendingDistribution": [{"name": "Food", "value": 50}, {"name": "Entertainment", "value": 80}],  # Example Data
+        "spendingTrends": []
+    }
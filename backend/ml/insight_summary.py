@@ -0,0 +1,194 @@
+import argparse
+from collections import OrderedDict
+from datetime import datetime
+
+from bson import ObjectId
+
+from anomaly import ANOMALY_LIMIT, StreamingScorer
+from insight_engine import RECENT_SIZE, overspending_warnings
+
+# 🗂 One document per user. The Node transaction routes keep it up to date with
+# atomic $inc updates (backend/models/InsightSummary.js); this module builds it from
+# raw transactions on rebuilds, imports and the first read of a missing summary:
+#
+#   {
+#     "user": ObjectId,
+#     "count": int, "total": float,
+#     "categories": {"Food": 120.5, ...},
+#     "days": {"2025-03-04": 42.0, ...},
+#     "months": {"2025-03": 310.0, ...},
+#     "undated": float,  # missing or unparseable dates, reported on day 1 like the loop
+#     "largest": {"txn": ObjectId, "amount": float, "date": datetime},
+#     "recent": [{"txn": ObjectId, "amount": float}, ...],  # last 3 written
+#     "stats": {"Food": {"n": int, "sum": float, "sumsq": float}, ...},  # see anomaly.py
+#     "anomalies": [{"txn": ObjectId, "category": str, "amount": float, "date": datetime,
+#                    "usual": float, "score": float}, ...]  # last 5 flagged
+#   }
+SUMMARY_COLLECTION = "insight_summaries"
+NO_LARGEST = {"amount": 0, "date": "No Transactions Yet"}
+EMPTY_BUCKET = 1e-9
+
+
+def _as_datetime(value):
+    """Return the transaction date as a datetime, or None if it can't be parsed."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return None
+
+
+def day_key(value):
+    date = _as_datetime(value)
+    return date.strftime("%Y-%m-%d") if date else None
+
+
+def month_key(value):
+    date = _as_datetime(value)
+    return date.strftime("%Y-%m") if date else None
+
+
+def summarize_transactions(user_id_obj, transactions):
+    """Build a full summary document from raw transactions (used by rebuilds)."""
+    summary = {
+        "user": user_id_obj,
+        "count": 0,
+        "total": 0,
+        "categories": OrderedDict(),
+        "days": {},
+        "months": {},
+        "undated": 0,
+        "largest": None,
+        "recent": [],
+        "anomalies": [],
+    }
+    scorer = StreamingScorer()
+
+    for txn in transactions:
+        amount = txn.get("amount", 0)
+        summary["count"] += 1
+        summary["total"] += amount
+        category = txn.get("category", "Other")
+        summary["categories"][category] = summary["categories"].get(category, 0) + amount
+
+        day, month = day_key(txn.get("date")), month_key(txn.get("date"))
+        if day:
+            summary["days"][day] = summary["days"].get(day, 0) + amount
+            summary["months"][month] = summary["months"].get(month, 0) + amount
+        else:
+            summary["undated"] += amount
+
+        largest = summary["largest"]
+        if amount > (largest["amount"] if largest else 0):
+            summary["largest"] = {"txn": txn.get("_id"), "amount": amount, "date": txn.get("date", "Unknown")}
+
+        summary["recent"] = (summary["recent"] + [{"txn": txn.get("_id"), "amount": amount}])[-RECENT_SIZE:]
+
+        anomaly = scorer.observe(user_id_obj, txn)
+        if anomaly:
+            summary["anomalies"] = (summary["anomalies"] + [anomaly])[-ANOMALY_LIMIT:]
+
+    summary["stats"] = scorer.category_stats(user_id_obj)
+    summary["updatedAt"] = datetime.utcnow()
+    return summary
+
+
+def rebuild_summary(db, user_id_obj):
+    """Recompute one user's summary from the raw transactions collection."""
+    transactions = db["transactions"].find(
+        {"user": user_id_obj}, {"amount": 1, "category": 1, "date": 1}
+    ).sort("_id", 1)
+    summary = summarize_transactions(user_id_obj, transactions)
+    db[SUMMARY_COLLECTION].replace_one({"user": user_id_obj}, summary, upsert=True)
+    refresh_budget_alerts(db, user_id_obj, summary)
+    return summary
+
+
+def rebuild_all_summaries(db):
+    """Recompute every user's summary. Returns the number of users rebuilt."""
+    rebuilt = 0
+    for user_id_obj in db["transactions"].distinct("user"):
+        rebuild_summary(db, user_id_obj)
+        rebuilt += 1
+    return rebuilt
+
+
+def get_summary(db, user_id_obj):
+    """Fetch a user's summary, building it once from raw data if it doesn't exist yet."""
+    summary = db[SUMMARY_COLLECTION].find_one({"user": user_id_obj})
+    if summary is None:
+        summary = rebuild_summary(db, user_id_obj)
+    return summary
+
+
+def budget_alerts(summary, budget):
+    """Overspending alerts for a summary document against a budget amount."""
+    return overspending_warnings(live_buckets(summary, "categories"), budget)
+
+
+def refresh_budget_alerts(db, user_id_obj, summary=None, budget=None):
+    """
+    Re-evaluate the overspending alerts and store them on the budget document, so
+    /api/insights reads them instead of recomputing. Called whenever the summary or
+    the budget changes; does nothing for users without a budget.
+    """
+    if budget is None:
+        budget_data = db["budgets"].find_one({"user": user_id_obj}, {"budget": 1})
+        if budget_data is None:
+            return None
+        budget = budget_data.get("budget", 0)
+    if summary is None:
+        summary = db[SUMMARY_COLLECTION].find_one({"user": user_id_obj}, {"categories": 1}) or {}
+
+    alerts = budget_alerts(summary, budget)
+    db["budgets"].update_one({"user": user_id_obj}, {"$set": {"alerts": alerts}})
+    return alerts
+
+
+def live_buckets(summary, field):
+    """Return a bucket map without the ~0 entries that edits/deletes leave behind."""
+    return OrderedDict(
+        (key, amount) for key, amount in summary.get(field, {}).items()
+        if abs(amount) >= EMPTY_BUCKET
+    )
+
+
+def summary_to_insights(summary):
+    """Convert a summary document into the fields /api/insights reports."""
+    day_totals = {}
+    for key, amount in live_buckets(summary, "days").items():
+        day = int(key[-2:])
+        day_totals[day] = day_totals.get(day, 0) + amount
+    if abs(summary.get("undated", 0)) >= EMPTY_BUCKET:
+        day_totals[1] = day_totals.get(1, 0) + summary["undated"]
+    categories = live_buckets(summary, "categories")
+
+    largest = summary.get("largest")
+    return {
+        "count": summary.get("count", 0),
+        "total_spent": summary.get("total", 0),
+        "category_spending": categories,
+        "largest_transaction": {"amount": largest["amount"], "date": largest["date"]} if largest else dict(NO_LARGEST),
+        "spending_trends": [{"day": day, "amount": amount} for day, amount in sorted(day_totals.items())],
+        "recent": [{"amount": item.get("amount", 0)} for item in summary.get("recent", [])],
+        "anomalies": [{key: value for key, value in item.items() if key != "txn"} for item in summary.get("anomalies", [])],
+    }
+
+
+if __name__ == "__main__":
+    from db import get_db
+
+    parser = argparse.ArgumentParser(description="Rebuild materialized insight summaries from raw transactions.")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--user", help="Only rebuild this user ID")
+    args = parser.parse_args()
+
+    db = get_db()
+    if args.user:
+        rebuild_summary(db, ObjectId(args.user))
+        print(f"✅ Rebuilt insight summary for user {args.user}")
+    else:
+        print(f"✅ Rebuilt insight summaries for {rebuild_all_summaries(db)} users")
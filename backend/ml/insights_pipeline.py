@@ -0,0 +1,149 @@
+from collections import OrderedDict
+
+from insight_engine import RECENT_SIZE
+
+# 📅 Day-of-month expression that mirrors the Python loop in insight_engine.py:
+# real dates use $dayOfMonth, "YYYY-MM-DD" strings use their last segment,
+# anything else (missing, objects, arrays, bad strings) falls back to day 1.
+DAY_EXPR = {
+    "$switch": {
+        "branches": [
+            {
+                "case": {"$eq": [{"$type": "$date"}, "date"]},
+                "then": {"$dayOfMonth": "$date"},
+            },
+            {
+                "case": {"$eq": [{"$type": "$date"}, "string"]},
+                "then": {
+                    "$convert": {
+                        "input": {"$arrayElemAt": [{"$split": ["$date", "-"]}, -1]},
+                        "to": "int",
+                        "onError": 1,
+                        "onNull": 1,
+                    }
+                },
+            },
+        ],
+        "default": 1,
+    }
+}
+
+AMOUNT_EXPR = {"$ifNull": ["$amount", 0]}
+
+# 📅 Trend bucket labels per granularity (ISO strings, so they sort chronologically)
+PERIOD_FORMATS = {
+    "day": "%Y-%m-%d",
+    "week": "%G-W%V",
+    "month": "%Y-%m",
+}
+
+
+def parse_limit(value):
+    """Parse a ?limit= trend page size: None if absent, else a positive int (ValueError otherwise)."""
+    if not value:
+        return None
+    limit = int(value)
+    if limit < 1:
+        raise ValueError(f"Limit must be positive: {limit}")
+    return limit
+
+
+def _trends_stages(granularity=None, cursor=None, limit=None):
+    """
+    Trend buckets: day-of-month by default, or real calendar periods when a
+    granularity is given. Periods after `cursor` are returned, `limit` + 1 of them
+    so the caller can tell whether another page exists.
+    """
+    if not granularity:
+        return [
+            {"$group": {"_id": DAY_EXPR, "amount": {"$sum": AMOUNT_EXPR}}},
+            {"$sort": {"_id": 1}},
+        ]
+
+    stages = [
+        # Only real dates have a calendar period: $dateToString fails on legacy "YYYY-MM-DD"
+        # strings and buckets missing dates as null. A from/to range skips the same documents.
+        {"$match": {"date": {"$type": "date"}}},
+        {"$group": {
+            "_id": {"$dateToString": {"format": PERIOD_FORMATS[granularity], "date": "$date"}},
+            "amount": {"$sum": AMOUNT_EXPR},
+        }},
+    ]
+    if cursor:
+        stages.append({"$match": {"_id": {"$gt": cursor}}})
+    stages.append({"$sort": {"_id": 1}})
+    if limit:
+        stages.append({"$limit": limit + 1})
+    return stages
+
+
+def build_insights_pipeline(user_id_obj, date_filter=None, granularity=None, cursor=None, limit=None):
+    """Build the $facet pipeline that summarises a user's transactions server-side."""
+    match = {"user": user_id_obj}
+    if date_filter:
+        match["date"] = date_filter  # Served by the {user: 1, date: -1} index
+
+    return [
+        {"$match": match},
+        {"$facet": {
+            "totals": [
+                {"$group": {"_id": None, "count": {"$sum": 1}, "total": {"$sum": AMOUNT_EXPR}}},
+            ],
+            "categories": [
+                {"$group": {
+                    "_id": {"$ifNull": ["$category", "Other"]},
+                    "amount": {"$sum": AMOUNT_EXPR},
+                    "first": {"$min": "$_id"},  # Keeps first-seen order like the dict in the loop
+                }},
+                {"$sort": {"first": 1}},
+            ],
+            "largest": [
+                {"$match": {"amount": {"$gt": 0}}},
+                {"$sort": {"amount": -1, "_id": 1}},
+                {"$limit": 1},
+                {"$project": {"_id": 0, "amount": 1, "date": {"$ifNull": ["$date", "Unknown"]}}},
+            ],
+            "trends": _trends_stages(granularity, cursor, limit),
+            # Latest amounts for the prediction: by date inside a window, else last written like the summary
+            "recent": [
+                {"$sort": {"date": -1, "_id": -1} if date_filter else {"_id": -1}},
+                {"$limit": RECENT_SIZE},
+                {"$project": {"_id": 0, "amount": AMOUNT_EXPR}},
+            ],
+        }},
+    ]
+
+
+def run_insights_aggregation(collection, user_id_obj, date_filter=None, granularity=None, cursor=None, limit=None):
+    """Run the insights pipeline and return the same summary the Python loop computes."""
+    pipeline = build_insights_pipeline(user_id_obj, date_filter, granularity, cursor, limit)
+    return parse_insights_result(next(collection.aggregate(pipeline), {}), limit)
+
+
+def parse_insights_result(result, limit=None):
+    """Turn the $facet document into the summary dict (shared with the motor client in async_app.py)."""
+    totals = result.get("totals") or [{"count": 0, "total": 0}]
+    largest = result.get("largest") or [{"amount": 0, "date": "No Transactions Yet"}]
+
+    category_spending = OrderedDict(
+        (row["_id"], row["amount"]) for row in result.get("categories", [])
+    )
+    spending_trends = [
+        {"day": row["_id"], "amount": row["amount"]} for row in result.get("trends", [])
+    ]
+
+    # ✅ One extra row was fetched to detect a next page
+    next_cursor = None
+    if limit and len(spending_trends) > limit:
+        spending_trends = spending_trends[:limit]
+        next_cursor = spending_trends[-1]["day"]
+
+    return {
+        "count": totals[0]["count"],
+        "total_spent": totals[0]["total"],
+        "category_spending": category_spending,
+        "largest_transaction": largest[0],
+        "spending_trends": spending_trends,
+        "recent": result.get("recent", [])[::-1],  # Oldest first
+        "next_cursor": next_cursor,
+    }
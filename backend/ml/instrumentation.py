@@ -0,0 +1,171 @@
+import contextvars
+import logging
+import os
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from query_stats import current_stats
+
+# 📈 Per-route and per-phase latency histograms, served in Prometheus text format on /metrics.
+# Phases: "mongo" (driver round trips, from query_stats), "dataframe", "predict", "summary",
+# "serialize" (JSON encoding), plus anything wrapped in phase(). Histograms are per process;
+# under gunicorn each worker reports its own.
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 🔬 Optional profiling: a random fraction of requests, or ?profile=1 when PROFILE_ON_DEMAND=1
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", 0))
+PROFILE_ON_DEMAND = os.environ.get("PROFILE_ON_DEMAND", "0") == "1"
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "/tmp/ml-profiles")
+
+logger = logging.getLogger(__name__)
+
+_route = contextvars.ContextVar("metrics_route", default=None)
+
+
+class Histogram:
+    def __init__(self, name, help_text, label_names, buckets=BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, seconds, *labels):
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += seconds
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        for labels, series in sorted(snapshot.items()):
+            base = ",".join(f'{name}="{value}"' for name, value in zip(self.label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {series[-1]}')
+            lines.append(f"{self.name}_sum{{{base}}} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{{{base}}} {series[-1]}")
+        return "\n".join(lines)
+
+
+request_seconds = Histogram(
+    "http_request_duration_seconds", "Request latency by route.", ("route", "method", "status")
+)
+phase_seconds = Histogram(
+    "request_phase_duration_seconds", "Time spent in each phase of a request.", ("route", "phase")
+)
+
+
+@contextmanager
+def phase(name):
+    """Time a block as one phase of the current request (a no-op outside one, e.g. in CLIs)."""
+    route = _route.get()
+    if route is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phase_seconds.observe(time.perf_counter() - start, route, name)
+
+
+def render_metrics():
+    return "\n".join([request_seconds.render(), phase_seconds.render()]) + "\n"
+
+
+def configure_logging():
+    """Leveled logging for the services: LOG_LEVEL=DEBUG brings back the old debug prints."""
+    logging.basicConfig(
+        level=os.environ.get("LOG_LEVEL", "INFO").upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+
+def _start_profiler():
+    try:
+        from pyinstrument import Profiler  # Sampling profiler, if installed
+    except ImportError:
+        import cProfile  # Otherwise fall back to the deterministic stdlib profiler
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+    profiler = Profiler()
+    profiler.start()
+    return profiler
+
+
+def _save_profile(profiler, route):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stem = os.path.join(PROFILE_DIR, f"{route.strip('/').replace('/', '_') or 'root'}-{time.time():.0f}-{os.getpid()}")
+    if hasattr(profiler, "output_html"):
+        profiler.stop()
+        path = stem + ".html"
+        with open(path, "w") as out:
+            out.write(profiler.output_html())
+    else:
+        profiler.disable()
+        path = stem + ".prof"
+        profiler.dump_stats(path)
+    logger.info("🔬 Saved profile %s", path)
+
+
+def init_app(app):
+    """Time every request, expose /metrics and time JSON serialization."""
+    from flask import Response, g, request
+    from flask.json.provider import DefaultJSONProvider
+
+    class TimedJSONProvider(DefaultJSONProvider):
+        def dumps(self, obj, **kwargs):
+            with phase("serialize"):
+                return super().dumps(obj, **kwargs)
+
+    app.json = TimedJSONProvider(app)
+
+    @app.route("/metrics")
+    def metrics():
+        return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
+
+    @app.before_request
+    def start_timer():
+        g.metrics_route = request.url_rule.rule if request.url_rule else "unmatched"
+        g.metrics_token = _route.set(g.metrics_route)
+        g.metrics_start = time.perf_counter()
+
+        wanted = PROFILE_ON_DEMAND and request.args.get("profile") == "1"
+        if wanted or (PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE):
+            g.profiler = _start_profiler()
+
+    @app.after_request
+    def record_timing(response):
+        start = g.get("metrics_start")
+        if start is not None:
+            route = g.metrics_route
+            request_seconds.observe(time.perf_counter() - start, route, request.method, str(response.status_code))
+            stats = current_stats()
+            if stats is not None and stats.total:
+                phase_seconds.observe(stats.seconds, route, "mongo")
+        profiler = g.pop("profiler", None)
+        if profiler is not None:
+            _save_profile(profiler, g.metrics_route)
+        return response
+
+    @app.teardown_request
+    def reset_route(exc=None):
+        token = g.pop("metrics_token", None)
+        if token is not None:
+            _route.reset(token)
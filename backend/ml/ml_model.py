@@ -1,32 +1,11 @@
+import logging
 import pandas as pd
 import numpy as np
 from sklearn.linear_model import LinearRegression
-from pymongo import MongoClient
-from bson import ObjectId  # ✅ Needed for handling MongoDB ObjectId
+from db import get_db
+from insight_summary import live_buckets
 
-def fetch_transactions(user_id):
-    """Fetch user transactions from MongoDB."""
-    client = MongoClient('mongodb://localhost:27017/')
-    db = client['studentFinancesApp']
-    transactions = db['transactions']
-    
-    # Convert user_id to ObjectId if needed
-    try:
-        user_id = ObjectId(user_id)
-    except:
-        pass  
-
-    data = list(transactions.find({'user': user_id}, {'_id': 0, 'date': 1, 'amount': 1, 'category': 1}))
-
-    print(f"🔹 Fetched Transactions for user {user_id}: {data}")  # Debugging
-
-    df = pd.DataFrame(data)
-
-    if 'date' in df.columns:
-        df['date'] = pd.to_datetime(df['date'])
-        df.sort_values(by='date', inplace=True)
-
-    return df
+logger = logging.getLogger(__name__)
 
 def predict_next_month_spending(df):
     """Predict next month's spending using Linear Regression."""
@@ -57,40 +36,77 @@ def predict_next_month_spending(df):
     next_time_index = X['time_index'].max() + 1  # ✅ Predict for next month
     next_month = pd.DataFrame({"time_index": [next_time_index]})  # ✅ Ensure correct format
 
-    print("🔹 Next Month Input:", next_month)  # ✅ Debugging
+    logger.debug("🔹 Next Month Input: %s", next_month)
 
     prediction = model.predict(next_month)[0]
 
     # ✅ If prediction is unexpectedly low, use a simple average
     if prediction < y.mean():
-        print("⚠️ Using moving average instead of regression")
+        logger.debug("⚠️ Using moving average instead of regression")
         prediction = y.mean()
 
     return max(int(prediction), 0)  # ✅ Ensure spending is never negative
 
 
-def get_budget_insights(df):
-    """Generate insights based on spending categories."""
-    if df.empty:
-        return {"insights": [], "message": "No transactions found."}
-    
-    category_spending = df.groupby('category')['amount'].sum().reset_index()
-    category_spending.sort_values(by='amount', ascending=False, inplace=True)
-    
-    insights = []
-    for _, row in category_spending.iterrows():
-        insights.append(f"You spent £{int(row['amount'])} on {row['category']} this month.")  # ✅ Convert to int
-
-    return {"insights": insights, "message": "Generated spending insights."}
-
-def analyze_spending(user_id):
-    """Main function to get spending predictions and insights."""
-    df = fetch_transactions(user_id)
-    prediction = predict_next_month_spending(df)
-    insights = get_budget_insights(df)
-    
-    return {
-        "prediction": prediction,  # ✅ Now returns a single integer
-        "insights": insights["insights"],  # ✅ Fix nested structure
-        "message": insights["message"]
-    }
+def predict_next_month_spending_batch(monthly):
+    """
+    Forecast next month's spending for many users at once.
+
+    `monthly` has one row per transaction or per month with columns
+    user, year, month, amount. Every user's least-squares line is solved in
+    closed form with NumPy instead of fitting a LinearRegression per user, with
+    the same fallbacks as predict_next_month_spending. Returns a Series of ints
+    indexed by user.
+    """
+    if monthly.empty:
+        return pd.Series(dtype=int)
+
+    # ✅ Aggregate spending by user, year and month
+    monthly = monthly.groupby(['user', 'year', 'month'], sort=True)['amount'].sum().reset_index()
+    codes, users = pd.factorize(monthly['user'], sort=True)
+    k = len(users)
+
+    # ✅ Same per-user time index as the single-user path
+    first_year = monthly.groupby('user')['year'].transform('min')
+    x = ((monthly['year'] - first_year) * 12 + monthly['month']).to_numpy(dtype=float)
+    y = monthly['amount'].to_numpy(dtype=float)
+
+    n = np.bincount(codes, minlength=k)
+    x_mean = np.bincount(codes, x, k) / n
+    y_mean = np.bincount(codes, y, k) / n
+    dx, dy = x - x_mean[codes], y - y_mean[codes]
+    sxx = np.bincount(codes, dx * dx, k)
+    sxy = np.bincount(codes, dx * dy, k)
+
+    x_max = np.full(k, -np.inf)
+    np.maximum.at(x_max, codes, x)
+
+    slope = np.divide(sxy, sxx, out=np.zeros(k), where=sxx > 0)
+    prediction = y_mean + slope * (x_max + 1 - x_mean)
+
+    # ✅ Fall back to the mean when the trend dips below it, and never go negative
+    prediction = np.where(prediction < y_mean, y_mean, prediction)
+    prediction = np.maximum(np.trunc(prediction), 0)
+
+    # ✅ Users with a single month just get their mean
+    prediction = np.where(n < 2, np.trunc(y_mean), prediction)
+
+    return pd.Series(prediction.astype(int), index=users)
+
+def forecast_all_users(store=None):
+    """
+    Forecast next month's spending for every user from their materialized monthly totals.
+    With a FeatureStore (feature_store.py), the totals come from its snapshots instead of MongoDB.
+    """
+    if store is not None:
+        forecasts = predict_next_month_spending_batch(store.monthly_totals().to_pandas())
+        return {str(user): int(prediction) for user, prediction in forecasts.items()}
+
+    rows = []
+    for summary in get_db()['insight_summaries'].find({}, {'user': 1, 'months': 1}):
+        for month, amount in live_buckets(summary, "months").items():
+            year, month = month.split("-")
+            rows.append({"user": summary["user"], "year": int(year), "month": int(month), "amount": amount})
+
+    forecasts = predict_next_month_spending_batch(pd.DataFrame(rows, columns=["user", "year", "month", "amount"]))
+    return {str(user): int(prediction) for user, prediction in forecasts.items()}
@@ -0,0 +1,195 @@
+import argparse
+import json
+import logging
+import os
+import pickle
+import threading
+import uuid
+from datetime import datetime
+
+import joblib
+
+from fast_model import CompiledSpendingModel
+
+logger = logging.getLogger(__name__)
+
+# 📂 Registry layout:
+#
+#   registry/
+#     CURRENT                  <- active version name (swapped atomically)
+#     <version>/model.joblib   <- fitted sklearn pipeline
+#     <version>/metadata.json  <- trained_at, metrics, feature_schema, ...
+base_dir = os.path.dirname(os.path.abspath(__file__))
+REGISTRY_DIR = os.environ.get("MODEL_REGISTRY_DIR", os.path.join(base_dir, "registry"))
+LEGACY_MODEL_PATH = os.path.join(base_dir, "spending_model.pkl")
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w") as tmp_file:
+        tmp_file.write(data)
+    os.replace(tmp_path, path)
+
+
+def feature_schema(pipeline):
+    """Describe the inputs a fitted spending pipeline expects."""
+    preprocessor = pipeline.named_steps["preprocessor"]
+    schema = {"numerical": [], "categorical": {}}
+    for name, transformer, columns in preprocessor.transformers_:
+        if name == "num":
+            schema["numerical"] = list(columns)
+        elif name == "cat":
+            schema["categorical"] = {
+                column: [str(value) for value in categories]
+                for column, categories in zip(columns, transformer.categories_)
+            }
+    return schema
+
+
+class LoadedModel:
+    """A model version held in memory, with its compiled fast path if available."""
+
+    def __init__(self, version, pipeline, metadata):
+        self.version = version
+        self.pipeline = pipeline
+        self.metadata = metadata
+        self.compiled = None
+        if os.environ.get("FAST_INFERENCE", "1") == "1":
+            try:
+                self.compiled = CompiledSpendingModel(pipeline)
+            except ValueError as e:
+                logger.warning("⚠️ Fast inference disabled: %s", e)
+
+
+class ModelRegistry:
+    """
+    Versioned model artifacts on local disk.
+
+    Nothing is loaded until get() is first called. After that, get() only stats
+    the CURRENT pointer, so activating another version hot-swaps the model in a
+    running process without a restart.
+    """
+
+    def __init__(self, root=REGISTRY_DIR, mmap=None):
+        self.root = root
+        self.mmap = os.environ.get("MODEL_MMAP", "0") == "1" if mmap is None else mmap
+        self._loaded = None
+        self._pointer_stat = None
+        self._lock = threading.Lock()
+
+    # 📝 Publishing
+
+    def publish(self, pipeline, metrics=None, activate=True, **extra):
+        """Save a fitted pipeline as a new version and (by default) make it current."""
+        version = datetime.utcnow().strftime("v%Y%m%d%H%M%S") + "-" + uuid.uuid4().hex[:6]
+        version_dir = os.path.join(self.root, version)
+        os.makedirs(version_dir)
+
+        # Uncompressed so the tree arrays can be memory-mapped on load
+        joblib.dump(pipeline, os.path.join(version_dir, "model.joblib"), compress=0)
+        metadata = {
+            "version": version,
+            "trained_at": datetime.utcnow().isoformat() + "Z",
+            "metrics": metrics or {},
+            "feature_schema": feature_schema(pipeline),
+            **extra,
+        }
+        _write_atomic(os.path.join(version_dir, "metadata.json"), json.dumps(metadata, indent=2))
+
+        if activate:
+            self.activate(version)
+        return version
+
+    def activate(self, version):
+        """Point CURRENT at an existing version (an atomic rename)."""
+        if not os.path.exists(os.path.join(self.root, version, "model.joblib")):
+            raise ValueError(f"Unknown model version: {version}")
+        _write_atomic(os.path.join(self.root, "CURRENT"), version)
+
+    # 🔍 Inspecting
+
+    def current_version(self):
+        try:
+            with open(os.path.join(self.root, "CURRENT")) as pointer:
+                return pointer.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def list_versions(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.exists(os.path.join(self.root, name, "metadata.json"))
+        )
+
+    def metadata(self, version):
+        with open(os.path.join(self.root, version, "metadata.json")) as metadata_file:
+            return json.load(metadata_file)
+
+    # 🚀 Loading
+
+    def load(self, version):
+        """Load a specific version from disk (not cached)."""
+        path = os.path.join(self.root, version, "model.joblib")
+        pipeline = joblib.load(path, mmap_mode="r" if self.mmap else None)
+        return LoadedModel(version, pipeline, self.metadata(version))
+
+    def _pointer_state(self):
+        try:
+            stat = os.stat(os.path.join(self.root, "CURRENT"))
+            return (stat.st_ino, stat.st_mtime_ns)
+        except FileNotFoundError:
+            stat = os.stat(LEGACY_MODEL_PATH)
+            return ("legacy", stat.st_mtime_ns)
+
+    def _load_current(self):
+        version = self.current_version()
+        if version:
+            return self.load(version)
+
+        # 🗃 No registry yet: fall back to the pickle shipped with the repo
+        with open(LEGACY_MODEL_PATH, "rb") as model_file:
+            pipeline = pickle.load(model_file)
+        stat = os.stat(LEGACY_MODEL_PATH)
+        return LoadedModel(f"legacy-{stat.st_mtime_ns}", pipeline, {"version": "legacy", "metrics": {}})
+
+    def get(self):
+        """Return the active LoadedModel, loading or hot-swapping it if needed."""
+        state = self._pointer_state()
+        if self._loaded is not None and state == self._pointer_stat:
+            return self._loaded
+
+        with self._lock:
+            state = self._pointer_state()
+            if self._loaded is None or state != self._pointer_stat:
+                self._loaded = self._load_current()
+                self._pointer_stat = state
+        return self._loaded
+
+
+# Shared per-process registry
+registry = ModelRegistry()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage spending model versions.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="List versions (* marks the active one)")
+    activate_parser = subparsers.add_parser("activate", help="Make a version current")
+    activate_parser.add_argument("version")
+    subparsers.add_parser("import-legacy", help="Publish spending_model.pkl as a registry version")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        current = registry.current_version()
+        for version in registry.list_versions():
+            metrics = registry.metadata(version).get("metrics", {})
+            print(f"{'*' if version == current else ' '} {version}  {json.dumps(metrics)}")
+    elif args.command == "activate":
+        registry.activate(args.version)
+        print(f"✅ Activated model {args.version}")
+    elif args.command == "import-legacy":
+        with open(LEGACY_MODEL_PATH, "rb") as model_file:
+            version = registry.publish(pickle.load(model_file), source="spending_model.pkl")
+        print(f"✅ Imported spending_model.pkl as {version}")
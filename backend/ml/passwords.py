@@ -0,0 +1,34 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+# 🔐 bcrypt work factor for new hashes (the Node signup/login routes read the same variable)
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", 12))
+
+# ⚙️ At most this many hashes run at once; bcrypt releases the GIL, so these use real cores
+PASSWORD_WORKERS = int(os.environ.get("PASSWORD_WORKERS", os.cpu_count() or 2))
+
+executor = ThreadPoolExecutor(max_workers=PASSWORD_WORKERS, thread_name_prefix="bcrypt")
+
+
+def _check_and_hash(current_password, stored_hash, new_password, rounds):
+    if not bcrypt.checkpw(current_password, stored_hash):
+        return None
+    return bcrypt.hashpw(new_password, bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def submit_change(current_password, stored_hash, new_password, rounds=None):
+    """
+    Queue "verify the current password, then hash the new one" as one job on the pool.
+
+    Returns a Future that resolves to the new hash, or None if the current password
+    is wrong. Arguments are bytes, like bcrypt's own API.
+    """
+    return executor.submit(_check_and_hash, current_password, stored_hash, new_password, rounds or BCRYPT_ROUNDS)
+
+
+def change_password_hash(current_password, stored_hash, new_password, rounds=None):
+    """Blocking form of submit_change for the Flask request threads."""
+    return submit_change(current_password, stored_hash, new_password, rounds).result()
+
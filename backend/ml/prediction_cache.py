@@ -0,0 +1,79 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+def feature_key(features, model_version):
+    """Stable hash of a feature dict plus the model version that scored it."""
+    payload = json.dumps(features, sort_keys=True, default=str)
+    return hashlib.sha1(f"{model_version}|{payload}".encode("utf-8")).hexdigest()
+
+
+class PredictionCache:
+    """
+    Bounded, thread-safe prediction memo with LRU eviction and a TTL.
+
+    Entries are keyed on the feature vector and the model version, so a new model
+    never serves stale predictions even before clear() is called.
+    """
+
+    def __init__(self, maxsize=10000, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.model_version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, features, model_version):
+        """Return the cached prediction, or None on a miss or expired entry."""
+        key = feature_key(features, model_version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, features, model_version, prediction):
+        key = feature_key(features, model_version)
+        with self._lock:
+            self._entries[key] = (prediction, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def retain_version(self, model_version):
+        """Drop every entry if the active model version changed since the last call."""
+        if model_version == self.model_version:
+            return
+        with self._lock:
+            if model_version != self.model_version:
+                self._entries.clear()
+                self.model_version = model_version
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
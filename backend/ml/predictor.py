@@ -0,0 +1,140 @@
+import os
+
+import pandas as pd
+from bson import ObjectId
+
+from instrumentation import phase
+from model_registry import registry
+from prediction_cache import PredictionCache
+
+# 🔮 Spending prediction shared by the Flask (blueprints/ml.py) and ASGI (async_app.py) services.
+# The model is loaded lazily from the registry (see model_registry.py) on first use.
+
+# 🧠 Memoized predictions, keyed on the feature vector + model version
+prediction_cache = PredictionCache(
+    maxsize=int(os.environ.get("PREDICTION_CACHE_SIZE", 10000)),
+    ttl=int(os.environ.get("PREDICTION_CACHE_TTL", 3600)),
+)
+
+# 📦 Users per $in query / predict call when scoring in batches
+BATCH_CHUNK_SIZE = int(os.environ.get("BATCH_CHUNK_SIZE", 5000))
+
+FEATURE_DEFAULTS = {
+    "age": 21,
+    "monthly_income": 1000,
+    "financial_aid": 0,
+    "tuition": 500,
+    "gender": "Male",
+    "year_in_school": "Sophomore",
+    "major": "Computer Science",
+    "preferred_payment_method": "Credit Card",
+}
+
+def build_features(user):
+    """ Build the model input row for a user document, filling in defaults. """
+    return {feature: user.get(feature, default) for feature, default in FEATURE_DEFAULTS.items()}
+
+def active_model():
+    """ Current registry model; cached predictions from a replaced version are dropped. """
+    model = registry.get()
+    prediction_cache.retain_version(model.version)
+    return model
+
+def predict_features(features):
+    """ Predict spending for one feature dict, using the prediction cache. """
+    model = active_model()
+
+    cached = prediction_cache.get(features, model.version)
+    if cached is not None:
+        return cached
+
+    if model.compiled is not None:
+        with phase("predict"):
+            prediction = model.compiled.predict_one(features)
+    else:
+        with phase("dataframe"):
+            frame = pd.DataFrame([features])
+        with phase("predict"):
+            prediction = model.pipeline.predict(frame)[0]
+    prediction = float(prediction)
+
+    prediction_cache.put(features, model.version, prediction)
+    return prediction
+
+def generate_feedback(predicted_spending, budget):
+    """ Generate feedback based on predicted spending vs. budget. """
+    feedback = []
+
+    if predicted_spending > budget:
+        feedback.append(f"⚠️ You're predicted to overspend by £{round(predicted_spending - budget, 2)}. Consider adjusting your spending habits.")
+    
+    elif predicted_spending > budget * 0.8:
+        feedback.append(f"⚠️ You're close to exceeding your budget. Only £{round(budget - predicted_spending, 2)} left to spend.")
+
+    else:
+        feedback.append("✅ You're managing your spending well this month!")
+
+    return feedback
+
+def predict_batch(db, user_ids, chunk_size=BATCH_CHUNK_SIZE):
+    """
+    Predict spending for many users at once.
+
+    Yields one result dict per requested user ID, in request order. Each chunk of
+    users is fetched with a single $in query per collection and scored with one
+    vectorized model.predict call.
+    """
+    model = active_model()
+
+    for start in range(0, len(user_ids), chunk_size):
+        chunk = user_ids[start:start + chunk_size]
+
+        object_ids = {}
+        for user_id in chunk:
+            try:
+                object_ids[user_id] = ObjectId(user_id)
+            except Exception:
+                pass
+
+        ids = list(object_ids.values())
+        users = {user["_id"]: user for user in db["users"].find({"_id": {"$in": ids}})}
+        budgets = {
+            budget["user"]: budget.get("budget", 0)
+            for budget in db["budgets"].find({"user": {"$in": ids}}, {"user": 1, "budget": 1})
+        }
+
+        # ✅ Serve cached predictions, score the rest in one vectorized call
+        features = {
+            user_id: build_features(users[object_ids[user_id]])
+            for user_id in chunk if object_ids.get(user_id) in users
+        }
+        scored = {}
+        for user_id, row in features.items():
+            cached = prediction_cache.get(row, model.version)
+            if cached is not None:
+                scored[user_id] = cached
+
+        missing = [user_id for user_id in features if user_id not in scored]
+        if missing:
+            with phase("dataframe"):
+                frame = pd.DataFrame([features[user_id] for user_id in missing])
+            with phase("predict"):
+                predictions = model.pipeline.predict(frame)
+            for user_id, prediction in zip(missing, predictions):
+                scored[user_id] = float(prediction)
+                prediction_cache.put(features[user_id], model.version, scored[user_id])
+
+        for user_id in chunk:
+            if user_id not in object_ids:
+                yield {"user_id": user_id, "error": "Invalid User ID format"}
+            elif user_id not in scored:
+                yield {"user_id": user_id, "error": "User not found"}
+            else:
+                predicted_spending = round(float(scored[user_id]), 2)
+                budget = budgets.get(object_ids[user_id], 0)
+                yield {
+                    "user_id": user_id,
+                    "predicted_spending": predicted_spending,
+                    "budget": budget,
+                    "feedback": generate_feedback(predicted_spending, budget),
+                }
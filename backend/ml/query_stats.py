@@ -0,0 +1,87 @@
+import contextvars
+from contextlib import contextmanager
+
+from pymongo import monitoring
+
+# 🔢 Counts and times the MongoDB commands issued while serving one request (or inside
+# count_queries()). The listener is registered on the shared client in db.py; commands
+# run outside a counting scope are ignored, and scopes nest: a command counts towards
+# every enclosing one, so a count_queries() block around test requests sees them all.
+
+_stats = contextvars.ContextVar("mongo_command_stats", default=None)
+
+
+class QueryStats:
+    def __init__(self, parent=None):
+        self.parent = parent  # The enclosing scope's stats, if any
+        self.counts = {}  # command name -> count
+        self.collections = {}  # collection name -> count
+        self.seconds = 0.0  # server round-trip time reported by the driver
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+
+class CommandCounter(monitoring.CommandListener):
+    def started(self, event):
+        # find / aggregate / update / ... name their collection; getMore names it under "collection"
+        key = "collection" if event.command_name == "getMore" else event.command_name
+        collection = event.command.get(key)
+        stats = _stats.get()
+        while stats is not None:
+            stats.counts[event.command_name] = stats.counts.get(event.command_name, 0) + 1
+            if isinstance(collection, str):
+                stats.collections[collection] = stats.collections.get(collection, 0) + 1
+            stats = stats.parent
+
+    def succeeded(self, event):
+        stats = _stats.get()
+        while stats is not None:
+            stats.seconds += event.duration_micros / 1e6
+            stats = stats.parent
+
+    def failed(self, event):
+        self.succeeded(event)
+
+
+command_counter = CommandCounter()
+
+
+def current_stats():
+    """The QueryStats of the enclosing request / count_queries() block, if any."""
+    return _stats.get()
+
+
+@contextmanager
+def count_queries():
+    """Yield a QueryStats that fills in as commands run inside the block."""
+    stats = QueryStats(_stats.get())
+    token = _stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _stats.reset(token)
+
+
+def init_app(app):
+    """Report each request's command count in an X-DB-Queries response header."""
+    from flask import g
+
+    @app.before_request
+    def start_counting():
+        g.db_query_stats = QueryStats(_stats.get())
+        g.db_query_token = _stats.set(g.db_query_stats)
+
+    @app.after_request
+    def report_count(response):
+        stats = g.get("db_query_stats")
+        if stats is not None:
+            response.headers["X-DB-Queries"] = str(stats.total)
+        return response
+
+    @app.teardown_request
+    def stop_counting(exc=None):
+        token = g.pop("db_query_token", None)
+        if token is not None:
+            _stats.reset(token)
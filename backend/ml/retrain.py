@@ -0,0 +1,182 @@
+import argparse
+import copy
+import os
+import time
+import zlib
+
+import pandas as pd
+
+from feature_store import store as default_store
+from model_registry import registry as default_registry
+from predictor import FEATURE_DEFAULTS, build_features
+from train_model import build_pipeline, categorical_cols, evaluate, numerical_cols
+
+# 🔁 Retrain the spending model on live transaction history.
+#
+# Each user's target is their mean monthly spending, taken from the feature store's
+# monthly aggregates, and their model inputs come from the users collection. A retrain
+# runs once RETRAIN_MIN_NEW_TRANSACTIONS transactions have arrived since the model was
+# trained. Once the active model is itself a live retrain, a retrain doesn't refit: it
+# adds RETRAIN_TREES trees fitted on the current data to a copy of the active forest
+# (warm start) and drops the oldest trees beyond RETRAIN_MAX_TREES. The result is
+# published to the registry, which workers pick up without a restart.
+RETRAIN_MIN_NEW_TRANSACTIONS = int(os.environ.get("RETRAIN_MIN_NEW_TRANSACTIONS", 1000))
+RETRAIN_TREES = int(os.environ.get("RETRAIN_TREES", 50))
+RETRAIN_MAX_TREES = int(os.environ.get("RETRAIN_MAX_TREES", 400))
+MIN_TRAINING_USERS = 50
+HOLDOUT_BUCKETS = 5  # One user in five is held out for evaluation
+
+
+def monthly_targets(store):
+    """Mean monthly spending per user (hex ID), and the number of transactions behind it."""
+    totals = store.monthly_totals()
+    per_user = totals.group_by("user").aggregate([("amount", "mean")])
+    targets = dict(zip(per_user["user"].to_pylist(), per_user["amount_mean"].to_pylist()))
+    return targets, sum(totals["count"].to_pylist())
+
+
+def build_training_set(db, store):
+    """
+    Join the users' model inputs with their spending targets.
+    Returns (X, y, holdout, n_transactions); `holdout` flags the evaluation rows.
+    """
+    targets, n_transactions = monthly_targets(store)
+    rows, y, holdout = [], [], []
+    for user in db["users"].find({}, {feature: 1 for feature in FEATURE_DEFAULTS}):
+        user_id = str(user["_id"])
+        target = targets.get(user_id)
+        if target is not None:
+            rows.append(build_features(user))
+            y.append(target)
+            # Stable per user, so trees kept from earlier retrains never saw a held-out user
+            holdout.append(zlib.crc32(user_id.encode()) % HOLDOUT_BUCKETS == 0)
+    X = pd.DataFrame(rows, columns=numerical_cols + categorical_cols)
+    return X, pd.Series(y, dtype=float), pd.Series(holdout, dtype=bool), n_transactions
+
+
+def add_trees(pipeline, X, y, n_trees=RETRAIN_TREES, max_trees=RETRAIN_MAX_TREES, n_jobs=-1):
+    """
+    Grow the pipeline's forest by `n_trees` trees fitted on (X, y), in place.
+
+    The preprocessor is kept as it is, so the new trees see the same feature space
+    as the old ones (categories it has never seen are ignored by its encoder).
+    """
+    model = pipeline.named_steps["model"]
+    features = pipeline[:-1].transform(X)
+
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + n_trees, n_jobs=n_jobs)
+    model.fit(features, y)
+    if len(model.estimators_) > max_trees:
+        model.estimators_ = model.estimators_[-max_trees:]  # Age out the oldest trees
+        model.n_estimators = max_trees
+
+    # Single-row predictions are faster without a thread pool
+    model.set_params(warm_start=False, n_jobs=1)
+    return pipeline
+
+
+def full_refit(X, y, n_trees=None, n_jobs=-1, random_state=42):
+    """Fit a new pipeline from scratch (the first live model, or --full); n_trees defaults to train_model's."""
+    pipeline = build_pipeline(random_state, n_jobs=n_jobs)
+    if n_trees:
+        pipeline.set_params(model__n_estimators=n_trees)
+    pipeline.fit(X, y)
+    pipeline.set_params(model__n_jobs=1)
+    return pipeline
+
+
+def new_transactions(metadata, n_transactions):
+    """Transactions added since the model was trained (all of them for a model trained on the CSV)."""
+    if metadata.get("source") != "transactions":
+        return n_transactions
+    return n_transactions - metadata.get("n_transactions", 0)
+
+
+def retrain(db, store=default_store, registry=default_registry, force=False, full=False,
+            n_trees=None, n_jobs=-1, random_state=42, publish=True):
+    """
+    Snapshot new transactions, and retrain and publish if enough have arrived.
+    `n_trees` is the number of trees to add, or the forest size with full=True.
+    """
+    timings = {}
+    started = time.perf_counter()
+
+    store.snapshot(db)
+    X, y, holdout, n_transactions = build_training_set(db, store)
+    timings["features_seconds"] = time.perf_counter() - started
+
+    current = registry.get()
+    pending = new_transactions(current.metadata, n_transactions)
+    if len(X) < MIN_TRAINING_USERS:
+        return {"version": None, "skipped": f"only {len(X)} users with transactions"}
+    if not force and pending < RETRAIN_MIN_NEW_TRANSACTIONS:
+        return {"version": None, "skipped": f"{pending} new transactions, waiting for {RETRAIN_MIN_NEW_TRANSACTIONS}"}
+
+    X_train, X_test, y_train, y_test = X[~holdout], X[holdout], y[~holdout], y[holdout]
+
+    # 🌲 Trees are only added to a forest already fitted on these targets: the CSV-trained
+    # model (legacy pickle or train_model.py) predicts a different quantity
+    incremental = (
+        not full
+        and current.metadata.get("source") == "transactions"
+        and hasattr(current.pipeline.named_steps.get("model"), "estimators_")
+    )
+    fit_started = time.perf_counter()
+    if incremental:
+        pipeline = add_trees(copy.deepcopy(current.pipeline), X_train, y_train, n_trees or RETRAIN_TREES, n_jobs=n_jobs)
+    else:
+        pipeline = full_refit(X_train, y_train, n_trees if full else None, n_jobs, random_state)
+    timings["fit_seconds"] = time.perf_counter() - fit_started
+
+    metrics = evaluate(pipeline, X_test, y_test)
+    baseline_metrics = evaluate(current.pipeline, X_test, y_test)
+    timings["total_seconds"] = time.perf_counter() - started
+    timings = {key: round(value, 3) for key, value in timings.items()}
+
+    version = None
+    if publish:
+        version = registry.publish(
+            pipeline,
+            metrics=metrics,
+            source="transactions",
+            mode="incremental" if incremental else "full",
+            base_version=current.version if incremental else None,
+            n_transactions=n_transactions,
+            n_rows=len(X),
+            n_train=len(X_train),
+            n_trees=len(pipeline.named_steps["model"].estimators_),
+            baseline_metrics=baseline_metrics,
+            timings=timings,
+        )
+
+    return {
+        "version": version,
+        "mode": "incremental" if incremental else "full",
+        "new_transactions": pending,
+        "metrics": metrics,
+        "baseline_metrics": baseline_metrics,
+        "timings": timings,
+    }
+
+
+if __name__ == "__main__":
+    from db import get_db
+
+    parser = argparse.ArgumentParser(description="Retrain the spending model on live transactions.")
+    parser.add_argument("--force", action="store_true", help="Retrain even without enough new transactions")
+    parser.add_argument("--full", action="store_true", help="Refit from scratch instead of adding trees")
+    parser.add_argument("--trees", type=int, help=f"Trees to add (default {RETRAIN_TREES}), or the forest size with --full")
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--dry-run", action="store_true", help="Train and report without publishing")
+    args = parser.parse_args()
+
+    result = retrain(
+        get_db(), force=args.force, full=args.full, n_trees=args.trees, n_jobs=args.n_jobs, publish=not args.dry_run
+    )
+    if result.get("skipped"):
+        print(f"⏭  Skipped: {result['skipped']}")
+    else:
+        print(f"⏱  Timings: {result['timings']}")
+        print(f"📊 Held-out metrics: {result['metrics']} (active model: {result['baseline_metrics']})")
+        if result["version"]:
+            print(f"✅ Published {result['mode']} retrain as {result['version']}")
@@ -0,0 +1,36 @@
+import os
+
+from flask import Flask
+from flask_cors import CORS
+
+import instrumentation
+import query_stats
+from blueprints import BLUEPRINTS
+
+# ⚙️ Load the active model when the app is created instead of on the first request
+PRELOAD_MODEL = os.environ.get("PRELOAD_MODEL", "1") == "1"
+
+
+def create_app():
+    """
+    Build the Flask app with every blueprint registered.
+
+    The Mongo client (db.py) and the model (model_registry.py) are process-wide
+    singletons, so all blueprints share one connection pool and one loaded model.
+    """
+    instrumentation.configure_logging()
+
+    app = Flask(__name__)
+    CORS(app, resources={r"/api/*": {"origins": "*"}}, expose_headers=["X-DB-Queries"])
+
+    for blueprint in BLUEPRINTS:
+        app.register_blueprint(blueprint)
+    query_stats.init_app(app)
+    instrumentation.init_app(app)
+
+    if PRELOAD_MODEL:
+        from predictor import active_model
+        active_model()
+
+    return app
+
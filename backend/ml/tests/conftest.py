@@ -0,0 +1,19 @@
+import os
+import sys
+
+import mongomock
+import pytest
+
+# Modules in backend/ml import each other by bare name, as when run from that directory
+ML_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ML_DIR, os.path.join(ML_DIR, "benchmarks")]
+
+import db as db_module  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    """The application database on a fresh mongomock client."""
+    db_module.set_client(mongomock.MongoClient())
+    yield db_module.get_db()
+    db_module.close_client()
@@ -0,0 +1,49 @@
+import pytest
+from bson import ObjectId
+
+import account_deletion
+from account_deletion import JOBS_COLLECTION, enqueue_deletion, run_pending_jobs
+
+
+def seed_user(db):
+    user = ObjectId()
+    db["users"].insert_one({"_id": user, "username": "student"})
+    db["transactions"].insert_many([{"user": user, "amount": float(i)} for i in range(5)])
+    db["budgets"].insert_one({"user": user, "budget": 100})
+    db["goals"].insert_one({"user": user, "name": "Laptop"})
+    return user
+
+
+def remaining(db, user):
+    return {name: db[name].count_documents({"user": user}) for name in account_deletion.DEPENDENT_COLLECTIONS}
+
+
+def test_deletion_removes_user_and_data(db):
+    user = seed_user(db)
+    job_id = enqueue_deletion(db, user)
+    assert db["users"].count_documents({"_id": user}) == 0
+
+    assert run_pending_jobs(db, "test") == 1
+    assert set(remaining(db, user).values()) == {0}
+    assert db[JOBS_COLLECTION].find_one({"_id": job_id})["status"] == "done"
+
+
+def test_crash_after_queuing_is_resumable(db, monkeypatch):
+    user = seed_user(db)
+    delete_one = type(db["users"]).delete_one
+
+    def crash_on_user_delete(self, query, *args, **kwargs):
+        if self.name == "users":
+            raise RuntimeError("process died")
+        return delete_one(self, query, *args, **kwargs)
+
+    monkeypatch.setattr(type(db["users"]), "delete_one", crash_on_user_delete)
+    with pytest.raises(RuntimeError):
+        enqueue_deletion(db, user)
+    monkeypatch.undo()
+
+    # The job was queued before the crash, so the worker still removes everything
+    assert db[JOBS_COLLECTION].count_documents({"user": user, "status": "pending"}) == 1
+    assert run_pending_jobs(db, "test") == 1
+    assert db["users"].count_documents({"_id": user}) == 0
+    assert set(remaining(db, user).values()) == {0}
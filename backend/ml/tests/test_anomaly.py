@@ -0,0 +1,33 @@
+import random
+import statistics
+
+from anomaly import ANOMALY_MIN_HISTORY, ANOMALY_Z, StreamingScorer, anomaly_messages, scan, score
+
+
+def test_streaming_score_matches_rescan():
+    rng = random.Random(3)
+    amounts = [round(rng.lognormvariate(3, 0.3), 2) for _ in range(200)]
+    scorer = StreamingScorer()
+    for i, amount in enumerate(amounts):
+        z = scorer.score_and_update("user", "Food", amount)
+        earlier = amounts[:i]
+        if len(earlier) < ANOMALY_MIN_HISTORY:
+            assert z is None
+        else:
+            mean = statistics.fmean(earlier)
+            assert abs(z - (amount - mean) / max(statistics.pstdev(earlier), 0.05 * mean)) < 1e-6
+    assert scorer.category_stats("user")["Food"]["n"] == len(amounts)
+
+
+def test_scan_flags_outlier_against_earlier_transactions():
+    transactions = [{"_id": i, "category": "Food", "amount": 10.0 + i % 3} for i in range(12)]
+    transactions.append({"_id": 12, "category": "Food", "amount": 95.0})
+    transactions.append({"_id": 13, "category": "Rent", "amount": 95.0})  # No Rent history yet
+
+    stats, anomalies = scan(transactions)
+    assert [item["txn"] for item in anomalies] == [12]
+    assert anomalies[0]["score"] >= ANOMALY_Z
+    assert anomalies[0]["usual"] == 11.0  # Mean of the twelve earlier Food amounts
+    assert stats["Rent"] == {"n": 1, "sum": 95.0, "sumsq": 95.0 ** 2}
+    assert score(stats["Food"], 11.0) < ANOMALY_Z
+    assert anomaly_messages(anomalies)[0].startswith("🔎 Unusual Food spend: £95.00")
@@ -0,0 +1,21 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("quart")
+pytest.importorskip("motor")
+
+import async_app  # noqa: E402
+
+
+def test_starts_with_process_executor(db, monkeypatch):
+    monkeypatch.setattr(async_app, "INFERENCE_EXECUTOR", "process")
+    monkeypatch.setattr(async_app, "INFERENCE_WORKERS", 1)
+    monkeypatch.setattr(async_app, "get_db", lambda: db)
+
+    async def start_and_summarize():
+        async with async_app.app.test_app():
+            return await async_app.run_blocking(async_app.summarize_loop, [{"amount": 5.0, "category": "Food"}])
+
+    summary = asyncio.run(start_and_summarize())
+    assert summary["category_spending"] == {"Food": 5.0}
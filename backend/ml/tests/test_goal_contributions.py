@@ -0,0 +1,34 @@
+import pytest
+from bson import ObjectId
+
+from goal_contributions import build_batch, parse_contribution
+from server import create_app
+
+
+@pytest.mark.parametrize("amount", ["nan", "inf", "-inf", float("nan"), -5, "abc"])
+def test_rejects_invalid_amounts(amount):
+    with pytest.raises(ValueError, match="Invalid contribution amount"):
+        parse_contribution({"user_id": str(ObjectId()), "goal_id": str(ObjectId()), "amount": amount})
+
+
+def test_batch_reports_non_object_items():
+    user, goal = str(ObjectId()), str(ObjectId())
+    ops, targets, errors = build_batch(["oops", {"user_id": user, "goal_id": goal, "amount": 5}, None])
+    assert len(ops) == 1
+    assert errors == [
+        {"index": 0, "error": "Contribution must be an object"},
+        {"index": 2, "error": "Contribution must be an object"},
+    ]
+
+
+def test_nan_contribution_leaves_goal_untouched(db):
+    user = ObjectId()
+    goal = db["goals"].insert_one({"user": user, "name": "Laptop", "target": 500.0, "saved": 10.0}).inserted_id
+    client = create_app().test_client()
+
+    response = client.post("/api/goals/contribute", json={"user_id": str(user), "goal_id": str(goal), "amount": "nan"})
+    assert response.status_code == 400
+    assert db["goals"].find_one({"_id": goal})["saved"] == 10.0
+
+    response = client.post("/api/goals/contribute", json={"user_id": str(user), "goal_id": str(goal), "amount": "2.5"})
+    assert response.get_json()["new_savings"] == 12.5
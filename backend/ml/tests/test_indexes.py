@@ -0,0 +1,40 @@
+from indexes import ensure_indexes, explain_query_paths, query_paths, verify_indexes
+
+
+def test_indexes_are_created(db):
+    ensure_indexes(db)
+    assert verify_indexes(db) == []
+    assert "user_1__id_-1" in db["transactions"].index_information()
+
+
+class ExplainOnly:
+    """Stands in for a database: every find() or aggregate explains as a scan of one index."""
+
+    def __init__(self, index_name):
+        self.plan = {"queryPlanner": {"winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": index_name}}}}
+
+    def __getitem__(self, name):
+        return self
+
+    def find(self, query):
+        return self
+
+    def sort(self, sort):
+        return self
+
+    def explain(self):
+        return self.plan
+
+    def command(self, *args, **kwargs):
+        return self.plan
+
+
+def test_id_index_walk_counts_as_full_scan():
+    labels = {label: kind for label, _, kind, _ in query_paths()}
+    assert {"transactions in write order", "latest transactions", "insights recent facet"} <= set(labels)
+
+    full_scans = {label for label, _, full_scan in explain_query_paths(ExplainOnly("_id_")) if full_scan}
+    assert {"transactions in write order", "latest transactions", "insights recent facet"} <= full_scans
+    assert "goal by id and user" not in full_scans  # Filters on _id, so the _id_ index is the right one
+
+    assert not any(full_scan for _, _, full_scan in explain_query_paths(ExplainOnly("user_1__id_-1")))
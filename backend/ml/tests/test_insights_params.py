@@ -0,0 +1,67 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from server import create_app
+
+
+@pytest.mark.parametrize("limit", ["-1", "0", "abc", "1.5"])
+def test_invalid_limit_is_rejected(db, limit):
+    client = create_app().test_client()
+    response = client.get(f"/api/insights?user_id={ObjectId()}&limit={limit}")
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Invalid date range or limit"}
+
+
+@pytest.fixture
+def dated_user(db):
+    """One user with real dates over three months, plus a legacy string date and a missing one."""
+    user = ObjectId()
+    dates = [datetime(2024, 1, 5), datetime(2024, 1, 20), datetime(2024, 2, 3), datetime(2024, 2, 10), datetime(2024, 3, 15)]
+    transactions = [{"user": user, "amount": 10.0 * (i + 1), "category": "Food", "date": date} for i, date in enumerate(dates)]
+    transactions += [
+        {"user": user, "amount": 7.0, "category": "Food", "date": "2024-02-03"},
+        {"user": user, "amount": 3.0, "category": "Food"},
+    ]
+    db["transactions"].insert_many(transactions)
+    return user
+
+
+def all_pages(client, path):
+    """Follow nextCursor to the end; returns the trend points of every page."""
+    pages, cursor = [], None
+    while True:
+        response = client.get(path + (f"&cursor={cursor}" if cursor else ""))
+        assert response.status_code == 200, response.get_data(as_text=True)
+        body = response.get_json()
+        pages.append(body["spendingTrends"])
+        cursor = body["nextCursor"]
+        if cursor is None:
+            return pages
+        assert len(pages) < 20, "pagination does not terminate"
+
+
+@pytest.mark.parametrize("granularity, expected", [
+    ("month", {"2024-01": 30.0, "2024-02": 70.0, "2024-03": 50.0}),
+    ("week", {"2024-W01": 10.0, "2024-W03": 20.0, "2024-W05": 30.0, "2024-W06": 40.0, "2024-W11": 50.0}),
+    ("day", {"2024-01-05": 10.0, "2024-01-20": 20.0, "2024-02-03": 30.0, "2024-02-10": 40.0, "2024-03-15": 50.0}),
+])
+@pytest.mark.parametrize("limit", [1, 2, 10])
+def test_granularity_pages_cover_every_period(db, dated_user, granularity, expected, limit):
+    client = create_app().test_client()
+    pages = all_pages(client, f"/api/insights?user_id={dated_user}&granularity={granularity}&limit={limit}")
+
+    assert all(len(page) <= limit for page in pages)
+    points = [point for page in pages for point in page]
+    # Undated and string-dated transactions have no calendar period, so no null bucket
+    assert {point["day"]: point["amount"] for point in points} == expected
+    assert [point["day"] for point in points] == sorted(expected)
+
+
+def test_granularity_inside_date_range(db, dated_user):
+    client = create_app().test_client()
+    response = client.get(f"/api/insights?user_id={dated_user}&from=2024-02-01&to=2024-02-29&granularity=month")
+    body = response.get_json()
+    assert body["spendingTrends"] == [{"day": "2024-02", "amount": 70.0}]
+    assert body["nextCursor"] is None
@@ -0,0 +1,95 @@
+import random
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+from db import MONGO_URI
+from insight_engine import summarize_loop
+from insight_summary import rebuild_summary, summary_to_insights
+from insights_pipeline import run_insights_aggregation
+
+CATEGORIES = ["Food", "Rent", "Travel", "Entertainment", "Miscellaneous"]
+FIELDS = ["count", "total_spent", "category_spending", "largest_transaction", "recent"]
+
+
+def make_transactions(user, n=300, seed=7, odd_dates=False):
+    """Transactions with real and "YYYY-MM-DD" dates, optionally also missing and malformed ones."""
+    rng = random.Random(seed)
+    transactions = []
+    for i in range(n):
+        txn = {"_id": ObjectId(), "user": user, "amount": round(rng.uniform(1, 80), 2)}
+        if i % 10:
+            txn["category"] = rng.choice(CATEGORIES)
+        date = datetime(2024, rng.randint(1, 12), rng.randint(1, 28))
+        txn["date"] = date if i % 3 else date.strftime("%Y-%m-%d")
+        if odd_dates and i % 17 == 0:
+            odd = rng.choice(["missing", "not-a-date", {"day": 4}])
+            if odd == "missing":
+                del txn["date"]
+            else:
+                txn["date"] = odd
+        transactions.append(txn)
+    transactions[150]["amount"] = 900.0  # An outlier for the anomaly scan
+    return transactions
+
+
+def day_totals(trends):
+    totals = {}
+    for point in trends:
+        totals[point["day"]] = round(totals.get(point["day"], 0) + point["amount"], 6)
+    return totals
+
+
+def assert_same_summary(expected, actual):
+    for field in FIELDS:
+        assert actual[field] == pytest.approx(expected[field]), field
+    assert list(actual["category_spending"]) == list(expected["category_spending"])
+    assert day_totals(actual["spending_trends"]) == pytest.approx(day_totals(expected["spending_trends"]))
+
+
+def test_summary_document_matches_loop(db):
+    user = ObjectId()
+    transactions = make_transactions(user, odd_dates=True)
+    db["transactions"].insert_many(transactions)
+
+    loop = summarize_loop(list(db["transactions"].find({"user": user})))
+    summary = summary_to_insights(rebuild_summary(db, user))
+
+    assert_same_summary(loop, summary)
+    assert summary["anomalies"] == [
+        {key: value for key, value in item.items() if key != "txn"} for item in loop["anomalies"]
+    ]
+    assert [item["amount"] for item in summary["anomalies"]] == [900.0]
+
+
+@pytest.fixture
+def mongod_db():
+    """A scratch database on the mongod at MONGO_URI; mongomock can't run the pipeline's $type/$convert."""
+    client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=500)
+    try:
+        client.admin.command("ping")
+    except PyMongoError:
+        pytest.skip(f"no mongod at {MONGO_URI}")
+    db = client["insightsParityTest"]
+    yield db
+    client.drop_database(db.name)
+    client.close()
+
+
+def test_aggregation_matches_loop(mongod_db):
+    user = ObjectId()
+    mongod_db["transactions"].insert_many(make_transactions(user, odd_dates=True))
+
+    loop = summarize_loop(list(mongod_db["transactions"].find({"user": user})))
+    aggregated = run_insights_aggregation(mongod_db["transactions"], user)
+
+    assert_same_summary(loop, aggregated)
+
+
+def test_aggregation_matches_loop_without_transactions(mongod_db):
+    loop = summarize_loop([])
+    aggregated = run_insights_aggregation(mongod_db["transactions"], ObjectId())
+    assert_same_summary(loop, aggregated)
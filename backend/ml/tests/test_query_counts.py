@@ -0,0 +1,69 @@
+import threading
+from types import SimpleNamespace
+
+import mongomock
+import pytest
+
+from query_stats import command_counter, count_queries
+from server import create_app
+from synthetic import seed_database
+
+# mongomock emits no command monitoring events: report one per top-level collection call
+COMMANDS = {
+    "find": "find",
+    "find_one": "find",
+    "aggregate": "aggregate",
+    "count_documents": "aggregate",
+    "distinct": "distinct",
+    "insert_one": "insert",
+    "insert_many": "insert",
+    "update_one": "update",
+    "update_many": "update",
+    "replace_one": "update",
+    "find_one_and_update": "findAndModify",
+    "delete_one": "delete",
+    "delete_many": "delete",
+    "bulk_write": "update",
+}
+
+# Routes mongomock can serve, and the collections each reads (once); the aggregation
+# modes are covered by benchmarks/check_query_counts.py on mongod
+CASES = {
+    "insights summary": ("/api/insights?user_id={user}&mode=summary", {"insight_summaries", "budgets"}),
+    "insights loop": ("/api/insights?user_id={user}&mode=loop", {"transactions", "budgets"}),
+    "ml insights": ("/api/ml/insights?user_id={user}", {"insight_summaries", "budgets"}),
+}
+
+
+@pytest.fixture
+def command_events(monkeypatch):
+    depth = threading.local()
+
+    def emitting(method, command_name):
+        def call(self, *args, **kwargs):
+            outer = getattr(depth, "level", 0)
+            if outer == 0:  # mongomock's find_one calls find, and so on
+                command_counter.started(SimpleNamespace(command_name=command_name, command={command_name: self.name}))
+            depth.level = outer + 1
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                depth.level = outer
+        return call
+
+    for name, command_name in COMMANDS.items():
+        method = getattr(mongomock.collection.Collection, name)
+        monkeypatch.setattr(mongomock.collection.Collection, name, emitting(method, command_name))
+
+
+@pytest.mark.parametrize("path, collections", CASES.values(), ids=CASES.keys())
+def test_insights_read_each_collection_once(db, command_events, path, collections):
+    users = seed_database(db, 5, median_history=20)["user_ids"]
+    client = create_app().test_client()
+
+    for user in users:
+        with count_queries() as stats:
+            response = client.get(path.format(user=user))
+        assert response.status_code == 200
+        assert stats.collections == dict.fromkeys(collections, 1)
+        assert response.headers["X-DB-Queries"] == str(stats.total)
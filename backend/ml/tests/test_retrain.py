@@ -0,0 +1,25 @@
+import time
+from datetime import timedelta
+
+from feature_store import FeatureStore
+from model_registry import ModelRegistry
+from retrain import retrain
+from synthetic import seed_database
+
+
+def test_first_retrain_from_legacy_model_is_full_refit(db, tmp_path):
+    store = FeatureStore(str(tmp_path / "store"))
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    seed_database(db, 80, median_history=10)
+    time.sleep(1)  # Snapshot watermarks have one-second resolution
+    store.snapshot(db, lag=timedelta(0))
+
+    # An empty registry serves the CSV-trained legacy pickle, which already has trees
+    assert registry.get().metadata["version"] == "legacy"
+    first = retrain(db, store, registry, force=True, n_trees=5, n_jobs=1)
+    assert first["mode"] == "full"
+    assert registry.metadata(first["version"])["base_version"] is None
+
+    second = retrain(db, store, registry, force=True, n_trees=5, n_jobs=1)
+    assert second["mode"] == "incremental"
+    assert registry.metadata(second["version"])["base_version"] == first["version"]
@@ -0,0 +1,59 @@
+import io
+import json
+
+import mongomock
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+from insight_summary import SUMMARY_COLLECTION
+from transaction_import import import_transactions
+
+HEADER = "date,amount,category,paymentMethod,description,status\n"
+
+
+def csv_rows(n):
+    return io.StringIO(HEADER + "".join(f"2024-03-{i % 28 + 1:02d},{i + 1}.50,Food,Cash,Row {i},Completed\n" for i in range(n)))
+
+
+def test_import_builds_summary(db):
+    user = ObjectId()
+    report = import_transactions(db, csv_rows(25), user, batch_size=10)
+    assert (report["inserted"], report["failed"]) == (25, 0)
+    assert db[SUMMARY_COLLECTION].find_one({"user": user})["count"] == 25
+
+
+def test_failed_batch_still_rebuilds_summary(db, monkeypatch):
+    insert_many = mongomock.collection.Collection.insert_many
+    calls = []
+
+    def failing_second_batch(self, documents, *args, **kwargs):
+        calls.append(len(documents))
+        if len(calls) == 2:
+            raise BulkWriteError({"nInserted": 0, "writeErrors": [{"index": 0, "code": 11000, "errmsg": "duplicate"}]})
+        return insert_many(self, documents, *args, **kwargs)
+
+    monkeypatch.setattr(mongomock.collection.Collection, "insert_many", failing_second_batch)
+    user = ObjectId()
+    with pytest.raises(BulkWriteError):
+        import_transactions(db, csv_rows(25), user, batch_size=10)
+
+    # The first batch stayed written, and the summary reflects it
+    assert db["transactions"].count_documents({"user": user}) == 10
+    assert db[SUMMARY_COLLECTION].find_one({"user": user})["count"] == 10
+
+
+def test_ndjson_row_with_non_string_enum_is_reported(db):
+    user = ObjectId()
+    good = {"date": "2024-03-01", "amount": 5, "category": "Food", "paymentMethod": "Card", "description": "Lunch", "status": "Completed"}
+    lines = [good, {**good, "category": ["Food"]}, {**good, "paymentMethod": {"type": "Card"}}, {**good, "status": ["Pending"]}, good]
+    stream = io.StringIO("".join(json.dumps(line) + "\n" for line in lines))
+
+    report = import_transactions(db, stream, user, fmt="ndjson")
+    assert (report["inserted"], report["failed"]) == (2, 3)
+    assert report["errors"] == [
+        {"line": 2, "error": "Invalid category: ['Food']"},
+        {"line": 3, "error": "Invalid paymentMethod: {'type': 'Card'}"},
+        {"line": 4, "error": "Invalid status: ['Pending']"},
+    ]
+    assert db["transactions"].count_documents({"user": user}) == 2
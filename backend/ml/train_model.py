@@ -1,68 +1,181 @@
-import pandas as pd
+import argparse
+import os
+import time
+
 import numpy as np
-import pickle
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, OneHotEncoder
+import pandas as pd
+from scipy.stats import randint
 from sklearn.compose import ColumnTransformer
-from sklearn.pipeline import Pipeline
 from sklearn.ensemble import RandomForestRegressor
-import os
-import pickle
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import KFold, RandomizedSearchCV, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from model_registry import registry
 
-# 📂 Load the dataset (Update the path if needed)
+# 📂 Default dataset (override with --data)
 base_dir = os.path.dirname(os.path.abspath(__file__))  # Get current script directory
 file_path = os.path.join(base_dir, "student_spending.csv")  # Join with CSV filename
 
-df = pd.read_csv(file_path)
-
-# 🎯 Define Target Variable (Total Spending)
-df["total_spending"] = df[
-    ["housing", "food", "transportation", "books_supplies",
-     "entertainment", "personal_care", "technology",
-     "health_wellness", "miscellaneous"]
-].sum(axis=1)
-
-# 🎯 Drop Unnecessary Columns
-df.drop(["housing", "food", "transportation", "books_supplies",
-         "entertainment", "personal_care", "technology",
-         "health_wellness", "miscellaneous"], axis=1, inplace=True)
-
-# 🔧 Separate Features (X) & Target (y)
-X = df.drop(["total_spending"], axis=1)
-y = df["total_spending"]
+SPENDING_COLS = ["housing", "food", "transportation", "books_supplies",
+                 "entertainment", "personal_care", "technology",
+                 "health_wellness", "miscellaneous"]
 
 # 📊 Identify Categorical & Numerical Columns
 categorical_cols = ["gender", "year_in_school", "major", "preferred_payment_method"]
 numerical_cols = ["age", "monthly_income", "financial_aid", "tuition"]
 
-# 🛠 Preprocessing Pipeline (One-Hot Encoding + Scaling)
-preprocessor = ColumnTransformer([
-    ("num", StandardScaler(), numerical_cols),
-    ("cat", OneHotEncoder(handle_unknown="ignore"), categorical_cols)
-])
+# 🔍 Hyperparameter search space for the Random Forest
+PARAM_DISTRIBUTIONS = {
+    "model__n_estimators": randint(50, 400),
+    "model__max_depth": [None, 8, 12, 16, 24],
+    "model__min_samples_leaf": randint(1, 10),
+    "model__max_features": [1.0, "sqrt", 0.5],
+}
 
-# 🚀 Train the Model (Random Forest Regressor)
-pipeline = Pipeline([
-    ("preprocessor", preprocessor),
-    ("model", RandomForestRegressor(n_estimators=100, random_state=42))
-])
 
-# 📚 Split Data for Training & Testing
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+def read_profiles(path):
+    """
+    The training CSV as a DataFrame. With pyarrow installed it comes from the feature
+    store (parsed once, then memory-mapped); otherwise the CSV is parsed again.
+    """
+    try:
+        from feature_store import store
+    except ImportError:
+        return pd.read_csv(path, index_col=0)
+    return store.profiles(path).to_pandas()
 
-# 🎯 Train the Model
-pipeline.fit(X_train, y_train)
 
-# Get the absolute path dynamically
-base_dir = os.path.dirname(os.path.abspath(__file__))  # Get current script directory
-model_path = os.path.join(base_dir, "spending_model.pkl")  # Save the model here
+def load_dataset(path, synthetic_rows=0, random_state=42):
+    """
+    Load the spending CSV and return (X, y).
+
+    With synthetic_rows > 0 the data is bootstrapped up to that many rows, with
+    a little noise on the numeric columns, to exercise training at larger scale.
+    """
+    df = read_profiles(path)
+
+    if synthetic_rows:
+        rng = np.random.default_rng(random_state)
+        df = df.sample(n=synthetic_rows, replace=True, random_state=random_state).reset_index(drop=True)
+        for column in numerical_cols + SPENDING_COLS:
+            noise = rng.normal(1.0, 0.05, len(df))
+            df[column] = np.maximum(0, df[column] * noise).round()
+
+    # 🎯 Target Variable (Total Spending)
+    y = df[SPENDING_COLS].sum(axis=1)
+    X = df[numerical_cols + categorical_cols]
+    return X, y
+
+
+def build_pipeline(random_state=42, n_jobs=1):
+    # 🛠 Preprocessing Pipeline (One-Hot Encoding + Scaling)
+    preprocessor = ColumnTransformer([
+        ("num", StandardScaler(), numerical_cols),
+        ("cat", OneHotEncoder(handle_unknown="ignore"), categorical_cols)
+    ])
+
+    return Pipeline([
+        ("preprocessor", preprocessor),
+        ("model", RandomForestRegressor(n_estimators=100, random_state=random_state, n_jobs=n_jobs))
+    ])
+
+
+def evaluate(pipeline, X_test, y_test):
+    predictions = pipeline.predict(X_test)
+    return {
+        "mae": round(float(mean_absolute_error(y_test, predictions)), 4),
+        "rmse": round(float(np.sqrt(mean_squared_error(y_test, predictions))), 4),
+        "r2": round(float(r2_score(y_test, predictions)), 4),
+    }
+
+
+def train(data_path=file_path, synthetic_rows=0, n_iter=20, cv=5, n_jobs=-1, random_state=42,
+          search=True, publish=True):
+    """Run the search, refit the best pipeline on all cores and publish it with its metrics."""
+    timings = {}
+    started = time.perf_counter()
+
+    X, y = load_dataset(data_path, synthetic_rows, random_state)
+    # 📚 Split Data for Training & Testing
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=random_state)
+    timings["load_seconds"] = time.perf_counter() - started
+
+    best_params, cv_score = {}, None
+    if search:
+        # 🔍 Candidates x folds run on a joblib process pool; each forest stays single-threaded
+        searcher = RandomizedSearchCV(
+            build_pipeline(random_state, n_jobs=1),
+            PARAM_DISTRIBUTIONS,
+            n_iter=n_iter,
+            cv=KFold(n_splits=cv, shuffle=True, random_state=random_state),
+            scoring="neg_mean_absolute_error",
+            n_jobs=n_jobs,
+            random_state=random_state,
+            refit=False,
+        )
+        search_started = time.perf_counter()
+        searcher.fit(X_train, y_train)
+        timings["search_seconds"] = time.perf_counter() - search_started
+        best_params, cv_score = searcher.best_params_, -searcher.best_score_
+
+    # 🎯 Refit the best configuration with the trees built in parallel
+    pipeline = build_pipeline(random_state, n_jobs=n_jobs).set_params(**best_params)
+    fit_started = time.perf_counter()
+    pipeline.fit(X_train, y_train)
+    timings["fit_seconds"] = time.perf_counter() - fit_started
+
+    # Single-row predictions are faster without a thread pool
+    pipeline.set_params(model__n_jobs=1)
+
+    metrics = evaluate(pipeline, X_test, y_test)
+    if cv_score is not None:
+        metrics["cv_mae"] = round(float(cv_score), 4)
+    timings["total_seconds"] = time.perf_counter() - started
+    timings = {key: round(value, 3) for key, value in timings.items()}
+
+    version = None
+    if publish:
+        version = registry.publish(
+            pipeline,
+            metrics=metrics,
+            source=os.path.basename(data_path),
+            n_rows=len(X),
+            n_train=len(X_train),
+            params={key: value.item() if hasattr(value, "item") else value for key, value in best_params.items()},
+            timings=timings,
+        )
+
+    return {"version": version, "metrics": metrics, "params": best_params, "timings": timings}
 
-# Ensure the directory exists before saving
-os.makedirs(os.path.dirname(model_path), exist_ok=True)
 
-# Save the model
-with open(model_path, "wb") as model_file:
-    pickle.dump(pipeline, model_file) 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the spending model and publish it to the registry.")
+    parser.add_argument("--data", default=file_path, help="Training CSV (default: student_spending.csv)")
+    parser.add_argument("--synthetic-rows", type=int, default=0,
+                        help="Bootstrap the CSV up to this many rows to train at larger scale")
+    parser.add_argument("--n-iter", type=int, default=20, help="Hyperparameter candidates to try")
+    parser.add_argument("--cv", type=int, default=5, help="Cross-validation folds")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Worker processes / threads (-1 = all cores)")
+    parser.add_argument("--random-state", type=int, default=42)
+    parser.add_argument("--no-search", action="store_true", help="Skip the search and fit the default forest")
+    parser.add_argument("--dry-run", action="store_true", help="Train and report without publishing")
+    args = parser.parse_args()
 
+    result = train(
+        data_path=args.data,
+        synthetic_rows=args.synthetic_rows,
+        n_iter=args.n_iter,
+        cv=args.cv,
+        n_jobs=args.n_jobs,
+        random_state=args.random_state,
+        search=not args.no_search,
+        publish=not args.dry_run,
+    )
 
-print(f"✅ Model training completed! Saved at {model_path}")
+    print(f"⏱  Timings: {result['timings']}")
+    print(f"📊 Held-out metrics: {result['metrics']}")
+    print(f"🔧 Best params: {result['params'] or 'defaults'}")
+    if result["version"]:
+        print(f"✅ Model training completed! Published version {result['version']} to {registry.root}")
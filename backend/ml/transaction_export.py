@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+from transaction_import import REQUIRED_FIELDS
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FIELDS = ["_id"] + REQUIRED_FIELDS
+
+
+def parse_date_range(date_from=None, date_to=None):
+    """
+    Build a Mongo date filter from optional ISO dates.
+
+    `from` is inclusive. A date-only `to` ("2025-03-31") includes that whole day,
+    a full timestamp is used as an exclusive upper bound.
+    """
+    date_filter = {}
+    if date_from:
+        date_filter["$gte"] = datetime.fromisoformat(date_from)
+    if date_to:
+        end = datetime.fromisoformat(date_to)
+        date_filter["$lt"] = end + timedelta(days=1) if len(date_to) == 10 else end
+    return date_filter
+
+
+def export_cursor(collection, user_id_obj, date_filter=None):
+    """A batched server-side cursor over one user's transactions, oldest first."""
+    query = {"user": user_id_obj}
+    if date_filter:
+        query["date"] = date_filter
+    projection = {field: 1 for field in EXPORT_FIELDS}
+    return collection.find(query, projection).sort("date", 1).batch_size(EXPORT_BATCH_SIZE)
+
+
+def _serialize(txn):
+    row = {field: txn.get(field, "") for field in EXPORT_FIELDS}
+    row["_id"] = str(row["_id"])
+    if isinstance(row["date"], datetime):
+        row["date"] = row["date"].isoformat()
+    return row
+
+
+def stream_csv(cursor):
+    """Yield CSV text one cursor batch at a time, so memory stays flat."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+
+    for count, txn in enumerate(cursor, start=1):
+        writer.writerow(_serialize(txn))
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def stream_ndjson(cursor):
+    """Yield one JSON object per line, flushed every cursor batch."""
+    lines = []
+    for txn in cursor:
+        lines.append(json.dumps(_serialize(txn)))
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
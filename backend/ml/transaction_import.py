@@ -0,0 +1,158 @@
+import argparse
+import csv
+import io
+import json
+import math
+import time
+from datetime import datetime
+
+from bson import ObjectId
+
+from insight_summary import rebuild_summary
+
+# 📋 Mirrors the enums in backend/models/Transaction.js
+CATEGORIES = {"Food", "Rent", "Entertainment", "Travel", "Miscellaneous"}
+PAYMENT_METHODS = {"Card", "Cash"}
+STATUSES = {"Completed", "Pending"}
+REQUIRED_FIELDS = ["date", "amount", "category", "paymentMethod", "description", "status"]
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+
+def _parse_date(value):
+    if isinstance(value, datetime):
+        return value
+    value = str(value).strip()
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid date: {value!r}")
+    # Store naive UTC like the rest of the collection
+    if parsed.tzinfo is not None:
+        parsed = (parsed - parsed.utcoffset()).replace(tzinfo=None)
+    return parsed
+
+
+def validate_row(row, user_id_obj):
+    """Turn one CSV/NDJSON row into a transaction document, or raise ValueError."""
+    missing = [field for field in REQUIRED_FIELDS if row.get(field) in (None, "")]
+    if missing:
+        raise ValueError(f"Missing required fields: {', '.join(missing)}")
+
+    try:
+        amount = float(row["amount"])
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid amount: {row['amount']!r}")
+    if not math.isfinite(amount):
+        raise ValueError(f"Invalid amount: {row['amount']!r}")
+
+    # NDJSON values can be lists or objects, which can't be looked up in a set
+    for field, allowed in (("category", CATEGORIES), ("paymentMethod", PAYMENT_METHODS), ("status", STATUSES)):
+        if not isinstance(row[field], str) or row[field] not in allowed:
+            raise ValueError(f"Invalid {field}: {row[field]!r}")
+
+    return {
+        "user": user_id_obj,
+        "date": _parse_date(row["date"]),
+        "amount": amount,
+        "category": row["category"],
+        "paymentMethod": row["paymentMethod"],
+        "description": str(row["description"]),
+        "status": row["status"],
+    }
+
+
+def iter_rows(stream, fmt):
+    """Yield (line_number, row dict) from a text stream without reading it all into memory."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "ndjson":
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, e
+                continue
+            yield line_number, row if isinstance(row, dict) else ValueError("Row is not a JSON object")
+    else:
+        raise ValueError(f"Unsupported format: {fmt!r}")
+
+
+def import_transactions(db, stream, user_id_obj, fmt="csv", batch_size=BATCH_SIZE, dry_run=False):
+    """
+    Stream rows into the transactions collection in insert_many batches.
+
+    Only one batch is held in memory at a time. Invalid rows are skipped and
+    reported with their line number (the first MAX_REPORTED_ERRORS are kept).
+    """
+    collection = db["transactions"]
+    report = {"inserted": 0, "failed": 0, "errors": []}
+    batch = []
+    written = False
+    started = time.perf_counter()
+
+    def flush():
+        nonlocal written
+        if batch and not dry_run:
+            written = True  # Set first: a failed insert_many may still have written part of the batch
+            collection.insert_many(batch, ordered=False)
+        report["inserted"] += len(batch)
+        batch.clear()
+
+    try:
+        for line_number, row in iter_rows(stream, fmt):
+            try:
+                if isinstance(row, Exception):
+                    raise ValueError(str(row))
+                batch.append(validate_row(row, user_id_obj))
+            except ValueError as e:
+                report["failed"] += 1
+                if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                    report["errors"].append({"line": line_number, "error": str(e)})
+                continue
+
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+    finally:
+        # ✅ Bulk writes bypass the incremental summary updates, so rebuild it once,
+        # also when a batch failed: the batches before it stay written
+        if written:
+            rebuild_summary(db, user_id_obj)
+
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    report["rows_per_second"] = round((report["inserted"] + report["failed"]) / max(report["seconds"], 1e-9))
+    return report
+
+
+def open_text(binary_stream):
+    """Wrap an uploaded binary stream as UTF-8 text (handles a BOM from spreadsheet exports)."""
+    return io.TextIOWrapper(binary_stream, encoding="utf-8-sig", newline="")
+
+
+if __name__ == "__main__":
+    from db import get_db
+
+    parser = argparse.ArgumentParser(description="Bulk import transactions from a CSV or NDJSON file.")
+    parser.add_argument("path")
+    parser.add_argument("--user", required=True, help="User ID the transactions belong to")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="Validate only, don't write")
+    args = parser.parse_args()
+
+    fmt = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+    with open(args.path, "rb") as upload:
+        report = import_transactions(
+            get_db(), open_text(upload), ObjectId(args.user), fmt, args.batch_size, args.dry_run
+        )
+
+    print(f"✅ Imported {report['inserted']} rows, {report['failed']} failed "
+          f"in {report['seconds']}s ({report['rows_per_second']} rows/s)")
+    for error in report["errors"][:20]:
+        print(f"❌ line {error['line']}: {error['error']}")
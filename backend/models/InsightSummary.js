@@ -0,0 +1,163 @@
+const mongoose = require("mongoose");
+
+// 🗂 Materialized per-user insight summary (layout documented in backend/ml/insight_summary.py).
+// Only updated incrementally here; a missing summary is rebuilt from raw transactions by the
+// Python side on its next read.
+const InsightSummarySchema = new mongoose.Schema(
+  {
+    user: {
+      type: mongoose.Schema.Types.ObjectId,
+      ref: "User",
+      required: true,
+      unique: true,
+    },
+  },
+  { strict: false, collection: "insight_summaries" }
+);
+
+const RECENT_SIZE = 3;
+const EMPTY_BUCKET = 1e-9;
+
+// 🔎 Anomaly scoring, same rule and settings as backend/ml/anomaly.py
+const ANOMALY_Z = Number(process.env.ANOMALY_Z || 3.0);
+const ANOMALY_MIN_HISTORY = Number(process.env.ANOMALY_MIN_HISTORY || 8);
+const ANOMALY_LIMIT = 5;
+const MIN_STD_FRACTION = 0.05;
+
+const dateKeys = (date) => {
+  const parsed = new Date(date);
+  if (!date || isNaN(parsed)) return null;
+  const iso = parsed.toISOString();
+  return { day: iso.slice(0, 10), month: iso.slice(0, 7) };
+};
+
+const addIncrements = (inc, txn, sign) => {
+  if (!txn) return;
+  const amount = (txn.amount || 0) * sign;
+  const category = txn.category || "Other";
+  const fields = {
+    count: sign,
+    total: amount,
+    [`categories.${category}`]: amount,
+    [`stats.${category}.n`]: sign,
+    [`stats.${category}.sum`]: amount,
+    [`stats.${category}.sumsq`]: (txn.amount || 0) * amount,
+  };
+  const keys = dateKeys(txn.date);
+  if (keys) {
+    fields[`days.${keys.day}`] = amount;
+    fields[`months.${keys.month}`] = amount;
+  } else {
+    fields.undated = amount;
+  }
+  for (const [key, value] of Object.entries(fields)) {
+    inc[key] = (inc[key] || 0) + value;
+  }
+};
+
+// Anomaly entry for a transaction scored against its category's earlier stats, or null
+const flagAnomaly = (txn, stats) => {
+  if (!stats || stats.n < ANOMALY_MIN_HISTORY) return null;
+  const amount = txn.amount || 0;
+  const mean = stats.sum / stats.n;
+  const std = Math.max(Math.sqrt(Math.max(stats.sumsq / stats.n - mean * mean, 0)), MIN_STD_FRACTION * Math.abs(mean), 0.01);
+  const score = (amount - mean) / std;
+  if (score < ANOMALY_Z) return null;
+  return {
+    txn: txn._id,
+    category: txn.category || "Other",
+    amount,
+    date: txn.date,
+    usual: Math.round(mean * 100) / 100,
+    score: Math.round(score * 100) / 100,
+  };
+};
+
+// ✅ Apply an add (previous = null), edit (both set) or delete (current = null) to the summary
+InsightSummarySchema.statics.applyTransactionChange = async function (previous, current) {
+  const Transaction = mongoose.model("Transaction");
+  const collection = this.collection;
+  const user = (current || previous).user;
+
+  const inc = {};
+  addIncrements(inc, previous, -1);
+  addIncrements(inc, current, 1);
+
+  // The document from before the $inc holds the stats to score the transaction against
+  const category = current ? current.category || "Other" : null;
+  const projection = { largest: 1, recent: 1, anomalies: 1 };
+  if (current) projection[`stats.${category}`] = 1;
+  const summary = await collection.findOneAndUpdate({ user }, { $inc: inc }, { projection, returnDocument: "before" });
+  if (!summary) return;
+
+  const touched = previous ? String(previous._id) : null;
+
+  // 🔝 Largest transaction: re-query only when the current max was edited or deleted
+  if (touched && summary.largest && String(summary.largest.txn) === touched) {
+    const top = await Transaction.findOne({ user, amount: { $gt: 0 } })
+      .sort({ amount: -1, _id: 1 })
+      .select("amount date");
+    const largest = top ? { txn: top._id, amount: top.amount, date: top.date } : null;
+    await collection.updateOne({ user }, { $set: { largest } });
+  }
+  if (current && current.amount > 0) {
+    await collection.updateOne(
+      { user, $or: [{ largest: null }, { "largest.amount": { $lt: current.amount } }] },
+      { $set: { largest: { txn: current._id, amount: current.amount, date: current.date } } }
+    );
+  }
+
+  // 🕒 Last few transactions used by the weighted prediction
+  if (!previous) {
+    await collection.updateOne(
+      { user },
+      { $push: { recent: { $each: [{ txn: current._id, amount: current.amount || 0 }], $slice: -RECENT_SIZE } } }
+    );
+  } else if ((summary.recent || []).some((item) => String(item.txn) === touched)) {
+    const latest = await Transaction.find({ user }).sort({ _id: -1 }).limit(RECENT_SIZE).select("amount");
+    const recent = latest.reverse().map((t) => ({ txn: t._id, amount: t.amount || 0 }));
+    await collection.updateOne({ user }, { $set: { recent } });
+  }
+
+  // 🔎 Unusual amounts for the category; an edit is re-scored without its old amount
+  if (touched && (summary.anomalies || []).some((item) => String(item.txn) === touched)) {
+    await collection.updateOne({ user }, { $pull: { anomalies: { txn: previous._id } } });
+  }
+  if (current) {
+    let stats = summary.stats && summary.stats[category];
+    if (stats && previous && (previous.category || "Other") === category) {
+      const old = previous.amount || 0;
+      stats = { n: stats.n - 1, sum: stats.sum - old, sumsq: stats.sumsq - old * old };
+    }
+    const anomaly = flagAnomaly(current, stats);
+    if (anomaly) {
+      await collection.updateOne({ user }, { $push: { anomalies: { $each: [anomaly], $slice: -ANOMALY_LIMIT } } });
+    }
+  }
+
+  await this.refreshBudgetAlerts(user);
+};
+
+// ⚠️ Re-evaluate the overspending alerts stored on the budget (same rule as
+// overspending_warnings in backend/ml/insight_engine.py)
+InsightSummarySchema.statics.refreshBudgetAlerts = async function (user) {
+  const budgets = mongoose.connection.collection("budgets");
+  const budgetDoc = await budgets.findOne({ user }, { projection: { budget: 1 } });
+  if (!budgetDoc) return;
+
+  const summary = await this.collection.findOne({ user }, { projection: { categories: 1 } });
+  const categories = Object.entries((summary && summary.categories) || {}).filter(
+    ([, amount]) => Math.abs(amount) >= EMPTY_BUCKET
+  );
+  const budget = budgetDoc.budget || 0;
+  const share = budget / categories.length;
+  const alerts = budget
+    ? categories
+        .filter(([, amount]) => amount > share)
+        .map(([category, amount]) => `⚠️ You exceeded your budget in ${category} by £${(amount - share).toFixed(2)}`)
+    : [];
+
+  await budgets.updateOne({ user }, { $set: { alerts } });
+};
+
+module.exports = mongoose.model("InsightSummary", InsightSummarySchema);
@@ -1,8 +1,20 @@
 const express = require("express");
 const router = express.Router();
 const Transaction = require("../models/Transaction");
+const InsightSummary = require("../models/InsightSummary");
 const auth = require("../middleware/auth");
 
+// ✅ Keep the materialized insight summary in step with every write.
+// If the incremental update fails, drop the summary so it is rebuilt on the next read.
+const syncInsightSummary = async (previous, current) => {
+    try {
+        await InsightSummary.applyTransactionChange(previous, current);
+    } catch (err) {
+        console.error("❌ Error updating insight summary:", err);
+        await InsightSummary.deleteOne({ user: (current || previous).user }).catch(() => {});
+    }
+};
+
 // ✅ GET all transactions for the logged-in user
 router.get("/", auth, async (req, res) => {
     try {
@@ -29,6 +41,7 @@ router.post("/", auth, async (req, res) => {
         });
 
         const savedTransaction = await newTransaction.save();
+        await syncInsightSummary(null, savedTransaction);
         res.status(201).json(savedTransaction);
     } catch (err) {
         console.error("❌ Error adding transaction:", err);
@@ -41,6 +54,7 @@ router.put("/:id", auth, async (req, res) => {
     const { date, amount, category, paymentMethod, description, status } = req.body;
 
     try {
+        const previousTransaction = await Transaction.findOne({ _id: req.params.id, user: req.user.id });
         const updatedTransaction = await Transaction.findOneAndUpdate(
             { _id: req.params.id, user: req.user.id },
             { date, amount, category, paymentMethod, description, status },
@@ -51,6 +65,7 @@ router.put("/:id", auth, async (req, res) => {
             return res.status(404).json({ message: "Transaction not found" });
         }
 
+        await syncInsightSummary(previousTransaction, updatedTransaction);
         res.json(updatedTransaction);
     } catch (err) {
         console.error("❌ Error updating transaction:", err);
@@ -67,6 +82,7 @@ router.delete("/:id", auth, async (req, res) => {
             return res.status(404).json({ message: "Transaction not found" });
         }
 
+        await syncInsightSummary(deletedTransaction, null);
         res.json({ message: "Transaction deleted successfully" });
     } catch (err) {
         console.error("❌ Error deleting transaction:", err);
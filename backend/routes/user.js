@@ -6,6 +6,9 @@ const auth = require("../middleware/auth");
 
 const router = express.Router();
 
+// 🔐 bcrypt work factor for new hashes (the Flask password change reads the same variable)
+const BCRYPT_ROUNDS = parseInt(process.env.BCRYPT_ROUNDS || "12", 10);
+
 // ✅ Signup Route
 router.post('/signup', async (req, res) => {
   const { username, email, password } = req.body;
@@ -16,8 +19,7 @@ router.post('/signup', async (req, res) => {
       return res.status(400).json({ message: 'User already exists' });
     }
 
-    const salt = await bcrypt.genSalt(10);
-    const hashedPassword = await bcrypt.hash(password, salt);
+    const hashedPassword = await bcrypt.hash(password, BCRYPT_ROUNDS);
 
     user = new User({
       username,
@@ -62,6 +64,17 @@ router.post('/login', async (req, res) => {
       return res.status(400).json({ message: 'Invalid credentials' });
     }
 
+    // ✅ Upgrade hashes made with a lower cost factor while we have the plain password
+    // (a higher one is kept: re-hashing it would weaken the stored hash)
+    if (bcrypt.getRounds(user.password) < BCRYPT_ROUNDS) {
+      try {
+        user.password = await bcrypt.hash(password, BCRYPT_ROUNDS);
+        await user.save();
+      } catch (err) {
+        console.error("⚠️ Could not re-hash password:", err.message);
+      }
+    }
+
     const payload = {
       user: {
         id: user.id
@@ -14,7 +14,7 @@ const Insights = () => {
   useEffect(() => {
     const fetchPredictions = async () => {
       try {
-        const response = await fetch("http://localhost:5002/api/ml/predict", {
+        const response = await fetch("http://localhost:5001/api/ml/predict", {
           method: "POST",
           headers: { "Content-Type": "application/json" },
           body: JSON.stringify({ user_id: userId }),